@@ -3,9 +3,14 @@ from simphony.engine import EngineInterface
 from simphony.engine.decorators import register
 
 from .lammps_wrapper import LammpsWrapper
+from .ensemble import run_ensemble
+from .farm import run_farm
 from .io.file_utility import read_data_file
 
-__all__ = ["LammpsWrapper", "read_data_file"]
+__all__ = ["LammpsWrapper", "run_ensemble", "run_farm", "read_data_file"]
+
+# name of the engine whose (internal) library is run in a child process
+_LAMMPS_ISOLATED = 'LAMMPS_ISOLATED'
 
 
 @register
@@ -32,7 +37,14 @@ class SimlammpsExtension(ABCEngineExtension):
                                              [EngineInterface.Internal,
                                               EngineInterface.FileIO])
 
-        return [lammps]
+        # the internal interface with the library run in a child process
+        # (see LammpsWorker), as EngineInterface has no such interface
+        lammps_isolated = self.create_engine_metadata(
+            _LAMMPS_ISOLATED,
+            lammps_features,
+            [EngineInterface.Internal])
+
+        return [lammps, lammps_isolated]
 
     def create_wrapper(self, cuds, engine_name, engine_interface):
         """Creates a wrapper to the requested engine.
@@ -54,9 +66,15 @@ class SimlammpsExtension(ABCEngineExtension):
         if engine_interface == EngineInterface.Internal:
             use_internal_interface = True
 
-        if engine_name != 'LAMMPS':
+        if engine_name not in ('LAMMPS', _LAMMPS_ISOLATED):
             raise Exception('Only LAMMPS engine is supported. '
                             'Unsupported eninge: %s', engine_name)
 
+        isolated = engine_name == _LAMMPS_ISOLATED
+        if isolated and not use_internal_interface:
+            raise Exception('%s only supports the internal interface',
+                            engine_name)
+
         return LammpsWrapper(cuds=cuds,
-                             use_internal_interface=use_internal_interface)
+                             use_internal_interface=use_internal_interface,
+                             isolated=isolated)
@@ -1,6 +1,7 @@
 import uuid
 import abc
 
+from .common.run_guard import RunGuard
 from .lammps_particles import LammpsParticles
 
 
@@ -31,6 +32,9 @@ class ABCDataManager(object):
         # where the the key is the unique name
         self._lpcs = {}
 
+        # blocks access to the particles while LAMMPS is running
+        self.run_guard = RunGuard()
+
     def get_name(self, uname):
         """
         Get the name of a particle container
@@ -67,6 +71,7 @@ class ABCDataManager(object):
         """ Iter over names of particle containers
 
         """
+        self.run_guard.wait()
         for name in self._unames:
             yield name
 
@@ -74,18 +79,21 @@ class ABCDataManager(object):
         """ Checks if particle container with this name exists
 
         """
+        self.run_guard.wait()
         return name in self._unames
 
     def __getitem__(self, name):
         """ Returns particle container with this name
 
         """
+        self.run_guard.wait()
         return self._lpcs[self._unames[name]]
 
     def __delitem__(self, name):
         """Deletes lammps particle container and associated cache
 
         """
+        self.run_guard.wait()
         self._handle_delete_particles(self._unames[name])
         del self._lpcs[self._unames[name]]
         del self._unames[name]
@@ -93,6 +101,9 @@ class ABCDataManager(object):
     def new_particles(self, particles):
         """Add new particle container to this manager.
 
+        The returned LammpsParticles has the same uid as the added
+        particle container.
+
         Parameters
         ----------
         particles : ABCParticles
@@ -106,17 +117,34 @@ class ABCDataManager(object):
 
         # generate a unique name for this particle container
         # that will not change over the lifetime of the wrapper.
-        uname = uuid.uuid4()
+        uname = self._generate_uids(1)[0]
 
         self._unames[particles.name] = uname
         self._names[uname] = particles.name
 
-        lammps_pc = LammpsParticles(self, uname)
+        lammps_pc = LammpsParticles(self,
+                                    uname,
+                                    uid=getattr(particles, "uid", None))
         self._lpcs[uname] = lammps_pc
 
         self._handle_new_particles(uname, particles)
         return lammps_pc
 
+    def _generate_uids(self, number):
+        """Generate uids (e.g. of new particles)
+
+        Parameters
+        ----------
+        number : int
+            number of uids to be generated
+
+        Returns
+        -------
+        list of uuid.UUID
+
+        """
+        return [uuid.uuid4() for _ in xrange(number)]
+
     @abc.abstractmethod
     def _handle_delete_particles(self, uname):
         """Handle when a Particles is deleted
@@ -263,6 +291,176 @@ class ABCDataManager(object):
 
         """
 
+    @abc.abstractmethod
+    def get_uids(self, uname):
+        """Get the uids of the particles in a container
+
+        The order of the uids is the order of the rows of the arrays
+        returned by get_coordinates and get_attribute (when no uids are
+        given) and does not change until particles are added or removed.
+
+        Parameters
+        ----------
+        uname : string
+            non-changing unique name of particles
+
+        Returns
+        -------
+        list of uuid.UUID
+            uids of particles
+
+        """
+
+    @abc.abstractmethod
+    def get_coordinates(self, uname, uids=None):
+        """Get the coordinates of particles as an array
+
+        Parameters
+        ----------
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+
+        Raises
+        ------
+        KeyError :
+            If any particle does not exist.
+
+        """
+
+    @abc.abstractmethod
+    def get_attribute(self, cuba_key, uname, uids=None):
+        """Get the values of a CUBA attribute of particles as an array
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        Returns
+        -------
+        numpy.ndarray
+            (N,) or (N, k) array with the value of each particle
+
+        Raises
+        ------
+        KeyError :
+            If any particle does not exist or the attribute is not
+            supported.
+
+        """
+
+    @abc.abstractmethod
+    def get_supported_attributes(self):
+        """Get the CUBA keys of the attributes of the particles
+
+        Returns
+        -------
+        list of CUBA
+            keys of the attributes supported by the atom style (i.e.
+            the attributes which can be got with get_attribute)
+
+        """
+
+    @abc.abstractmethod
+    def set_coordinates(self, coordinates, uname, uids=None):
+        """Set the coordinates of particles from an array
+
+        Parameters
+        ----------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        Raises
+        ------
+        ValueError :
+            If any particle does not exist.
+
+        """
+
+    @abc.abstractmethod
+    def set_attribute(self, cuba_key, values, uname, uids=None):
+        """Set the values of a CUBA attribute of particles from an array
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        values : array_like
+            (N,) or (N, k) array with the value of each particle
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        Raises
+        ------
+        ValueError :
+            If any particle does not exist.
+        KeyError :
+            If the attribute is not supported.
+
+        """
+
+    @abc.abstractmethod
+    def add_from_arrays(self, coordinates, data_columns, uname, uids=None):
+        """Add particles given as arrays
+
+        Parameters
+        ----------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        data_columns : dict
+            map from CUBA key to an array with the value of each particle
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of the particles. If None, then uids are generated.
+
+        Returns
+        -------
+        list of uuid.UUID
+            uids of the added particles
+
+        Raises
+        ------
+        ValueError :
+            when there is a particle with an uids that already exists
+            in the container.
+
+        """
+
+    @abc.abstractmethod
+    def get_uids_of_lammps_ids(self):
+        """Get map from lammps atom id to particle uid
+
+        The map is valid for the state of lammps since the last flush.
+
+        Returns
+        -------
+        dict
+            map from lammps atom id to uid of particle
+
+        """
+
     @abc.abstractmethod
     def flush(self, input_data_filename=None):
         """flush to file
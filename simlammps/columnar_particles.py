@@ -0,0 +1,247 @@
+import uuid
+
+import numpy
+
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.particles import Particle, Particles
+
+
+class ColumnarParticles(Particles):
+    """ Particles container backed by arrays
+
+    The particles are stored as columns (one row per particle) and
+    Particle objects are only created when particles are iterated over or
+    retrieved by uid. Whole columns can be accessed directly (e.g. see
+    get_coordinates).
+
+    Once the container is changed (i.e. particles are added, updated or
+    removed), all particles are converted to Particle objects and the
+    container behaves like a normal Particles container.
+
+    Parameters
+    ----------
+    name : str
+        name of particles
+    coordinates : array_like
+        (N, 3) array of the coordinates of the particles
+    data_columns : dict, optional
+        map from CUBA key to an array with the value of each particle, i.e.
+        (N,) for scalars or (N, k) for vectors
+    material_table : MaterialLookupTable, optional
+        table converting the values of the CUBA.MATERIAL_TYPE column (i.e.
+        atom types) to material uids. If None, the CUBA.MATERIAL_TYPE column
+        already contains the material uids.
+    uids : list of uuid.UUID, optional
+        uids of the particles. If None, then uids are generated.
+
+    """
+    def __init__(self, name, coordinates, data_columns=None,
+                 material_table=None, uids=None):
+        super(ColumnarParticles, self).__init__(name=name)
+
+        self._coordinates = numpy.asarray(coordinates, dtype=numpy.float64)
+        number_particles = len(self._coordinates)
+
+        self._columns = {}
+        if data_columns:
+            for cuba_key, column in data_columns.iteritems():
+                column = numpy.asarray(column)
+                if len(column) != number_particles:
+                    raise ValueError(
+                        "Column '{}' does not match the number of "
+                        "particles".format(cuba_key))
+                self._columns[cuba_key] = column
+
+        self._material_table = material_table
+
+        if uids is None:
+            uids = [uuid.uuid4() for _ in xrange(number_particles)]
+        elif len(uids) != number_particles:
+            raise ValueError(
+                "The uids do not match the number of particles")
+        self._uids = list(uids)
+        self._index_of_uid = {uid: index for index, uid
+                              in enumerate(self._uids)}
+
+        # True as long as the particles are only stored in the columns
+        self._columnar = True
+
+    # Whole-array accessors ###############################################
+
+    def get_uids(self):
+        """ Return the uids of the particles
+
+        The order of the uids is the order of the rows returned by
+        the other array accessors.
+
+        """
+        if self._columnar:
+            return list(self._uids)
+        return [p.uid for p in self.iter(item_type=CUBA.PARTICLE)]
+
+    def get_coordinates(self):
+        """ Return an (N, 3) array of the coordinates
+
+        """
+        if self._columnar:
+            return self._coordinates.copy()
+        return numpy.array(
+            [p.coordinates for p in self.iter(item_type=CUBA.PARTICLE)],
+            dtype=numpy.float64).reshape((-1, 3))
+
+    def get_velocities(self):
+        """ Return an (N, 3) array of the velocities
+
+        """
+        return self.get_attribute(CUBA.VELOCITY)
+
+    def get_material_types(self):
+        """ Return an array of the material type (uid) of each particle
+
+        """
+        return self.get_attribute(CUBA.MATERIAL_TYPE)
+
+    def get_supported_attributes(self):
+        """ Return the CUBA keys of the attributes of the particles
+
+        These are the keys of the columns (or the keys which all particles
+        have once the container has been changed), i.e. the keys which
+        can be passed to get_attribute.
+
+        """
+        if self._columnar:
+            return list(self._columns)
+        cuba_keys = None
+        for p in self.iter(item_type=CUBA.PARTICLE):
+            if cuba_keys is None:
+                cuba_keys = set(p.data)
+            else:
+                cuba_keys &= set(p.data)
+        return list(cuba_keys or [])
+
+    def get_material_indices(self):
+        """ Return an array of the material index of each particle
+
+        The index refers to the 'material_uids' of the material table (no
+        material uid is looked up).
+
+        Raises
+        ------
+        RuntimeError
+            if the particles are not backed by a material table
+
+        """
+        if not self._columnar or self._material_table is None:
+            raise RuntimeError("Particles have no material table")
+        return self._material_table.get_material_indices(
+            self._columns[CUBA.MATERIAL_TYPE])
+
+    def get_attribute(self, cuba_key):
+        """ Return an array of the values of a CUBA attribute
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+
+        Raises
+        ------
+        KeyError
+            if the particles do not have such attribute
+
+        """
+        if not self._columnar:
+            return numpy.array(
+                [p.data[cuba_key] for p
+                 in self.iter(item_type=CUBA.PARTICLE)])
+
+        column = self._columns[cuba_key]
+        if cuba_key == CUBA.MATERIAL_TYPE and \
+                    self._material_table is not None:
+            return self._material_table.get_material_uids(column)
+        return column.copy()
+
+    # Particle methods ####################################################
+
+    def count_of(self, item_type):
+        if self._columnar and item_type == CUBA.PARTICLE:
+            return len(self._uids)
+        return super(ColumnarParticles, self).count_of(item_type)
+
+    def _add_particles(self, iterable):
+        self._materialise()
+        return super(ColumnarParticles, self)._add_particles(iterable)
+
+    def _update_particles(self, iterable):
+        self._materialise()
+        super(ColumnarParticles, self)._update_particles(iterable)
+
+    def _remove_particles(self, uids):
+        self._materialise()
+        super(ColumnarParticles, self)._remove_particles(uids)
+
+    def _get_particle(self, uid):
+        if not self._columnar:
+            return super(ColumnarParticles, self)._get_particle(uid)
+
+        try:
+            index = self._index_of_uid[uid]
+        except KeyError:
+            raise KeyError("uid ({}) was not found".format(uid))
+        return self._create_particle(index)
+
+    def _has_particle(self, uid):
+        if not self._columnar:
+            return super(ColumnarParticles, self)._has_particle(uid)
+        return uid in self._index_of_uid
+
+    def _iter_particles(self, uids=None):
+        if not self._columnar:
+            for p in super(ColumnarParticles, self)._iter_particles(uids):
+                yield p
+        elif uids is None:
+            for index in xrange(len(self._uids)):
+                yield self._create_particle(index)
+        else:
+            for uid in uids:
+                yield self._get_particle(uid)
+
+    # Private methods #####################################################
+
+    def _create_particle(self, index):
+        """ Create a Particle from a row of the columns
+
+        """
+        data = DataContainer()
+        for cuba_key, column in self._columns.iteritems():
+            if column.ndim > 1:
+                value = tuple(column[index].tolist())
+            else:
+                value = column.item(index)
+            if cuba_key == CUBA.MATERIAL_TYPE and \
+                    self._material_table is not None:
+                value = self._material_table(value)
+            data[cuba_key] = value
+
+        return Particle(uid=self._uids[index],
+                        coordinates=tuple(self._coordinates[index].tolist()),
+                        data=data)
+
+    def _materialise(self):
+        """ Convert all particles stored in columns to Particle objects
+
+        """
+        if not self._columnar:
+            return
+
+        particles = [self._create_particle(index)
+                     for index in xrange(len(self._uids))]
+
+        self._columnar = False
+        self._coordinates = None
+        self._columns = {}
+        self._uids = []
+        self._index_of_uid = {}
+
+        super(ColumnarParticles, self)._add_particles(particles)
@@ -0,0 +1,85 @@
+import sys
+import threading
+from multiprocessing import TimeoutError
+
+
+class AsyncRun(object):
+    """ Result of a run carried out by a worker thread
+
+    The run is carried out by its own (daemon) thread, which ends with the
+    run.  Once the run has been carried out successfully, it is finished
+    (e.g. the results are passed on) by the thread which calls get, so
+    the finishing step never runs concurrently with the caller.
+
+    Parameters
+    ----------
+    target : callable
+        carries out the run (called without arguments by the worker thread)
+    finish : callable
+        finishes a successful run (called without arguments once, by the
+        first thread which calls get)
+
+    """
+    def __init__(self, target, finish):
+        self._finish = finish
+        self._finish_lock = threading.Lock()
+        self._finished = False
+        self._exc_info = None
+        self._done = threading.Event()
+
+        self._thread = threading.Thread(target=self._carry_out,
+                                        args=(target,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def ready(self):
+        """ Return if the run has been carried out """
+        return self._done.is_set()
+
+    def successful(self):
+        """ Return if the run has been carried out without an error
+
+        Raises
+        ------
+        ValueError
+            if the run has not been carried out yet
+
+        """
+        if not self.ready():
+            raise ValueError("The run has not been carried out yet")
+        return self._exc_info is None
+
+    def wait(self, timeout=None):
+        """ Wait until the run has been carried out (or the timeout) """
+        self._done.wait(timeout)
+
+    def get(self, timeout=None):
+        """ Wait until the run has been carried out and finish it
+
+        Raises
+        ------
+        multiprocessing.TimeoutError
+            if the run has not been carried out within the timeout
+        Exception
+            any exception raised by the run
+
+        """
+        self.wait(timeout)
+        if not self.ready():
+            raise TimeoutError("The run has not been carried out yet")
+        if self._exc_info is not None:
+            exc_type, exc_value, exc_traceback = self._exc_info
+            raise exc_type, exc_value, exc_traceback
+        with self._finish_lock:
+            if not self._finished:
+                self._finished = True
+                self._finish()
+
+    def _carry_out(self, target):
+        """ Carry out the run (in the worker thread) """
+        try:
+            target()
+        except BaseException:
+            self._exc_info = sys.exc_info()
+        finally:
+            self._done.set()
@@ -0,0 +1,232 @@
+import numpy
+
+from simphony.core.keywords import KEYWORDS
+
+from .atom_style_description import ATOM_STYLE_DESCRIPTIONS
+
+
+class ColumnInfo(object):
+    """  Class describes the column(s) of a cuba value in a line
+
+    Attributes
+    ----------
+    cuba_key : CUBA
+        CUBA key
+    offset : int
+        index of the (first) column of the value in the line
+    count : int
+        number of columns of the value (e.g. 1 or 3)
+    dtype : numpy.dtype
+        type of value
+    convert_to_cuba : function
+        method to convert from LAMMPS value to SimPhoNy-CUBA (or None)
+    convert_from_cuba : function
+        method to convert from SimPhoNy-CUBA to LAMMPS value (or None)
+    number_format : str
+        format string of each number of the value
+
+    """
+    def __init__(self, value_info, offset):
+        keyword = KEYWORDS[value_info.cuba_key.name]
+
+        # TODO we are assuming that we only have a single
+        # -dimension array (e.g. shape is [1] or [3]
+        # instead of shape being something like a [2, 3] matrix)
+        if len(keyword.shape) != 1:
+            raise RuntimeError("Unsupported shape: {}".format(keyword.shape))
+
+        self.cuba_key = value_info.cuba_key
+        self.offset = offset
+        self.count = keyword.shape[0]
+        self.dtype = keyword.dtype
+        self.convert_to_cuba = value_info.convert_to_cuba
+        self.convert_from_cuba = value_info.convert_from_cuba
+        self.number_format = \
+            "{:.16e}" if self.dtype == numpy.float64 else "{}"
+
+    @property
+    def end(self):
+        """ index after the last column of the value """
+        return self.offset + self.count
+
+
+class AtomStyleLayout(object):
+    """  Class describes the fixed column layout of an atom style
+
+    The layout is derived once from the AtomStyleDescription and
+    describes where each value appears in the lines of the "Atoms"
+    and "Velocities" sections of a LAMMPS data file (without the atom-id).
+    For example, for the "sphere" atom style::
+
+       atom-type diameter mass x y z
+       vx vy vz wx wy wz
+
+    Attributes
+    ----------
+    atom_columns : list of ColumnInfo
+        the values of the atom line which follow the atom-type
+    coordinates_offset : int
+        index of the x-y-z coordinates in the atom line
+    number_atom_columns : int
+        number of columns of an atom line (without image flags)
+    velocity_columns : list of ColumnInfo
+        the values of the velocity line
+    atom_line_format : str
+        format template of an atom line which is given the atom-id,
+        atom-type, all (flattened) values of atom_columns, the coordinates
+        and the uid of the particle
+    velocity_line_format : str
+        format template of a velocity line which is given the atom-id and
+        all (flattened) values of velocity_columns
+
+    """
+    def __init__(self, atom_style):
+        description = ATOM_STYLE_DESCRIPTIONS[atom_style]
+
+        # the atom-type is always first
+        self.atom_columns = _get_columns(description.attributes, offset=1)
+        self.coordinates_offset = \
+            self.atom_columns[-1].end if self.atom_columns else 1
+        self.number_atom_columns = self.coordinates_offset + 3
+
+        self.velocity_columns = _get_columns(
+            description.velocity_attributes, offset=0)
+
+        self.atom_line_format = "{} {}" + \
+            _get_values_format(self.atom_columns) + \
+            " {:.16e} {:.16e} {:.16e} 0 0 0 # uid:'{}'\n"
+        self.velocity_line_format = "{}" + \
+            _get_values_format(self.velocity_columns) + "\n"
+
+    @staticmethod
+    def flatten_values(columns, data):
+        """ Return list of all numbers of the values in data
+
+        Parameters
+        ----------
+        columns : list of ColumnInfo
+            columns to be flattened
+        data : DataContainer
+            data containing the cuba values
+
+        """
+        numbers = []
+        for column in columns:
+            value = data[column.cuba_key]
+            if column.convert_from_cuba:
+                value = column.convert_from_cuba(value)
+            if column.count == 1:
+                numbers.append(value)
+            else:
+                numbers.extend(value[:column.count])
+        return numbers
+
+    @staticmethod
+    def extract_values(columns, values, cuba_values):
+        """ Extract cuba values from a list of numbers
+
+        Parameters
+        ----------
+        columns : list of ColumnInfo
+            columns to be extracted
+        values : list of numbers
+            numbers read from line
+        cuba_values : dict
+            dictionary where extracted CUBA keys/values are added
+
+        """
+        for column in columns:
+            if column.count == 1:
+                value = values[column.offset]
+            else:
+                value = tuple(values[column.offset:column.end])
+            if column.convert_to_cuba:
+                value = column.convert_to_cuba(value)
+            cuba_values[column.cuba_key] = value
+
+    @staticmethod
+    def flatten_columns(columns, data_columns):
+        """ Return list of all number columns of the value columns
+
+        Parameters
+        ----------
+        columns : list of ColumnInfo
+            columns to be flattened
+        data_columns : dict
+            map from CUBA key to an array with the value of each particle
+
+        Returns
+        -------
+        list of list
+            the numbers of each column (one per particle)
+
+        """
+        numbers = []
+        for column in columns:
+            values = numpy.asarray(data_columns[column.cuba_key])
+            if column.convert_from_cuba:
+                values = column.convert_from_cuba(values)
+            if column.count == 1:
+                numbers.append(values.tolist())
+            else:
+                numbers.extend(values[:, i].tolist()
+                               for i in xrange(column.count))
+        return numbers
+
+    @staticmethod
+    def extract_columns(columns, values, cuba_columns):
+        """ Extract cuba value columns from an array of numbers
+
+        Parameters
+        ----------
+        columns : list of ColumnInfo
+            columns to be extracted
+        values : numpy.ndarray
+            numbers read from the lines (one row per line)
+        cuba_columns : dict
+            dictionary where extracted CUBA keys/arrays are added
+
+        """
+        for column in columns:
+            if column.count == 1:
+                value = values[:, column.offset]
+            else:
+                value = values[:, column.offset:column.end]
+            if column.convert_to_cuba:
+                value = column.convert_to_cuba(value)
+            cuba_columns[column.cuba_key] = value.astype(column.dtype)
+
+
+def _get_columns(value_infos, offset):
+    columns = []
+    for value_info in value_infos:
+        column = ColumnInfo(value_info, offset)
+        columns.append(column)
+        offset = column.end
+    return columns
+
+
+def _get_values_format(columns):
+    return "".join(
+        (" " + column.number_format) * column.count for column in columns)
+
+
+_LAYOUTS = {}
+
+
+def get_atom_style_layout(atom_style):
+    """ Return (cached) layout of atom style
+
+    Parameters
+    ----------
+    atom_style : AtomStyle
+        style of atom
+
+    """
+    try:
+        return _LAYOUTS[atom_style]
+    except KeyError:
+        layout = AtomStyleLayout(atom_style)
+        _LAYOUTS[atom_style] = layout
+        return layout
+
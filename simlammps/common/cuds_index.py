@@ -0,0 +1,127 @@
+class CudsIndex(object):
+    """ Type-indexed snapshot of the items of a CUDS
+
+    The items of each type (as well as the map from uid to item) are
+    only queried from the CUDS once and then reused.  The index does not
+    notice changes to the CUDS, so a new index needs to be created once
+    the CUDS has been changed.
+
+    Parameters
+    ----------
+    cuds : CUDS
+        CUDS to be indexed
+
+    """
+    def __init__(self, cuds):
+        self._cuds = cuds
+
+        # map from item type (CUBA) to list of items
+        self._items_of_type = {}
+
+        # map from item type (CUBA) to the count reported by the CUDS
+        self._count_of_type = {}
+
+        # list of all items (None until needed)
+        self._items = None
+
+        # map from uid to item (None until needed)
+        self._item_of_uid = None
+
+    def iter(self, item_type=None):
+        """ Iterate over the items (of a type)
+
+        Parameters
+        ----------
+        item_type : CUBA, optional
+            type of items. If None, then all items are iterated over.
+
+        """
+        return iter(self.get_items(item_type))
+
+    def get_items(self, item_type=None):
+        """ Return list of the items (of a type)
+
+        Parameters
+        ----------
+        item_type : CUBA, optional
+            type of items. If None, then all items are returned.
+
+        """
+        if item_type is None:
+            if self._items is None:
+                self._items = list(self._cuds.iter())
+            return self._items
+
+        try:
+            return self._items_of_type[item_type]
+        except KeyError:
+            items = list(self._cuds.iter(item_type=item_type))
+            self._items_of_type[item_type] = items
+            return items
+
+    def count_of(self, item_type):
+        """ Return the number of items of a type (see CUDS.count_of)
+
+        Parameters
+        ----------
+        item_type : CUBA
+            type of items
+
+        """
+        try:
+            return self._count_of_type[item_type]
+        except KeyError:
+            count = self._cuds.count_of(item_type)
+            self._count_of_type[item_type] = count
+            return count
+
+    def count_instances(self, cls):
+        """ Return the number of items which are instances of a class
+
+        Parameters
+        ----------
+        cls : type
+            class of items
+
+        """
+        return sum(1 for item in self.get_items() if isinstance(item, cls))
+
+    def get(self, uid):
+        """ Return the item with the uid
+
+        Raises
+        ------
+        KeyError
+            if there is no item with this uid
+
+        """
+        if self._item_of_uid is None:
+            self._item_of_uid = {item.uid: item for item in self.get_items()}
+        return self._item_of_uid[uid]
+
+    def update(self, items):
+        """ Replace indexed items (see CUDS.update)
+
+        The index is kept in line with the CUDS after items of the CUDS
+        have been replaced by items with the same uid.  Items which are
+        not indexed are ignored.
+
+        Parameters
+        ----------
+        items : iterable of CUDS items
+            the (new) items
+
+        """
+        new_items = {item.uid: item for item in items}
+
+        indexed_items = self._items_of_type.values()
+        if self._items is not None:
+            indexed_items.append(self._items)
+        for item_list in indexed_items:
+            item_list[:] = [new_items.get(item.uid, item)
+                            for item in item_list]
+
+        if self._item_of_uid is not None:
+            for uid, item in new_items.iteritems():
+                if uid in self._item_of_uid:
+                    self._item_of_uid[uid] = item
@@ -1,3 +0,0 @@
-# max number of types used as work-around
-# for issue #66
-MAX_NUMBER_TYPES = 10
@@ -0,0 +1,57 @@
+from simphony.core.data_container import DataContainer
+
+
+class ReadOnlyDataContainer(DataContainer):
+    """ DataContainer whose values cannot be changed
+
+    The container can be shared by all readers of the data (e.g. the
+    cached data of a particle container).  A changeable copy is created
+    with DataContainer(...).
+
+    Parameters
+    ----------
+    data : mapping, optional
+        CUBA keys and values of the container
+
+    Raises
+    ------
+    TypeError
+        when the container is changed
+
+    """
+    def __init__(self, data=None):
+        # DataContainer.__init__ is not called as it sets the values with
+        # update (which is not supported)
+        dict.__init__(self)
+        if data:
+            # the keys are checked by the DataContainer
+            dict.update(self, DataContainer(data))
+
+    def __setitem__(self, key, value):
+        _raise_read_only()
+
+    def __delitem__(self, key):
+        _raise_read_only()
+
+    def update(self, *args, **kwargs):
+        _raise_read_only()
+
+    def clear(self):
+        _raise_read_only()
+
+    def pop(self, *args):
+        _raise_read_only()
+
+    def popitem(self):
+        _raise_read_only()
+
+    def setdefault(self, *args):
+        _raise_read_only()
+
+    def __reduce__(self):
+        return (ReadOnlyDataContainer, (dict(self),))
+
+
+def _raise_read_only():
+    raise TypeError(
+        "The data is read-only (set a changed copy, e.g. DataContainer(...))")
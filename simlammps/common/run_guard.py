@@ -0,0 +1,63 @@
+import threading
+
+
+class RunGuard(object):
+    """ Guard which blocks access to the data during a run
+
+    A run is started with begin (by the thread which starts the run) and
+    is then carried out by the thread which calls attach (e.g. the worker
+    thread of an asynchronous run). Until the run is ended (see end), any
+    other thread which calls wait is blocked, while the attached thread
+    can still access the data.
+
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._running = False
+        self._run_thread = None
+
+    @property
+    def running(self):
+        """ True if a run is in flight """
+        return self._running
+
+    def begin(self):
+        """ Begin a run (waits until the current run has ended)
+
+        """
+        with self._condition:
+            self._wait()
+            self._running = True
+            self._run_thread = None
+
+    def attach(self):
+        """ Make the calling thread the thread which carries out the run
+
+        """
+        with self._condition:
+            self._run_thread = threading.current_thread()
+
+    def end(self):
+        """ End the run (and wake up the waiting threads)
+
+        """
+        with self._condition:
+            self._running = False
+            self._run_thread = None
+            self._condition.notify_all()
+
+    def wait(self):
+        """ Wait until the run (if any) has ended
+
+        The thread which carries out the run does not wait.
+
+        """
+        if not self._running:
+            return
+        with self._condition:
+            self._wait()
+
+    def _wait(self):
+        while self._running and \
+                self._run_thread is not threading.current_thread():
+            self._condition.wait()
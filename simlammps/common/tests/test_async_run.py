@@ -0,0 +1,59 @@
+import threading
+import unittest
+from multiprocessing import TimeoutError
+
+from simlammps.common.async_run import AsyncRun
+
+
+class TestAsyncRun(unittest.TestCase):
+
+    def test_get_finishes_once_in_calling_thread(self):
+        events = []
+        finishing_threads = []
+        release = threading.Event()
+
+        def run():
+            release.wait()
+            events.append("run")
+
+        run = AsyncRun(run,
+                       lambda: finishing_threads.append(
+                           threading.current_thread()))
+        self.assertFalse(run.ready())
+        with self.assertRaises(ValueError):
+            run.successful()
+        with self.assertRaises(TimeoutError):
+            run.get(timeout=0.01)
+
+        release.set()
+        run.get()
+        run.get()
+
+        self.assertEqual(events, ["run"])
+        self.assertTrue(run.successful())
+        self.assertEqual(finishing_threads, [threading.current_thread()])
+
+    def test_get_raises_error_of_run(self):
+        finished = []
+
+        def run():
+            raise RuntimeError("LAMMPS failed")
+
+        run = AsyncRun(run, lambda: finished.append(True))
+
+        with self.assertRaisesRegexp(RuntimeError, "LAMMPS failed"):
+            run.get()
+        self.assertFalse(run.successful())
+        self.assertEqual(finished, [])
+
+    def test_thread_ends_with_run(self):
+        run = AsyncRun(lambda: None, lambda: None)
+        run.get()
+
+        run._thread.join(1.0)
+        self.assertFalse(run._thread.is_alive())
+        self.assertTrue(run._thread.daemon)
+
+
+if __name__ == '__main__':
+    unittest.main()
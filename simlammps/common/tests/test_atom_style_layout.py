@@ -0,0 +1,107 @@
+import unittest
+
+import numpy
+from numpy.testing import assert_almost_equal
+
+from simphony.core.cuba import CUBA
+
+from simlammps.common.atom_style import AtomStyle
+from simlammps.common.atom_style_layout import (AtomStyleLayout,
+                                                get_atom_style_layout)
+
+
+class TestAtomStyleLayout(unittest.TestCase):
+
+    def test_atomic_layout(self):
+        layout = get_atom_style_layout(AtomStyle.ATOMIC)
+
+        self.assertEqual(layout.atom_columns, [])
+        self.assertEqual(layout.coordinates_offset, 1)
+        self.assertEqual(layout.number_atom_columns, 4)
+        self.assertEqual([column.cuba_key for column
+                          in layout.velocity_columns], [CUBA.VELOCITY])
+
+    def test_sphere_layout(self):
+        layout = get_atom_style_layout(AtomStyle.SPHERE)
+
+        # atom-type diameter mass x y z
+        self.assertEqual([(column.cuba_key, column.offset, column.count)
+                          for column in layout.atom_columns],
+                         [(CUBA.RADIUS, 1, 1), (CUBA.MASS, 2, 1)])
+        self.assertEqual(layout.coordinates_offset, 3)
+
+        # vx vy vz wx wy wz
+        self.assertEqual([(column.cuba_key, column.offset, column.count)
+                          for column in layout.velocity_columns],
+                         [(CUBA.VELOCITY, 0, 3),
+                          (CUBA.ANGULAR_VELOCITY, 3, 3)])
+
+    def test_layout_is_cached(self):
+        self.assertIs(get_atom_style_layout(AtomStyle.SPHERE),
+                      get_atom_style_layout(AtomStyle.SPHERE))
+
+    def test_round_trip(self):
+        layout = get_atom_style_layout(AtomStyle.SPHERE)
+        data = {CUBA.RADIUS: 0.25,
+                CUBA.MASS: 2.0,
+                CUBA.VELOCITY: (1.0, 2.0, 3.0),
+                CUBA.ANGULAR_VELOCITY: (4.0, 5.0, 6.0)}
+
+        atom_line = layout.atom_line_format.format(
+            *([7, 1] + layout.flatten_values(layout.atom_columns, data) +
+              [0.1, 0.2, 0.3, "uid"]))
+        velocity_line = layout.velocity_line_format.format(
+            *([7] + layout.flatten_values(layout.velocity_columns, data)))
+
+        atom_values = map(float, atom_line.split("#")[0].split()[1:])
+        velocity_values = map(float, velocity_line.split()[1:])
+        cuba_values = {}
+        AtomStyleLayout.extract_values(layout.atom_columns,
+                                       atom_values,
+                                       cuba_values)
+        AtomStyleLayout.extract_values(layout.velocity_columns,
+                                       velocity_values,
+                                       cuba_values)
+
+        self.assertEqual(cuba_values, data)
+        self.assertEqual(atom_values[layout.coordinates_offset:
+                                     layout.number_atom_columns],
+                         [0.1, 0.2, 0.3])
+
+    def test_round_trip_of_columns(self):
+        layout = get_atom_style_layout(AtomStyle.SPHERE)
+        data_columns = {CUBA.RADIUS: numpy.array([0.25, 0.5]),
+                        CUBA.MASS: numpy.array([2.0, 3.0]),
+                        CUBA.VELOCITY: numpy.array([[1.0, 2.0, 3.0],
+                                                    [4.0, 5.0, 6.0]]),
+                        CUBA.ANGULAR_VELOCITY: numpy.zeros((2, 3))}
+
+        atom_numbers = AtomStyleLayout.flatten_columns(layout.atom_columns,
+                                                       data_columns)
+        velocity_numbers = AtomStyleLayout.flatten_columns(
+            layout.velocity_columns, data_columns)
+
+        # one list per column (i.e. the diameter is written)
+        self.assertEqual(atom_numbers, [[0.5, 1.0], [2.0, 3.0]])
+        self.assertEqual(len(velocity_numbers), 6)
+
+        # rows as read from a file: atom-type diameter mass x y z
+        atom_values = numpy.array(
+            [[1] + list(row) + [0.1, 0.2, 0.3]
+             for row in zip(*atom_numbers)])
+        velocity_values = numpy.array(zip(*velocity_numbers))
+        cuba_columns = {}
+        AtomStyleLayout.extract_columns(layout.atom_columns,
+                                        atom_values,
+                                        cuba_columns)
+        AtomStyleLayout.extract_columns(layout.velocity_columns,
+                                        velocity_values,
+                                        cuba_columns)
+
+        self.assertEqual(set(cuba_columns), set(data_columns))
+        for cuba_key, values in data_columns.iteritems():
+            assert_almost_equal(cuba_columns[cuba_key], values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+from simphony.api import CUDS
+from simphony.core.cuba import CUBA
+from simphony.cuds.meta.api import Material
+from simphony.cuds.particles import Particles
+
+from simlammps.common.cuds_index import CudsIndex
+
+
+class _CountingCUDS(CUDS):
+    """ CUDS which counts how often it is iterated over """
+
+    def __init__(self):
+        super(_CountingCUDS, self).__init__()
+        self.number_of_iterations = 0
+
+    def iter(self, *args, **kwargs):
+        self.number_of_iterations += 1
+        return super(_CountingCUDS, self).iter(*args, **kwargs)
+
+
+class _Item(object):
+    """ Item with the uid of another item """
+
+    def __init__(self, uid):
+        self.uid = uid
+
+
+class TestCudsIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.cuds = _CountingCUDS()
+        self.materials = [Material(), Material()]
+        self.particles = Particles("foo")
+        self.cuds.add(self.materials)
+        self.cuds.add([self.particles])
+
+        self.index = CudsIndex(self.cuds)
+
+    def test_get_items(self):
+        materials = self.index.get_items(CUBA.MATERIAL)
+
+        self.assertEqual(set(m.uid for m in materials),
+                         set(m.uid for m in self.materials))
+        self.assertEqual(len(self.index.get_items()), 3)
+        self.assertEqual([p.uid for p in self.index.iter(CUBA.PARTICLES)],
+                         [self.particles.uid])
+
+    def test_cuds_is_only_iterated_once(self):
+        for _ in range(3):
+            self.index.get_items(CUBA.MATERIAL)
+            self.index.get_items()
+            self.index.get(self.particles.uid)
+
+        self.assertEqual(self.cuds.number_of_iterations, 2)
+
+    def test_count(self):
+        self.assertEqual(self.index.count_of(CUBA.MATERIAL), 2)
+        self.assertEqual(self.index.count_instances(Particles), 1)
+        self.assertEqual(self.index.count_instances(Material), 2)
+
+    def test_get(self):
+        self.assertIs(self.index.get(self.particles.uid), self.particles)
+        with self.assertRaises(KeyError):
+            self.index.get(self.cuds)
+
+    def test_snapshot(self):
+        self.index.get_items(CUBA.MATERIAL)
+
+        self.cuds.add([Material()])
+
+        # the index is not changed
+        self.assertEqual(len(self.index.get_items(CUBA.MATERIAL)), 2)
+        self.assertEqual(len(CudsIndex(self.cuds).get_items(CUBA.MATERIAL)),
+                         3)
+
+    def test_update(self):
+        self.index.get_items(CUBA.PARTICLES)
+        self.index.get(self.particles.uid)
+        # e.g. a proxy of the particles
+        particles = _Item(self.particles.uid)
+
+        self.index.update([particles, Material()])
+
+        self.assertEqual(self.index.get_items(CUBA.PARTICLES), [particles])
+        self.assertIs(self.index.get(particles.uid), particles)
+        self.assertEqual(len(self.index.get_items()), 3)
+        self.assertEqual(self.cuds.number_of_iterations, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
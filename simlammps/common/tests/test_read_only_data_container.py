@@ -0,0 +1,51 @@
+import copy
+import pickle
+import unittest
+
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+
+from simlammps.common.read_only_data_container import ReadOnlyDataContainer
+
+
+class TestReadOnlyDataContainer(unittest.TestCase):
+
+    def setUp(self):
+        self.data = ReadOnlyDataContainer({CUBA.VELOCITY: (1.0, 0.0, 0.0),
+                                           CUBA.MASS: 1.0})
+
+    def test_read(self):
+        self.assertIsInstance(self.data, DataContainer)
+        self.assertEqual(dict(self.data), {CUBA.VELOCITY: (1.0, 0.0, 0.0),
+                                           CUBA.MASS: 1.0})
+        self.assertEqual(dict(ReadOnlyDataContainer()), {})
+
+    def test_change(self):
+        changes = (lambda: self.data.__setitem__(CUBA.MASS, 2.0),
+                   lambda: self.data.__delitem__(CUBA.MASS),
+                   lambda: self.data.update({CUBA.MASS: 2.0}),
+                   self.data.clear,
+                   lambda: self.data.pop(CUBA.MASS),
+                   self.data.popitem,
+                   lambda: self.data.setdefault(CUBA.RADIUS, 1.0))
+        for change in changes:
+            with self.assertRaises(TypeError):
+                change()
+        self.assertEqual(dict(self.data), {CUBA.VELOCITY: (1.0, 0.0, 0.0),
+                                           CUBA.MASS: 1.0})
+
+    def test_changeable_copy(self):
+        data = DataContainer(self.data)
+        data[CUBA.MASS] = 2.0
+
+        self.assertEqual(self.data[CUBA.MASS], 1.0)
+
+    def test_copy_and_pickle(self):
+        for data in (copy.deepcopy(self.data),
+                     pickle.loads(pickle.dumps(self.data))):
+            self.assertIsInstance(data, ReadOnlyDataContainer)
+            self.assertEqual(data, self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
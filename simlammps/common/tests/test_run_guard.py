@@ -0,0 +1,63 @@
+import threading
+import time
+import unittest
+
+from simlammps.common.run_guard import RunGuard
+
+
+class TestRunGuard(unittest.TestCase):
+
+    def test_wait_without_run(self):
+        guard = RunGuard()
+        guard.wait()
+        self.assertFalse(guard.running)
+
+    def test_wait_blocks_until_run_ended(self):
+        guard = RunGuard()
+        events = []
+
+        def run():
+            guard.attach()
+            # the running thread can access the data
+            guard.wait()
+            time.sleep(0.2)
+            events.append("run ended")
+            guard.end()
+
+        guard.begin()
+        self.assertTrue(guard.running)
+        worker = threading.Thread(target=run)
+        worker.start()
+
+        guard.wait()
+        events.append("accessed")
+        worker.join()
+
+        self.assertEqual(events, ["run ended", "accessed"])
+        self.assertFalse(guard.running)
+
+    def test_begin_waits_for_current_run(self):
+        guard = RunGuard()
+        events = []
+
+        def run():
+            guard.attach()
+            time.sleep(0.2)
+            events.append("first run ended")
+            guard.end()
+
+        guard.begin()
+        worker = threading.Thread(target=run)
+        worker.start()
+
+        guard.begin()
+        events.append("second run begun")
+        guard.attach()
+        guard.end()
+        worker.join()
+
+        self.assertEqual(events, ["first run ended", "second run begun"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import uuid
+
+import numpy
+
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.meta.api import Material
+
+from simlammps.common.utils import (MaterialLookupTable, get_data_fingerprint,
+                                    get_fingerprint)
+
+
+class TestMaterialLookupTable(unittest.TestCase):
+
+    def setUp(self):
+        self.materials = {1: uuid.uuid4(), 2: uuid.uuid4(), 4: uuid.uuid4()}
+        self.table = MaterialLookupTable(self.materials)
+
+    def test_material_uids(self):
+        self.assertEqual(self.table.material_uids,
+                         [self.materials[1],
+                          self.materials[2],
+                          self.materials[4]])
+
+    def test_call(self):
+        for atom_type, material_uid in self.materials.items():
+            self.assertEqual(self.table(atom_type), material_uid)
+        for atom_type in [0, 3, 5, -1]:
+            with self.assertRaises(KeyError):
+                self.table(atom_type)
+
+    def test_call_with_numeric_types(self):
+        # atom types as read from files or gathered into arrays
+        self.assertEqual(self.table(2.0), self.materials[2])
+        self.assertEqual(self.table(numpy.int64(4)), self.materials[4])
+
+    def test_get_material_indices(self):
+        indices = self.table.get_material_indices([4, 1, 1, 2])
+        self.assertEqual(indices.tolist(), [2, 0, 0, 1])
+
+        with self.assertRaises(KeyError):
+            self.table.get_material_indices([1, 3])
+        with self.assertRaises(KeyError):
+            self.table.get_material_indices([1, 5])
+
+    def test_get_material_uids(self):
+        material_uids = self.table.get_material_uids([4, 1, 2])
+        self.assertEqual(list(material_uids),
+                         [self.materials[4],
+                          self.materials[1],
+                          self.materials[2]])
+
+    def test_empty_table(self):
+        table = MaterialLookupTable({})
+        self.assertEqual(table.material_uids, [])
+        self.assertEqual(len(table.get_material_uids([])), 0)
+        with self.assertRaises(KeyError):
+            table(1)
+
+
+class TestGetFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.material = Material()
+        data = self.material.data
+        data[CUBA.MASS] = 1.0
+        data[CUBA.VECTOR] = [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0)]
+        self.material.data = data
+
+    def test_unchanged_item(self):
+        fingerprint = get_fingerprint(self.material)
+
+        self.assertEqual(get_fingerprint(self.material), fingerprint)
+        hash(fingerprint)
+
+    def test_changed_item(self):
+        fingerprint = get_fingerprint(self.material)
+
+        data = self.material.data
+        data[CUBA.VECTOR] = [(2.0, 0.0, 0.0), (0.0, 1.0, 0.0)]
+        self.material.data = data
+
+        self.assertNotEqual(get_fingerprint(self.material), fingerprint)
+
+    def test_array_values(self):
+        data = self.material.data
+        data[CUBA.VECTOR] = numpy.eye(3)
+        self.material.data = data
+        fingerprint = get_fingerprint(self.material)
+
+        self.assertEqual(get_fingerprint(self.material), fingerprint)
+
+        data[CUBA.VECTOR] = 2 * numpy.eye(3)
+        self.material.data = data
+        self.assertNotEqual(get_fingerprint(self.material), fingerprint)
+
+    def test_referenced_items(self):
+        other = Material()
+        data = self.material.data
+        data[CUBA.MATERIAL] = [other]
+        self.material.data = data
+        fingerprint = get_fingerprint(self.material)
+
+        # referenced items are represented by their uid
+        other.data = {CUBA.MASS: 2.0}
+        self.assertEqual(get_fingerprint(self.material), fingerprint)
+
+    def test_data_fingerprint(self):
+        data = DataContainer(self.material.data)
+        fingerprint = get_data_fingerprint(data)
+
+        self.assertEqual(get_data_fingerprint(DataContainer(data)),
+                         fingerprint)
+
+        data[CUBA.ORIGIN] = (1.0, 1.0, 1.0)
+        self.assertNotEqual(get_data_fingerprint(data), fingerprint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import numpy
+
 from simphony.core import CUBA
 
 
@@ -19,3 +21,146 @@ def create_material_to_atom_type_map(state_data):
         material_to_atom[material.uid] = number_atom_types
         number_atom_types += 1
     return material_to_atom
+
+
+class MaterialLookupTable(object):
+    """ Lookup table from atom type to material
+
+    In lammps, each atom has an atom type (an integer from 1 to N) while in
+    Simphony each particle has a material (uid). This table converts
+    whole arrays of atom types to material indices (i.e. the position of
+    the material in 'material_uids') and only resolves the material
+    uid when it is asked for. Single atom types (e.g. of a line of a data
+    file) are looked up in a plain dictionary.
+
+    Parameters
+    ----------
+    atom_type_to_material : dict
+        map from atom type to material uid
+
+    Attributes
+    ----------
+    material_uids : list of uuid.UUID
+        materials ordered by their index
+
+    """
+    def __init__(self, atom_type_to_material):
+        self.material_uids = []
+        self._material_of_type = dict(atom_type_to_material)
+
+        number_types = max(atom_type_to_material) \
+            if atom_type_to_material else 0
+        # material index of each atom type (-1 if atom type is unknown)
+        self._index_of_type = numpy.full(number_types + 1, -1,
+                                         dtype=numpy.int64)
+        for atom_type in sorted(atom_type_to_material):
+            self._index_of_type[atom_type] = len(self.material_uids)
+            self.material_uids.append(atom_type_to_material[atom_type])
+
+        self._material_uids = numpy.empty(len(self.material_uids),
+                                          dtype=object)
+        self._material_uids[:] = self.material_uids
+
+    def __call__(self, atom_type):
+        """ Return material uid of an atom type
+
+        Raises
+        ------
+        KeyError
+            if atom_type is unknown.
+
+        """
+        try:
+            return self._material_of_type[atom_type]
+        except KeyError:
+            raise KeyError("Unknown atom type: {}".format(atom_type))
+
+    def get_material_indices(self, atom_types):
+        """ Return array of material indices of an array of atom types
+
+        Parameters
+        ----------
+        atom_types : array_like of int
+            atom types
+
+        Raises
+        ------
+        KeyError
+            if any atom_type is unknown.
+
+        """
+        atom_types = numpy.asarray(atom_types, dtype=numpy.int64)
+        valid = (atom_types > 0) & (atom_types < len(self._index_of_type))
+        indices = numpy.full(atom_types.shape, -1, dtype=numpy.int64)
+        indices[valid] = self._index_of_type[atom_types[valid]]
+        if numpy.any(indices < 0):
+            unknown = numpy.unique(atom_types[indices < 0])
+            raise KeyError(
+                "Unknown atom types: {}".format(unknown.tolist()))
+        return indices
+
+    def get_material_uids(self, atom_types):
+        """ Return object array of material uids of an array of atom types
+
+        Parameters
+        ----------
+        atom_types : array_like of int
+            atom types
+
+        Raises
+        ------
+        KeyError
+            if any atom_type is unknown.
+
+        """
+        return self._material_uids[self.get_material_indices(atom_types)]
+
+
+def get_fingerprint(item):
+    """ Return a fingerprint of a CUDS item
+
+    The fingerprint is a snapshot of the type, uid and data of the item
+    and can be compared (==) with an earlier fingerprint of the same item
+    in order to find out if the item has been changed since.  Other CUDS
+    items referenced in the data (e.g. the materials of an interatomic
+    potential) are only represented by their uid.
+
+    Parameters
+    ----------
+    item :
+        CUDS item (e.g. Material, Box)
+
+    """
+    return (type(item), item.uid, get_data_fingerprint(item.data))
+
+
+def get_data_fingerprint(data):
+    """ Return a fingerprint of a DataContainer
+
+    The fingerprint is an immutable snapshot of the data (see
+    get_fingerprint).
+
+    Parameters
+    ----------
+    data : DataContainer
+        data (e.g. of a particle container)
+
+    """
+    return _freeze(data)
+
+
+def _freeze(value):
+    """ Return an immutable (and comparable) copy of a value
+
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item_value))
+                         for key, item_value in value.iteritems())
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(item_value) for item_value in value)
+    elif isinstance(value, numpy.ndarray):
+        return (value.shape, tuple(value.ravel().tolist()))
+    elif hasattr(value, "uid"):
+        return value.uid
+    else:
+        return value
@@ -0,0 +1,152 @@
+import re
+import warnings
+
+# suffix of the accelerated styles of each supported package
+_SUFFIXES = {"omp": "omp", "opt": "opt", "kokkos": "kk"}
+
+
+class Accelerator(object):
+    """ Configuration of a LAMMPS accelerator package
+
+    The accelerator is enabled with command-line arguments of LAMMPS (e.g.
+    "-sf omp -pk omp 8") so that it applies to all styles which have an
+    accelerated variant (the other styles run as usual).
+
+    Parameters
+    ----------
+    package : str
+        accelerator package ("omp", "opt" or "kokkos")
+    number_threads : int, optional
+        number of (OpenMP) threads per process (not used by "opt")
+    package_options : sequence of str, optional
+        additional keyword/value options of the package
+        (see the LAMMPS `package` command)
+
+    Raises
+    ------
+    ValueError
+        if the package is not supported or 'number_threads' is not a
+        positive integer
+
+    """
+    def __init__(self, package, number_threads=1, package_options=None):
+        if package not in _SUFFIXES:
+            raise ValueError(
+                "Unsupported accelerator package '{}'. Supported are: "
+                "{}".format(package, ", ".join(sorted(_SUFFIXES))))
+        if int(number_threads) != number_threads or number_threads < 1:
+            raise ValueError(
+                "Number of threads needs to be a positive integer "
+                "not '{}'".format(number_threads))
+        self.package = package
+        self.number_threads = int(number_threads)
+        self.package_options = [str(option)
+                                for option in package_options or []]
+
+    @property
+    def suffix(self):
+        """ suffix of the accelerated styles (e.g. "omp" of lj/cut/omp) """
+        return _SUFFIXES[self.package]
+
+    def get_command_line_arguments(self):
+        """ Return the command-line arguments which enable the accelerator
+
+        """
+        if self.package == "opt":
+            return ["-sf", "opt"]
+        elif self.package == "kokkos":
+            arguments = ["-k", "on", "t", str(self.number_threads),
+                         "-sf", "kk"]
+            if self.package_options:
+                arguments += ["-pk", "kokkos"] + self.package_options
+            return arguments
+        else:
+            return ["-sf", self.suffix,
+                    "-pk", self.package,
+                    str(self.number_threads)] + self.package_options
+
+
+def get_accelerator_arguments(accelerator, available_styles, pair_styles=()):
+    """ Return the command-line arguments of an accelerator
+
+    The accelerator is only used if LAMMPS has been compiled with its
+    package (i.e. there are styles with its suffix).  Otherwise (or if the
+    styles of LAMMPS are unknown), a warning is issued and LAMMPS runs
+    without accelerator.
+
+    Parameters
+    ----------
+    accelerator : Accelerator or None
+        accelerator
+    available_styles : dict or None
+        map from style category (e.g. "pair") to the set of styles
+        compiled into LAMMPS (see get_available_styles) or None if unknown
+    pair_styles : sequence of str, optional
+        pair styles which are used. A warning is issued for each style
+        which has no accelerated variant (and therefore runs as usual).
+
+    Returns
+    -------
+    list of str
+        command-line arguments (empty if no accelerator is used)
+
+    """
+    if accelerator is None:
+        return []
+
+    if available_styles is None:
+        warnings.warn(
+            "The styles of LAMMPS are unknown so the '{}' accelerator "
+            "is not used".format(accelerator.package))
+        return []
+
+    ending = "/" + accelerator.suffix
+    if not any(style.endswith(ending)
+               for styles in available_styles.itervalues()
+               for style in styles):
+        warnings.warn(
+            "LAMMPS does not have the '{}' accelerator package so it "
+            "is not used".format(accelerator.package))
+        return []
+
+    for pair_style in pair_styles:
+        if pair_style + ending not in available_styles.get("pair", ()):
+            warnings.warn(
+                "LAMMPS does not have an accelerated variant of the pair "
+                "style '{}'".format(pair_style))
+
+    return accelerator.get_command_line_arguments()
+
+
+_STYLES_HEADER = re.compile(r"^\*?\s*(\w+)(?: \w+)* styles:\s*$")
+
+
+def get_available_styles(help_output):
+    """ Get the styles compiled into LAMMPS from its help output
+
+    Parameters
+    ----------
+    help_output : str
+        output of 'lammps -h'
+
+    Returns
+    -------
+    dict
+        map from style category (e.g. "pair", "fix") to set of styles
+
+    """
+    available_styles = {}
+    styles = None
+    for line in help_output.splitlines():
+        match = _STYLES_HEADER.match(line)
+        if match:
+            styles = available_styles.setdefault(match.group(1).lower(),
+                                                 set())
+        elif styles is not None:
+            if ":" in line or line.startswith("*"):
+                # start of another section
+                styles = None
+            else:
+                styles.update(token for token in line.split()
+                              if not token.startswith("("))
+    return available_styles
@@ -0,0 +1,248 @@
+from .neighbor import _check_integer
+
+_COMM_STYLES = ("brick", "tiled")
+_BALANCE_STYLES = ("shift", "rcb")
+
+# id of the fix which balances the load periodically
+FIX_BALANCE_ID = "simphony_balance"
+
+
+class Balance(object):
+    """ Configuration of balancing the load of the processes
+
+    The balancing is emitted as LAMMPS `balance` command (once before a
+    run) or as `fix balance` command (periodically during a run).
+    The balancing is read-only, so it can be used as key: two balancings
+    with the same values are equal (and have the same hash).
+
+    Parameters
+    ----------
+    style : str, optional
+        style of balancing: "shift" (moves the cuts of the processor grid)
+        or "rcb" (recursive coordinate bisectioning, needs the "tiled"
+        communication style)
+    threshold : float, optional
+        the load is only balanced if the imbalance factor (maximum over
+        average number of particles per process) exceeds the threshold
+    every : int, optional
+        number of steps between balancing (only used by periodic
+        balancing, see DecompositionSettings)
+    dimensions : str, optional
+        dimensions which are balanced by "shift" (e.g. "xyz" or "x")
+    number_iterations : int, optional
+        maximum number of iterations of "shift"
+    stop_threshold : float, optional
+        "shift" stops iterating once the imbalance factor is below
+        this threshold
+
+    Raises
+    ------
+    ValueError
+        if a setting is not valid
+
+    """
+    def __init__(self, style="shift", threshold=1.1, every=None,
+                 dimensions="xyz", number_iterations=10, stop_threshold=1.05):
+        if style not in _BALANCE_STYLES:
+            raise ValueError(
+                "Unsupported balance style '{}'".format(style))
+        if threshold < 1.0:
+            raise ValueError(
+                "Threshold needs to be at least 1.0 not '{}'".format(
+                    threshold))
+        if every is not None:
+            _check_integer("every", every, minimum=1)
+        if not dimensions or \
+                any(dimension not in "xyz" for dimension in dimensions):
+            raise ValueError(
+                "Unsupported dimensions '{}'".format(dimensions))
+        _check_integer("number_iterations", number_iterations, minimum=1)
+        if stop_threshold < 1.0:
+            raise ValueError(
+                "Stop threshold needs to be at least 1.0 not '{}'".format(
+                    stop_threshold))
+
+        self._style = style
+        self._threshold = threshold
+        self._every = every
+        self._dimensions = dimensions
+        self._number_iterations = int(number_iterations)
+        self._stop_threshold = stop_threshold
+
+    @property
+    def style(self):
+        return self._style
+
+    @property
+    def threshold(self):
+        return self._threshold
+
+    @property
+    def every(self):
+        return self._every
+
+    @property
+    def dimensions(self):
+        return self._dimensions
+
+    @property
+    def number_iterations(self):
+        return self._number_iterations
+
+    @property
+    def stop_threshold(self):
+        return self._stop_threshold
+
+    def get_arguments(self):
+        """ Return the arguments of the style (e.g. "shift xyz 10 1.05")
+
+        """
+        if self.style == "rcb":
+            return "rcb"
+        return "shift {} {} {}".format(self.dimensions,
+                                       self.number_iterations,
+                                       self.stop_threshold)
+
+    def _key(self):
+        return (self.style, self.threshold, self.every, self.dimensions,
+                self.number_iterations, self.stop_threshold)
+
+    def __eq__(self, other):
+        return isinstance(other, Balance) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+class DecompositionSettings(object):
+    """ Configuration of the domain decomposition of parallel runs
+
+    The settings are read-only, so they can be used as keys: two settings
+    with the same values are equal (and have the same hash).
+
+    Parameters
+    ----------
+    processors : sequence of int or "*", optional
+        number of processes in each dimension (e.g. (2, 2, "*")), where
+        "*" lets LAMMPS choose. The grid can only be set before the
+        simulation box is created. If None, LAMMPS chooses the grid.
+    comm_style : str, optional
+        communication style ("brick" or "tiled")
+    balance : Balance, optional
+        balancing of the load before each run (see the LAMMPS `balance`
+        command)
+    fix_balance : Balance, optional
+        periodic balancing of the load during each run (see the LAMMPS
+        `fix balance` command). Its 'every' needs to be given.
+
+    Raises
+    ------
+    ValueError
+        if a setting is not valid
+
+    """
+    def __init__(self, processors=None, comm_style="brick", balance=None,
+                 fix_balance=None):
+        if processors is not None:
+            processors = tuple(processors)
+            if len(processors) != 3 or \
+                    any(number != "*" and (int(number) != number or
+                                           number < 1)
+                        for number in processors):
+                raise ValueError(
+                    "Processor grid needs 3 positive integers (or '*') "
+                    "not '{}'".format(processors))
+        if comm_style not in _COMM_STYLES:
+            raise ValueError(
+                "Unsupported communication style '{}'".format(comm_style))
+        if balance is not None and balance.every is not None:
+            raise ValueError(
+                "The balancing before a run is not periodic "
+                "(use 'fix_balance')")
+        if fix_balance is not None and fix_balance.every is None:
+            raise ValueError(
+                "The periodic balancing needs the number of steps "
+                "between balancing ('every')")
+        for balancing in (balance, fix_balance):
+            if balancing is not None and balancing.style == "rcb" and \
+                    comm_style != "tiled":
+                raise ValueError(
+                    "The 'rcb' balance style needs the 'tiled' "
+                    "communication style")
+
+        self._processors = processors
+        self._comm_style = comm_style
+        self._balance = balance
+        self._fix_balance = fix_balance
+
+    @property
+    def processors(self):
+        return self._processors
+
+    @property
+    def comm_style(self):
+        return self._comm_style
+
+    @property
+    def balance(self):
+        return self._balance
+
+    @property
+    def fix_balance(self):
+        return self._fix_balance
+
+    def get_initial_commands(self):
+        """ Return the processor-grid and communication-style commands
+
+        The commands have to be used before the simulation box is created.
+
+        """
+        commands = ""
+        if self.processors is not None:
+            commands += "processors {} {} {}\n".format(*self.processors)
+        commands += "comm_style {}\n".format(self.comm_style)
+        return commands
+
+    def get_balance_commands(self):
+        """ Return the balancing commands
+
+        The commands have to be used after the atoms have been created
+        (and before the run).
+
+        """
+        commands = ""
+        if self.balance is not None:
+            commands += "balance {} {}\n".format(
+                self.balance.threshold, self.balance.get_arguments())
+        if self.fix_balance is not None:
+            commands += "fix {} all balance {} {} {}\n".format(
+                FIX_BALANCE_ID,
+                self.fix_balance.every,
+                self.fix_balance.threshold,
+                self.fix_balance.get_arguments())
+        return commands
+
+    def get_unbalance_commands(self):
+        """ Return the commands which stop the periodic balancing
+
+        """
+        if self.fix_balance is not None:
+            return "unfix {}\n".format(FIX_BALANCE_ID)
+        return ""
+
+    def _key(self):
+        return (self.processors, self.comm_style, self.balance,
+                self.fix_balance)
+
+    def __eq__(self, other):
+        return isinstance(other, DecompositionSettings) and \
+            self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
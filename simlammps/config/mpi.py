@@ -0,0 +1,116 @@
+import os
+
+# environment variables configuring the MPI launcher
+# (see get_mpi_launcher_from_environment)
+MPI_NUMBER_PROCESSES_VARIABLE = "SIM_LAMMPS_MPI_NP"
+MPI_LAUNCHER_VARIABLE = "SIM_LAMMPS_MPI_LAUNCHER"
+MPI_BIND_TO_VARIABLE = "SIM_LAMMPS_MPI_BIND"
+MPI_HOSTFILE_VARIABLE = "SIM_LAMMPS_MPI_HOSTFILE"
+
+
+class MpiLauncher(object):
+    """ Configuration of launching LAMMPS with MPI
+
+    The LAMMPS executable is started by the MPI launcher (e.g.
+    "mpirun -np 4 lammps ...").  The binding and hostfile options are
+    given as understood by Open MPI's mpirun, other options (or the
+    options of other launchers) can be given as 'extra_arguments'.
+
+    Parameters
+    ----------
+    number_processes : int
+        number of (MPI) processes
+    launcher : str, optional
+        name of the MPI launcher executable
+    bind_to : str, optional
+        what the processes are bound to (e.g. "core", "socket" or "none").
+        If None, the default binding of the launcher is used.
+    hostfile : str, optional
+        name of the hostfile. If None, the processes are started on
+        the local host.
+    extra_arguments : sequence of str, optional
+        additional arguments passed to the launcher
+
+    Raises
+    ------
+    ValueError
+        if 'number_processes' is not a positive integer
+
+    """
+    def __init__(self, number_processes, launcher="mpirun", bind_to=None,
+                 hostfile=None, extra_arguments=None):
+        if int(number_processes) != number_processes or \
+                number_processes < 1:
+            raise ValueError(
+                "Number of processes needs to be a positive integer "
+                "not '{}'".format(number_processes))
+        self.number_processes = int(number_processes)
+        self.launcher = launcher
+        self.bind_to = bind_to
+        self.hostfile = hostfile
+        self.extra_arguments = list(extra_arguments or [])
+
+    def get_command(self, arguments):
+        """ Return the command line which launches a program with MPI
+
+        Parameters
+        ----------
+        arguments : sequence of str
+            program (e.g. LAMMPS executable) and its arguments
+
+        Returns
+        -------
+        list of str
+            command line
+
+        """
+        command = [self.launcher, "-np", str(self.number_processes)]
+        if self.bind_to:
+            command += ["--bind-to", self.bind_to]
+        if self.hostfile:
+            command += ["--hostfile", self.hostfile]
+        return command + self.extra_arguments + list(arguments)
+
+
+def get_mpi_launcher_from_environment(environ=None):
+    """ Return MPI launcher configured by the environment (or None)
+
+    The launcher is configured by the following environment variables:
+    SIM_LAMMPS_MPI_NP (number of processes), SIM_LAMMPS_MPI_LAUNCHER,
+    SIM_LAMMPS_MPI_BIND and SIM_LAMMPS_MPI_HOSTFILE.
+
+    Parameters
+    ----------
+    environ : dict, optional
+        environment. If None, then os.environ is used.
+
+    Returns
+    -------
+    MpiLauncher or None
+        launcher or None if SIM_LAMMPS_MPI_NP is not set
+
+    Raises
+    ------
+    ValueError
+        if SIM_LAMMPS_MPI_NP is not a positive integer
+
+    """
+    if environ is None:
+        environ = os.environ
+
+    number_processes = environ.get(MPI_NUMBER_PROCESSES_VARIABLE)
+    if not number_processes:
+        return None
+
+    try:
+        number_processes = int(number_processes)
+    except ValueError:
+        raise ValueError(
+            "{} needs to be a positive integer not '{}'".format(
+                MPI_NUMBER_PROCESSES_VARIABLE, number_processes))
+
+    return MpiLauncher(
+        number_processes,
+        launcher=environ.get(MPI_LAUNCHER_VARIABLE) or "mpirun",
+        bind_to=environ.get(MPI_BIND_TO_VARIABLE) or None,
+        hostfile=environ.get(MPI_HOSTFILE_VARIABLE) or None)
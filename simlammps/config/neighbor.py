@@ -0,0 +1,203 @@
+_BIN_STYLES = ("bin", "nsq", "multi")
+_ATOM_MAPS = ("array", "hash", "yes")
+
+
+class NeighborSettings(object):
+    """ Configuration of the neighbor lists and atom sorting
+
+    The settings are emitted as LAMMPS `neighbor`, `neigh_modify` and
+    `atom_modify` commands (see get_commands and get_atom_map_command).
+    The settings are read-only (changed copies are created with replace),
+    so they can be used as keys: two settings with the same values are
+    equal (and have the same hash).
+
+    Parameters
+    ----------
+    skin : float, optional
+        extra distance beyond the force cutoff
+    bin_style : str, optional
+        style of building the lists ("bin", "nsq" or "multi")
+    every : int, optional
+        number of steps between (checks for) building the lists
+    delay : int, optional
+        number of steps since the last build before building the lists
+    check : bool, optional
+        if True, the lists are only built if an atom has moved more than
+        half the skin distance
+    page : int, optional
+        number of pairs stored in one page of the lists. If None, the
+        LAMMPS default is used.
+    one : int, optional
+        maximum number of neighbors of one atom. If None, the LAMMPS
+        default is used.
+    atom_map : str, optional
+        how atom ids are mapped to local atoms ("array", "hash" or "yes").
+        The map can only be set before the simulation box is created.
+    sort_every : int, optional
+        number of steps between spatial sorting of the atoms (0 disables
+        the sorting). If None, the LAMMPS default is used.
+    sort_binsize : float, optional
+        bin size of the sorting (0.0 is half the force cutoff). Only used
+        together with 'sort_every'.
+
+    Raises
+    ------
+    ValueError
+        if a setting is not valid
+
+    """
+    def __init__(self, skin=0.3, bin_style="bin", every=1, delay=5,
+                 check=True, page=None, one=None, atom_map="array",
+                 sort_every=None, sort_binsize=0.0):
+        if skin < 0.0:
+            raise ValueError(
+                "Skin distance needs to be non-negative not '{}'".format(
+                    skin))
+        if bin_style not in _BIN_STYLES:
+            raise ValueError(
+                "Unsupported neighbor style '{}'".format(bin_style))
+        if atom_map not in _ATOM_MAPS:
+            raise ValueError("Unsupported atom map '{}'".format(atom_map))
+        _check_integer("every", every, minimum=1)
+        _check_integer("delay", delay, minimum=0)
+        if page is not None:
+            _check_integer("page", page, minimum=1)
+        if one is not None:
+            _check_integer("one", one, minimum=1)
+        if page is not None and one is not None and page < 10 * one:
+            raise ValueError(
+                "'page' needs to be at least 10 times 'one'")
+        if sort_every is not None:
+            _check_integer("sort_every", sort_every, minimum=0)
+            if sort_binsize < 0.0:
+                raise ValueError(
+                    "Sort bin size needs to be non-negative not "
+                    "'{}'".format(sort_binsize))
+
+        self._skin = skin
+        self._bin_style = bin_style
+        self._every = int(every)
+        self._delay = int(delay)
+        self._check = bool(check)
+        self._page = page
+        self._one = one
+        self._atom_map = atom_map
+        self._sort_every = sort_every
+        self._sort_binsize = sort_binsize
+
+    @property
+    def skin(self):
+        return self._skin
+
+    @property
+    def bin_style(self):
+        return self._bin_style
+
+    @property
+    def every(self):
+        return self._every
+
+    @property
+    def delay(self):
+        return self._delay
+
+    @property
+    def check(self):
+        return self._check
+
+    @property
+    def page(self):
+        return self._page
+
+    @property
+    def one(self):
+        return self._one
+
+    @property
+    def atom_map(self):
+        return self._atom_map
+
+    @property
+    def sort_every(self):
+        return self._sort_every
+
+    @property
+    def sort_binsize(self):
+        return self._sort_binsize
+
+    def get_commands(self):
+        """ Return the neighbor-list (and sorting) commands
+
+        The commands can be used before or after the simulation box is
+        created.
+
+        """
+        commands = "neighbor {} {}\n".format(self.skin, self.bin_style)
+        commands += "neigh_modify every {} delay {} check {}".format(
+            self.every, self.delay, "yes" if self.check else "no")
+        if self.page is not None:
+            commands += " page {}".format(self.page)
+        if self.one is not None:
+            commands += " one {}".format(self.one)
+        commands += "\n"
+        if self.sort_every is not None:
+            commands += "atom_modify sort {} {}\n".format(self.sort_every,
+                                                          self.sort_binsize)
+        return commands
+
+    def get_atom_map_command(self):
+        """ Return the atom-map command
+
+        The command has to be used before the simulation box is created.
+
+        """
+        return "atom_modify map {}\n".format(self.atom_map)
+
+    def replace(self, **changes):
+        """ Return a copy of the settings with some settings changed
+
+        Parameters
+        ----------
+        changes :
+            changed settings (e.g. skin=0.5, delay=0)
+
+        Raises
+        ------
+        ValueError
+            if a setting is not valid
+
+        """
+        settings = dict(skin=self.skin,
+                        bin_style=self.bin_style,
+                        every=self.every,
+                        delay=self.delay,
+                        check=self.check,
+                        page=self.page,
+                        one=self.one,
+                        atom_map=self.atom_map,
+                        sort_every=self.sort_every,
+                        sort_binsize=self.sort_binsize)
+        settings.update(changes)
+        return NeighborSettings(**settings)
+
+    def _key(self):
+        return (self.skin, self.bin_style, self.every, self.delay,
+                self.check, self.page, self.one, self.atom_map,
+                self.sort_every, self.sort_binsize)
+
+    def __eq__(self, other):
+        return isinstance(other, NeighborSettings) and \
+            self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+def _check_integer(name, value, minimum):
+    if int(value) != value or value < minimum:
+        raise ValueError(
+            "'{}' needs to be an integer of at least {} not '{}'".format(
+                name, minimum, value))
@@ -0,0 +1,119 @@
+from .neighbor import NeighborSettings, _check_integer
+
+# sections of the timing breakdown which depend on the neighbor settings
+_TUNED_SECTIONS = ("Pair", "Neigh", "Comm")
+
+_DEFAULT_SKINS = (0.1, 0.3, 0.5, 1.0)
+_DEFAULT_MODIFY_OPTIONS = ({"every": 1, "delay": 0, "check": True},
+                           {"every": 2, "delay": 0, "check": True})
+
+
+class NeighborTuning(object):
+    """ Configuration of the automatic tuning of the neighbor settings
+
+    Each candidate setting (i.e. each combination of a skin and a set of
+    `neigh_modify` options) is run for a few steps and the setting where
+    the least time is spent in the pair, neighbor and communication
+    sections (as reported by the timing breakdown of LAMMPS) is chosen.
+
+    Parameters
+    ----------
+    number_steps : int
+        number of steps of each probe run
+    skins : sequence of float, optional
+        candidate skin distances
+    modify_options : sequence of dict, optional
+        candidate `neigh_modify` options, e.g. {"every": 2, "delay": 0,
+        "check": True} (see NeighborSettings)
+
+    Raises
+    ------
+    ValueError
+        if 'number_steps' is not a positive integer or a candidate is
+        not valid
+
+    """
+    def __init__(self, number_steps, skins=None, modify_options=None):
+        _check_integer("number_steps", number_steps, minimum=1)
+        self.number_steps = int(number_steps)
+        self.skins = tuple(skins if skins is not None else _DEFAULT_SKINS)
+        self.modify_options = tuple(
+            dict(options) for options in (
+                modify_options if modify_options is not None
+                else _DEFAULT_MODIFY_OPTIONS))
+        if not self.skins or not self.modify_options:
+            raise ValueError("At least one candidate is needed")
+
+        # validate the candidates
+        self.get_candidates(NeighborSettings())
+
+    def get_candidates(self, neighbor_settings):
+        """ Return the candidate settings
+
+        Parameters
+        ----------
+        neighbor_settings : NeighborSettings
+            current settings. The settings which are not tuned (e.g. the
+            atom map) are kept.
+
+        Returns
+        -------
+        list of NeighborSettings
+            candidate settings
+
+        """
+        return [neighbor_settings.replace(skin=skin, **options)
+                for skin in self.skins
+                for options in self.modify_options]
+
+    def get_probe_commands(self, candidates):
+        """ Return the commands which run each candidate setting
+
+        Parameters
+        ----------
+        candidates : list of NeighborSettings
+            candidate settings
+
+        """
+        commands = ""
+        for candidate in candidates:
+            commands += candidate.get_commands()
+            commands += "run {}\n".format(self.number_steps)
+        return commands
+
+    def select(self, candidates, timings):
+        """ Select the fastest of the candidate settings
+
+        Parameters
+        ----------
+        candidates : list of NeighborSettings
+            candidate settings
+        timings : list of RunTiming
+            timings of the runs of the log where the last runs are the
+            probe runs of the candidates (see get_probe_commands)
+
+        Returns
+        -------
+        NeighborSettings
+            fastest setting
+
+        Raises
+        ------
+        RuntimeError
+            if there is no timing of each candidate
+
+        """
+        timings = timings[len(timings) - len(candidates):]
+        if len(timings) != len(candidates) or \
+                any(timing.number_steps != self.number_steps
+                    for timing in timings):
+            raise RuntimeError(
+                "No timings of the probe runs of the neighbor settings")
+
+        def cost(timing):
+            if timing.sections:
+                return timing.get_time(*_TUNED_SECTIONS)
+            return timing.get_time()
+
+        costs = [cost(timing) for timing in timings]
+        return candidates[costs.index(min(costs))]
@@ -1,3 +1,5 @@
+import collections
+
 import yaml
 
 from simphony.api import CUBA
@@ -16,25 +18,93 @@ _supported_pair_styles = {"lj": {"pair_style": "lj/cut",
                                    ["cutoff"]},
                           }
 
+# supported mixing rules of pair coefficients (see pair_modify)
+_supported_mixing_rules = ("geometric", "arithmetic", "sixthpower")
+
+
+# number of parsed pair style configurations which are cached
+_PAIR_STYLE_CACHE_SIZE = 8
+
+# map from (recently parsed) configuration to its pair style
+_PAIR_STYLES = collections.OrderedDict()
+
+
+def get_pair_style(SP):
+    """ Return pair style of the configuration in the SP
+
+    The configuration (see CUBA.PAIR_POTENTIAL) is either a PairStyle,
+    which is returned as it is, or the pair style information as (YAML)
+    text.  The text is parsed once and the pair styles of the last few
+    configurations are cached.
+
+    Parameters
+    ----------
+    SP : DataContainer
+        solver parameters
+
+    """
+    configuration = SP.get(CUBA.PAIR_POTENTIAL)
+    if isinstance(configuration, PairStyle):
+        return configuration
+
+    try:
+        pair_style = _PAIR_STYLES.pop(configuration)
+    except KeyError:
+        pair_style = PairStyle(SP)
+        if len(_PAIR_STYLES) >= _PAIR_STYLE_CACHE_SIZE:
+            _PAIR_STYLES.popitem(last=False)
+    # the most recently used configuration is last
+    _PAIR_STYLES[configuration] = pair_style
+    return pair_style
+
 
 class PairStyle(object):
     """ A PairStyle instance
 
     The PairStyle object interprets the configuration of the SP
-    to determine the pairwise interaction of atoms in LAMMPS
+    to determine the pairwise interaction of atoms in LAMMPS.
+
+    PairStyle objects are immutable and two pair styles with the same
+    pair style information are equal (and have the same hash).
 
+    Parameters
+    ----------
+    SP : DataContainer, optional
+        solver parameters with the pair style information as (YAML) text
+    pair_infos : iterable of PairStyleInfo, optional
+        pair style infos (instead of parsing the SP)
 
     """
 
-    def __init__(self, SP):
+    def __init__(self, SP=None, pair_infos=None):
         """ Constructor.
 
-         Parses the pair style information in the SP
+         Parses the pair style information in the SP (unless the pair
+         style infos are given)
 
         """
-        self._global = ""
-        self._pair_coefs = ""
-        self._pair_infos = self._create_pair_infos(SP)
+        if pair_infos is None:
+            pair_infos = self._create_pair_infos(SP or {})
+        self._pair_infos = tuple(pair_infos)
+
+        # generated commands (None until needed)
+        self._global_config = None
+        self._pair_coeffs = None
+
+    @property
+    def pair_infos(self):
+        """ pair style infos (tuple of PairStyleInfo) """
+        return self._pair_infos
+
+    def __eq__(self, other):
+        return isinstance(other, PairStyle) and \
+            self._pair_infos == other._pair_infos
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._pair_infos)
 
     def get_global_config(self):
         """ Returns global configuration text
@@ -43,15 +113,38 @@ class PairStyle(object):
 
         "pair_style lj/cut 1.2334"
 
+        If a mixing rule is configured (e.g. "mix: arithmetic"), the
+        corresponding pair_modify command is added so that the
+        coefficients of pairs of different types which are not given
+        explicitly are mixed by LAMMPS.
+
         An empty string is returned if there is no pair style
         information
         """
+        if self._global_config is None:
+            self._global_config = self._create_global_config()
+        return self._global_config
+
+    def get_pair_coeffs(self):
+        """ Returns pair coefficients configuration text
+
+        """
+        if self._pair_coeffs is None:
+            self._pair_coeffs = self._create_pair_coeffs()
+        return self._pair_coeffs
+
+    # Private methods #######################################################
+
+    def _create_global_config(self):
         if self._pair_infos:
             if len(self._pair_infos) == 1:
                 pair_info = self._pair_infos[0]
-                return "pair_style {} {}\n".format(
+                result = "pair_style {} {}\n".format(
                     pair_info.pair_style,
                     " ".join(map(str, pair_info.global_params)))
+                if pair_info.mix:
+                    result += "pair_modify mix {}\n".format(pair_info.mix)
+                return result
             else:
                 # hybrid/overlay style
                 result = "pair_style hybrid/overlay"
@@ -60,14 +153,15 @@ class PairStyle(object):
                         pair_info.pair_style,
                         " ".join(map(str, pair_info.global_params)))
                 result += "\n"
+                for pair_info in self._pair_infos:
+                    if pair_info.mix:
+                        result += "pair_modify pair {} mix {}\n".format(
+                            pair_info.pair_style, pair_info.mix)
                 return result
         else:
             return ""
 
-    def get_pair_coeffs(self):
-        """ Returns global configuration text
-
-        """
+    def _create_pair_coeffs(self):
         if self._pair_infos:
             coeffs = ""
             isOverlay = len(self._pair_infos) > 1
@@ -85,46 +179,10 @@ class PairStyle(object):
                     # then add all params
                     coeffs += " ".join(map(str, params)) + "\n"
             coeffs += "\n"
-
-            # work-around for not being able to change the number of types
-            # (see issue #66), we set up a general wildcard pair coeffiencents
-            # so that every type is covered (i.e. pair_coeff * * XXX XXX XXX)
-            # and then what the user specifically sets overrides it for the
-            # actual types that are in use.
-            coeffs = self._extract_wildcard_coeffs() + coeffs
             return coeffs
         else:
             return ""
 
-    # Private methods #######################################################
-
-    def _extract_wildcard_coeffs(self):
-        """ Get wildcard coefficients
-
-            Get wildcard pair coefficients.  This is used due to issue #66.
-            See comment in get_pair_coeffs method.
-        """
-        coeffs = ""
-        isOverlay = len(self._pair_infos) > 1
-        for pair_info in self._pair_infos:
-            for pair, params in pair_info.pair_params.iteritems():
-                # first add list pair info
-                # pair_coeff * * x.xx x.xx x.xx
-                coeffs += "pair_coeff * * "
-
-                if isOverlay:
-                    # add additional info for overlay
-                    coeffs += pair_info.pair_style + " "
-
-                # then add params all params
-                coeffs += " ".join(map(str, params)) + "\n"
-
-                # now we stop as we need only one wild card for each type
-                break
-        coeffs += "\n"
-
-        return coeffs
-
     @staticmethod
     def _create_pair_infos(SP):
         """ Creates appropriate pair info handler(s) from information
@@ -148,10 +206,12 @@ class PairStyle(object):
                         parameters, req_global)
                     pair_params = PairStyle._get_pair_params(parameters,
                                                              req_params)
+                    mix = PairStyle._get_mixing_rule(parameters)
                     styles.append(
                         PairStyleInfo(pair_style=handler_info["pair_style"],
                                       global_params=global_params,
-                                      pair_params=pair_params))
+                                      pair_params=pair_params,
+                                      mix=mix))
                 else:
                     raise RuntimeError(
                         "Unsupported pair style: {}".format(my_pair_style))
@@ -174,6 +234,14 @@ class PairStyle(object):
 
         return global_params
 
+    @staticmethod
+    def _get_mixing_rule(keywords):
+        mix = keywords.get("mix")
+        if mix is not None and mix not in _supported_mixing_rules:
+            raise RuntimeError(
+                "Unsupported mixing rule: {}".format(mix))
+        return mix
+
     @staticmethod
     def _get_pair_params(keywords, required_pair_params):
         pair_params = {}
@@ -208,12 +276,57 @@ class PairStyleInfo(object):
     """ A pair style info which knows its all required global and pair-specific
     parameters
 
+    PairStyleInfo objects are immutable and hashable.
+
     """
+    __slots__ = ("_pair_style", "_global_params", "_pair_params", "_mix")
 
     def __init__(self,
                  pair_style,
                  global_params,
-                 pair_params):
-        self.pair_style = pair_style
-        self.global_params = global_params
-        self.pair_params = pair_params
+                 pair_params,
+                 mix=None):
+        self._pair_style = pair_style
+        self._mix = mix
+        self._global_params = tuple(global_params)
+        self._pair_params = tuple(sorted(
+            (tuple(pair), tuple(params))
+            for pair, params in pair_params.iteritems()))
+
+    @property
+    def pair_style(self):
+        """ name of pair style (e.g. "lj/cut") """
+        return self._pair_style
+
+    @property
+    def global_params(self):
+        """ global parameters (tuple) """
+        return self._global_params
+
+    @property
+    def mix(self):
+        """ mixing rule of the pair coefficients (or None) """
+        return self._mix
+
+    @property
+    def pair_params(self):
+        """ map from pair (of atom types) to its parameters
+
+        The map is ordered by pair.
+
+        """
+        return collections.OrderedDict(self._pair_params)
+
+    def _key(self):
+        return (self._pair_style, self._global_params, self._pair_params,
+                self._mix)
+
+    def __eq__(self, other):
+        return isinstance(other, PairStyleInfo) and \
+            self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
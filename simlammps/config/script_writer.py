@@ -1,7 +1,8 @@
 from simphony.api import CUBA
 
 
-from .pair_style import PairStyle
+from .neighbor import NeighborSettings
+from .pair_style import get_pair_style
 from .atom_type_fixes import get_per_atom_type_fixes
 from ..common.atom_style import (get_lammps_string, AtomStyle)
 
@@ -27,14 +28,26 @@ class ScriptWriter(object):
     ----------
     atom_style: str
         atom_style
+    neighbor_settings: NeighborSettings, optional
+        settings of the neighbor lists and atom sorting. If None, then
+        the default settings are used.
+    decomposition_settings: DecompositionSettings, optional
+        settings of the domain decomposition and load balancing. If None,
+        then LAMMPS decomposes the domain and does not balance the load.
 
     """
 
-    def __init__(self, atom_style):
+    def __init__(self, atom_style, neighbor_settings=None,
+                 decomposition_settings=None):
         self._atom_style = atom_style
+        if neighbor_settings is None:
+            neighbor_settings = NeighborSettings()
+        self._neighbor_settings = neighbor_settings
+        self._decomposition_settings = decomposition_settings
 
     def get_configuration(self, materials, BC, CM, SP,
-                          input_data_file, output_data_file):
+                          input_data_file, output_data_file,
+                          trajectory_sampling=None):
         """ Return configuration command-script
 
         Parameters
@@ -51,6 +64,8 @@ class ScriptWriter(object):
             name of data file to be read at beginning of run (input)
         output_data_file: string
             name of data file to be written after run (output)
+        trajectory_sampling: TrajectorySampling, optional
+            if given, the trajectory is sampled during the run
 
         Returns
         -------
@@ -86,6 +101,12 @@ class ScriptWriter(object):
 
         result += ScriptWriter.get_pair_coeff(SP)
 
+        if self._decomposition_settings:
+            result += ScriptWriter.get_balance(self._decomposition_settings)
+
+        if trajectory_sampling:
+            result += ScriptWriter.get_dump(trajectory_sampling)
+
         result += ScriptWriter.get_run(CM)
 
         if output_data_file:
@@ -104,25 +125,41 @@ class ScriptWriter(object):
         return CONFIGURATION_RUN.format(NUMBER_STEPS=number_steps,
                                         TIME_STEP=time_step)
 
+    @staticmethod
+    def get_dump(trajectory_sampling):
+        """ Return command-script which starts sampling the trajectory
+
+        Parameters
+        ----------
+        trajectory_sampling : TrajectorySampling
+            configuration of the sampling
+
+        """
+        return DUMP.format(
+            EVERY=trajectory_sampling.every,
+            DUMP_FILE=trajectory_sampling.filename,
+            ATTRIBUTES=" ".join(trajectory_sampling.attributes))
+
+    @staticmethod
+    def get_undump():
+        """ Return command-script which stops sampling the trajectory
+
+        """
+        return UNDUMP
+
     @staticmethod
     def get_pair_style(SP):
         """ Return pair_coeff command-script
 
         """
-        # TODO this should be change once this class
-        # keeps track of states
-        pair_style = PairStyle(SP)
-        return pair_style.get_global_config()
+        return get_pair_style(SP).get_global_config()
 
     @staticmethod
     def get_pair_coeff(SP):
         """ Return pair_coeff command-script
 
         """
-        # TODO this should be change once this class
-        # keeps track of states
-        pair_style = PairStyle(SP)
-        return pair_style.get_pair_coeffs()
+        return get_pair_style(SP).get_pair_coeffs()
 
     @staticmethod
     def get_fix(CM):
@@ -144,14 +181,52 @@ class ScriptWriter(object):
         """
         return _get_boundary(BC, change_existing_boundary)
 
+    @staticmethod
+    def get_neighbor(neighbor_settings):
+        """ Return neighbor-list (and atom sorting) command-script
+
+        Parameters
+        ----------
+        neighbor_settings : NeighborSettings
+            settings of the neighbor lists and atom sorting
+
+        """
+        return neighbor_settings.get_commands()
+
+    @staticmethod
+    def get_balance(decomposition_settings):
+        """ Return load-balancing command-script (used before a run)
+
+        Parameters
+        ----------
+        decomposition_settings : DecompositionSettings
+            settings of the domain decomposition and load balancing
+
+        """
+        return decomposition_settings.get_balance_commands()
+
+    @staticmethod
+    def get_unbalance(decomposition_settings):
+        """ Return command-script which stops the periodic load balancing
+
+        Parameters
+        ----------
+        decomposition_settings : DecompositionSettings
+            settings of the domain decomposition and load balancing
+
+        """
+        return decomposition_settings.get_unbalance_commands()
+
     def get_initial_setup(self):
-        return INITIAL.format(get_lammps_string(self._atom_style))
+        result = INITIAL.format(get_lammps_string(self._atom_style)) + \
+            self._neighbor_settings.get_atom_map_command() + \
+            ScriptWriter.get_neighbor(self._neighbor_settings)
+        if self._decomposition_settings:
+            result += self._decomposition_settings.get_initial_commands()
+        return result
 
 
 INITIAL = """atom_style  {}
-atom_modify     map array
-neighbor    0.3 bin
-neigh_modify    delay 5
 """
 
 
@@ -245,6 +320,15 @@ timestep {TIME_STEP}
 run {NUMBER_STEPS}
 """
 
+DUMP = """
+# sample trajectory
+dump simphony_trajectory all custom {EVERY} {DUMP_FILE} id type {ATTRIBUTES}
+dump_modify simphony_trajectory sort id
+"""
+
+UNDUMP = """undump simphony_trajectory
+"""
+
 WRITE_DATA = """
 
 # write results to simphony-generated file
@@ -0,0 +1,124 @@
+import unittest
+import warnings
+
+from simlammps.config.accelerator import (
+    Accelerator, get_accelerator_arguments, get_available_styles)
+
+
+_HELP_OUTPUT = """
+Large-scale Atomic/Molecular Massively Parallel Simulator - 10 Aug 2015
+
+Usage example: lmp_g++ -var t 300 -echo screen -in in.alloy
+
+List of command line options supported by this LAMMPS executable:
+
+-echo none/screen/log/both  : echoing of input script (-e)
+
+List of style options included in this LAMMPS executable
+
+Atom styles:
+  atomic          body            charge          ellipsoid
+  sphere
+Pair styles:
+  coul/cut        lj/cut          lj/cut/omp      lj/cut/opt
+  zero
+Fix styles:
+  nve             nve/omp         rigid
+"""
+
+
+class TestAccelerator(unittest.TestCase):
+
+    def test_omp_arguments(self):
+        accelerator = Accelerator("omp", number_threads=8)
+        self.assertEqual(accelerator.suffix, "omp")
+        self.assertEqual(accelerator.get_command_line_arguments(),
+                         ["-sf", "omp", "-pk", "omp", "8"])
+
+        accelerator = Accelerator("omp",
+                                  number_threads=4,
+                                  package_options=["neigh", "no"])
+        self.assertEqual(accelerator.get_command_line_arguments(),
+                         ["-sf", "omp", "-pk", "omp", "4", "neigh", "no"])
+
+    def test_opt_arguments(self):
+        accelerator = Accelerator("opt")
+        self.assertEqual(accelerator.get_command_line_arguments(),
+                         ["-sf", "opt"])
+
+    def test_kokkos_arguments(self):
+        accelerator = Accelerator("kokkos", number_threads=16)
+        self.assertEqual(accelerator.suffix, "kk")
+        self.assertEqual(accelerator.get_command_line_arguments(),
+                         ["-k", "on", "t", "16", "-sf", "kk"])
+
+    def test_invalid_accelerator(self):
+        with self.assertRaises(ValueError):
+            Accelerator("cuda")
+        with self.assertRaises(ValueError):
+            Accelerator("omp", number_threads=0)
+
+
+class TestAvailableStyles(unittest.TestCase):
+
+    def test_get_available_styles(self):
+        styles = get_available_styles(_HELP_OUTPUT)
+        self.assertEqual(styles["pair"],
+                         set(["coul/cut", "lj/cut", "lj/cut/omp",
+                              "lj/cut/opt", "zero"]))
+        self.assertEqual(styles["fix"], set(["nve", "nve/omp", "rigid"]))
+        self.assertTrue("sphere" in styles["atom"])
+
+    def test_get_available_styles_starred_headers(self):
+        output = ("* Pair styles:\n"
+                  "\n"
+                  "lj/cut          lj/cut/omp      \n"
+                  "\n"
+                  "* Bond styles:\n"
+                  "\n"
+                  "harmonic\n")
+        styles = get_available_styles(output)
+        self.assertEqual(styles["pair"], set(["lj/cut", "lj/cut/omp"]))
+        self.assertEqual(styles["bond"], set(["harmonic"]))
+
+
+class TestGetAcceleratorArguments(unittest.TestCase):
+
+    def setUp(self):
+        self.styles = get_available_styles(_HELP_OUTPUT)
+
+    def test_no_accelerator(self):
+        self.assertEqual(get_accelerator_arguments(None, self.styles), [])
+
+    def test_available_accelerator(self):
+        accelerator = Accelerator("omp", number_threads=2)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            arguments = get_accelerator_arguments(accelerator,
+                                                  self.styles,
+                                                  pair_styles=["lj/cut"])
+        self.assertEqual(arguments, accelerator.get_command_line_arguments())
+        self.assertEqual(len(caught), 0)
+
+    def test_style_without_accelerated_variant(self):
+        accelerator = Accelerator("omp", number_threads=2)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            arguments = get_accelerator_arguments(accelerator,
+                                                  self.styles,
+                                                  pair_styles=["coul/cut"])
+        self.assertEqual(arguments, accelerator.get_command_line_arguments())
+        self.assertEqual(len(caught), 1)
+
+    def test_fall_back_without_package(self):
+        accelerator = Accelerator("kokkos", number_threads=2)
+        for styles in (self.styles, None):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                arguments = get_accelerator_arguments(accelerator, styles)
+            self.assertEqual(arguments, [])
+            self.assertEqual(len(caught), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
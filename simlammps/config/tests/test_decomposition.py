@@ -0,0 +1,102 @@
+import unittest
+
+from simlammps.common.atom_style import AtomStyle
+from simlammps.config.decomposition import Balance, DecompositionSettings
+from simlammps.config.script_writer import ScriptWriter
+
+
+class TestBalance(unittest.TestCase):
+
+    def test_arguments(self):
+        self.assertEqual(Balance().get_arguments(), "shift xyz 10 1.05")
+        self.assertEqual(Balance(dimensions="x",
+                                 number_iterations=5,
+                                 stop_threshold=1.2).get_arguments(),
+                         "shift x 5 1.2")
+        self.assertEqual(Balance("rcb").get_arguments(), "rcb")
+
+    def test_invalid(self):
+        for kwargs in ({"style": "unknown"},
+                       {"threshold": 0.9},
+                       {"every": 0},
+                       {"dimensions": ""},
+                       {"dimensions": "xw"},
+                       {"number_iterations": 0},
+                       {"stop_threshold": 0.5}):
+            with self.assertRaises(ValueError):
+                Balance(**kwargs)
+
+
+class TestDecompositionSettings(unittest.TestCase):
+
+    def test_default_commands(self):
+        settings = DecompositionSettings()
+        self.assertEqual(settings.get_initial_commands(),
+                         "comm_style brick\n")
+        self.assertEqual(settings.get_balance_commands(), "")
+        self.assertEqual(settings.get_unbalance_commands(), "")
+
+    def test_commands(self):
+        settings = DecompositionSettings(
+            processors=(2, "*", 1),
+            comm_style="tiled",
+            balance=Balance("rcb", threshold=1.0),
+            fix_balance=Balance("rcb", threshold=1.2, every=1000))
+
+        self.assertEqual(settings.get_initial_commands(),
+                         "processors 2 * 1\n"
+                         "comm_style tiled\n")
+        self.assertEqual(settings.get_balance_commands(),
+                         "balance 1.0 rcb\n"
+                         "fix simphony_balance all balance 1000 1.2 rcb\n")
+        self.assertEqual(settings.get_unbalance_commands(),
+                         "unfix simphony_balance\n")
+
+    def test_invalid(self):
+        for kwargs in ({"processors": (2, 2)},
+                       {"processors": (2, 0, 1)},
+                       {"processors": (2, 1.5, 1)},
+                       {"comm_style": "unknown"},
+                       {"balance": Balance(every=10)},
+                       {"fix_balance": Balance()},
+                       {"balance": Balance("rcb")},
+                       {"fix_balance": Balance("rcb", every=10)}):
+            with self.assertRaises(ValueError):
+                DecompositionSettings(**kwargs)
+
+    def test_equality(self):
+        self.assertEqual(
+            DecompositionSettings(fix_balance=Balance(every=10)),
+            DecompositionSettings(fix_balance=Balance(every=10)))
+        self.assertNotEqual(
+            DecompositionSettings(fix_balance=Balance(every=10)),
+            DecompositionSettings(fix_balance=Balance(every=20)))
+        self.assertEqual(
+            hash(DecompositionSettings(fix_balance=Balance(every=10))),
+            hash(DecompositionSettings(fix_balance=Balance(every=10))))
+
+    def test_read_only(self):
+        settings = DecompositionSettings(fix_balance=Balance(every=10))
+        with self.assertRaises(AttributeError):
+            settings.comm_style = "tiled"
+        with self.assertRaises(AttributeError):
+            settings.fix_balance.every = 20
+        self.assertEqual(settings,
+                         DecompositionSettings(fix_balance=Balance(every=10)))
+
+    def test_configuration(self):
+        settings = DecompositionSettings(processors=(4, 1, 1),
+                                         balance=Balance(dimensions="x"))
+        writer = ScriptWriter(AtomStyle.ATOMIC,
+                              decomposition_settings=settings)
+
+        lines = writer.get_initial_setup().splitlines()
+        self.assertTrue("processors 4 1 1" in lines)
+        self.assertTrue("comm_style brick" in lines)
+        self.assertEqual(ScriptWriter.get_balance(settings),
+                         "balance 1.1 shift x 10 1.05\n")
+        self.assertEqual(ScriptWriter.get_unbalance(settings), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
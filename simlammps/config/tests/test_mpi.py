@@ -0,0 +1,48 @@
+import unittest
+
+from simlammps.config.mpi import (
+    MpiLauncher, get_mpi_launcher_from_environment)
+
+
+class TestMpiLauncher(unittest.TestCase):
+
+    def test_command(self):
+        launcher = MpiLauncher(4)
+        self.assertEqual(
+            launcher.get_command(["lammps", "-in", "in.lammps"]),
+            ["mpirun", "-np", "4", "lammps", "-in", "in.lammps"])
+
+    def test_command_with_options(self):
+        launcher = MpiLauncher(8,
+                               launcher="mpiexec",
+                               bind_to="core",
+                               hostfile="hosts",
+                               extra_arguments=["--oversubscribe"])
+        self.assertEqual(
+            launcher.get_command(["lammps"]),
+            ["mpiexec", "-np", "8", "--bind-to", "core",
+             "--hostfile", "hosts", "--oversubscribe", "lammps"])
+
+    def test_invalid_number_processes(self):
+        with self.assertRaises(ValueError):
+            MpiLauncher(0)
+        with self.assertRaises(ValueError):
+            MpiLauncher(1.5)
+
+    def test_from_environment(self):
+        self.assertIsNone(get_mpi_launcher_from_environment({}))
+
+        launcher = get_mpi_launcher_from_environment(
+            {"SIM_LAMMPS_MPI_NP": "16",
+             "SIM_LAMMPS_MPI_BIND": "socket"})
+        self.assertEqual(launcher.number_processes, 16)
+        self.assertEqual(launcher.launcher, "mpirun")
+        self.assertEqual(launcher.bind_to, "socket")
+        self.assertIsNone(launcher.hostfile)
+
+        with self.assertRaises(ValueError):
+            get_mpi_launcher_from_environment({"SIM_LAMMPS_MPI_NP": "all"})
+
+
+if __name__ == '__main__':
+    unittest.main()
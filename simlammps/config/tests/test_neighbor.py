@@ -0,0 +1,84 @@
+import unittest
+
+from simlammps.common.atom_style import AtomStyle
+from simlammps.config.neighbor import NeighborSettings
+from simlammps.config.script_writer import ScriptWriter
+
+
+class TestNeighborSettings(unittest.TestCase):
+
+    def test_default_commands(self):
+        settings = NeighborSettings()
+        self.assertEqual(settings.get_commands(),
+                         "neighbor 0.3 bin\n"
+                         "neigh_modify every 1 delay 5 check yes\n")
+        self.assertEqual(settings.get_atom_map_command(),
+                         "atom_modify map array\n")
+
+    def test_commands(self):
+        settings = NeighborSettings(skin=1.0,
+                                    bin_style="nsq",
+                                    every=2,
+                                    delay=0,
+                                    check=False,
+                                    page=200000,
+                                    one=5000,
+                                    atom_map="hash",
+                                    sort_every=500,
+                                    sort_binsize=2.5)
+        self.assertEqual(settings.get_commands(),
+                         "neighbor 1.0 nsq\n"
+                         "neigh_modify every 2 delay 0 check no "
+                         "page 200000 one 5000\n"
+                         "atom_modify sort 500 2.5\n")
+        self.assertEqual(settings.get_atom_map_command(),
+                         "atom_modify map hash\n")
+
+    def test_invalid_settings(self):
+        for kwargs in ({"skin": -0.1},
+                       {"bin_style": "tree"},
+                       {"every": 0},
+                       {"delay": 1.5},
+                       {"page": 1000, "one": 200},
+                       {"atom_map": "list"},
+                       {"sort_every": -1},
+                       {"sort_every": 10, "sort_binsize": -1.0}):
+            with self.assertRaises(ValueError):
+                NeighborSettings(**kwargs)
+
+    def test_equality(self):
+        self.assertEqual(NeighborSettings(skin=0.5),
+                         NeighborSettings(skin=0.5))
+        self.assertNotEqual(NeighborSettings(skin=0.5),
+                            NeighborSettings(skin=0.6))
+        self.assertEqual(hash(NeighborSettings(skin=0.5)),
+                         hash(NeighborSettings(skin=0.5)))
+
+    def test_read_only(self):
+        settings = NeighborSettings(skin=0.5)
+        with self.assertRaises(AttributeError):
+            settings.skin = 1.0
+        self.assertEqual(settings, NeighborSettings(skin=0.5))
+
+    def test_replace(self):
+        settings = NeighborSettings(skin=0.5, atom_map="hash")
+
+        replaced = settings.replace(skin=1.0, delay=0)
+
+        self.assertEqual(replaced,
+                         NeighborSettings(skin=1.0, delay=0, atom_map="hash"))
+        self.assertEqual(settings.skin, 0.5)
+        with self.assertRaises(ValueError):
+            settings.replace(every=0)
+
+    def test_initial_setup(self):
+        writer = ScriptWriter(AtomStyle.ATOMIC,
+                              NeighborSettings(skin=2.0, atom_map="hash"))
+        lines = writer.get_initial_setup().splitlines()
+        self.assertEqual(lines[0].split(), ["atom_style", "atomic"])
+        self.assertTrue("atom_modify map hash" in lines)
+        self.assertTrue("neighbor 2.0 bin" in lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from simlammps.config.neighbor import NeighborSettings
+from simlammps.config.neighbor_tuning import NeighborTuning
+from simlammps.io.lammps_log_file_reader import RunTiming
+
+
+def _timing(number_steps, pair, neigh, comm=0.0, loop_time=10.0):
+    return RunTiming(loop_time=loop_time,
+                     number_processes=1,
+                     number_steps=number_steps,
+                     number_atoms=100,
+                     sections={"Pair": pair, "Neigh": neigh, "Comm": comm,
+                               "Modify": 5.0})
+
+
+class TestNeighborTuning(unittest.TestCase):
+
+    def test_candidates(self):
+        tuning = NeighborTuning(10,
+                                skins=[0.2, 0.6],
+                                modify_options=[{"every": 1, "delay": 0},
+                                                {"every": 2, "delay": 0,
+                                                 "check": False}])
+        base = NeighborSettings(atom_map="hash", page=100000, one=2000)
+
+        candidates = tuning.get_candidates(base)
+
+        self.assertEqual(
+            [(candidate.skin, candidate.every, candidate.delay,
+              candidate.check) for candidate in candidates],
+            [(0.2, 1, 0, True), (0.2, 2, 0, False),
+             (0.6, 1, 0, True), (0.6, 2, 0, False)])
+        for candidate in candidates:
+            self.assertEqual(candidate.atom_map, "hash")
+            self.assertEqual(candidate.page, 100000)
+            self.assertEqual(candidate.one, 2000)
+
+    def test_default_candidates(self):
+        tuning = NeighborTuning(10)
+        self.assertEqual(len(tuning.get_candidates(NeighborSettings())), 8)
+
+    def test_probe_commands(self):
+        tuning = NeighborTuning(25, skins=[0.2, 0.6],
+                                modify_options=[{"delay": 0}])
+        candidates = tuning.get_candidates(NeighborSettings())
+
+        self.assertEqual(tuning.get_probe_commands(candidates),
+                         "neighbor 0.2 bin\n"
+                         "neigh_modify every 1 delay 0 check yes\n"
+                         "run 25\n"
+                         "neighbor 0.6 bin\n"
+                         "neigh_modify every 1 delay 0 check yes\n"
+                         "run 25\n")
+
+    def test_select_fastest(self):
+        tuning = NeighborTuning(10, skins=[0.1, 0.3, 0.5],
+                                modify_options=[{}])
+        candidates = tuning.get_candidates(NeighborSettings())
+        timings = [_timing(0, 0.0, 0.0),
+                   _timing(10, 1.0, 0.9),
+                   _timing(10, 1.1, 0.3, comm=0.1, loop_time=20.0),
+                   _timing(10, 1.4, 0.2)]
+
+        self.assertEqual(tuning.select(candidates, timings), candidates[1])
+
+    def test_select_by_loop_time_without_breakdown(self):
+        tuning = NeighborTuning(10, skins=[0.1, 0.3], modify_options=[{}])
+        candidates = tuning.get_candidates(NeighborSettings())
+        timings = [RunTiming(2.0, 1, 10, 100), RunTiming(1.0, 1, 10, 100)]
+
+        self.assertEqual(tuning.select(candidates, timings), candidates[1])
+
+    def test_select_without_probe_timings(self):
+        tuning = NeighborTuning(10, skins=[0.1, 0.3], modify_options=[{}])
+        candidates = tuning.get_candidates(NeighborSettings())
+
+        with self.assertRaises(RuntimeError):
+            tuning.select(candidates, [_timing(10, 1.0, 1.0)])
+        with self.assertRaises(RuntimeError):
+            tuning.select(candidates,
+                          [_timing(0, 1.0, 1.0), _timing(10, 1.0, 1.0)])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            NeighborTuning(0)
+        with self.assertRaises(ValueError):
+            NeighborTuning(10, skins=[])
+        with self.assertRaises(ValueError):
+            NeighborTuning(10, skins=[-0.1])
+        with self.assertRaises(ValueError):
+            NeighborTuning(10, modify_options=[{"every": 0}])
+        with self.assertRaises(TypeError):
+            NeighborTuning(10, modify_options=[{"unknown": 1}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,22 @@ import unittest
 
 from simphony.api import CUBA
 
-from simlammps.config.pair_style import PairStyle
+from simlammps.config.pair_style import (
+    PairStyle, PairStyleInfo, get_pair_style, _PAIR_STYLES,
+    _PAIR_STYLE_CACHE_SIZE)
+
+
+_LJ_POTENTIAL = ("lj:\n"
+                 "  global_cutoff: 1.12246\n"
+                 "  parameters:\n"
+                 "  - pair: [1, 1]\n"
+                 "    epsilon: 1.0\n"
+                 "    sigma: 1.0\n"
+                 "    cutoff: 1.2246\n"
+                 "  - pair: [1, 2]\n"
+                 "    epsilon: 1.0\n"
+                 "    sigma: 1.0\n"
+                 "    cutoff: 1.2246\n")
 
 
 class TestPairStyle(unittest.TestCase):
@@ -52,8 +67,9 @@ class TestPairStyle(unittest.TestCase):
         self.assertTrue("pair_coeff 2 3 1.0 1.0 1.2246" in lines)
         self.assertTrue("pair_coeff 3 3 1.0 1.0 1.0001" in lines)
 
-        # additional tests for having wildcards due to #66
-        self.assertTrue("pair_coeff * * 1.0 1.0 1.2246" in lines)
+        # no wildcards as the number of atom types follows the materials
+        self.assertFalse(any(line.startswith("pair_coeff * *")
+                             for line in lines))
 
     def test_lj_cut_error(self):
         SP = {}
@@ -85,10 +101,88 @@ class TestPairStyle(unittest.TestCase):
         lines = pair_style.get_pair_coeffs().split("\n")
         self.assertTrue("pair_coeff 1 1 lj/cut 1.0 1.0 1.2246" in lines)
         self.assertTrue("pair_coeff 1 1 coul/cut 1.2246" in lines)
+        self.assertFalse(any(line.startswith("pair_coeff * *")
+                             for line in lines))
+
+    def test_lj_cut_mix(self):
+        SP = {}
+        SP[CUBA.PAIR_POTENTIAL] = _LJ_POTENTIAL.replace(
+            "  parameters:\n", "  mix: arithmetic\n  parameters:\n")
+
+        pair_style = PairStyle(SP)
+        self.assertEqual(
+            pair_style.get_global_config(),
+            "pair_style lj/cut 1.12246\npair_modify mix arithmetic\n")
+        lines = pair_style.get_pair_coeffs().split("\n")
+        self.assertTrue("pair_coeff 1 1 1.0 1.0 1.2246" in lines)
+        self.assertTrue("pair_coeff 1 2 1.0 1.0 1.2246" in lines)
+
+    def test_lj_cut_mix_error(self):
+        SP = {}
+        SP[CUBA.PAIR_POTENTIAL] = _LJ_POTENTIAL.replace(
+            "  parameters:\n", "  mix: harmonic\n  parameters:\n")
+        with self.assertRaises(RuntimeError):
+            PairStyle(SP)
+
+    def test_equal_and_hashable(self):
+        pair_style = PairStyle({CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL})
+        other = PairStyle({CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL})
+        self.assertEqual(pair_style, other)
+        self.assertEqual(hash(pair_style), hash(other))
+        self.assertEqual(len(set([pair_style, other])), 1)
+
+        different = PairStyle(
+            {CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL.replace("1.12246",
+                                                        "1.5")})
+        self.assertNotEqual(pair_style, different)
+
+    def test_pair_info_immutable(self):
+        pair_style = PairStyle({CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL})
+        pair_info = pair_style.pair_infos[0]
+
+        with self.assertRaises(AttributeError):
+            pair_info.pair_style = "coul/cut"
+
+        # changing the returned parameters does not change the info
+        pair_params = pair_info.pair_params
+        self.assertEqual(pair_params.keys(), [(1, 1), (1, 2)])
+        del pair_params[(1, 1)]
+        self.assertEqual(len(pair_info.pair_params), 2)
+
+    def test_get_pair_style_cached(self):
+        pair_style = get_pair_style({CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL})
+        self.assertIs(
+            get_pair_style({CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL}),
+            pair_style)
+        self.assertEqual(
+            pair_style.get_global_config(), "pair_style lj/cut 1.12246\n")
+        self.assertEqual(pair_style.get_pair_coeffs(),
+                         PairStyle(
+                             {CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL}
+                             ).get_pair_coeffs())
+
+    def test_pair_style_of_pair_infos(self):
+        pair_info = PairStyleInfo(pair_style="lj/cut",
+                                  global_params=[1.12246],
+                                  pair_params={(1, 1): [1.0, 1.0, 1.2246],
+                                               (1, 2): [1.0, 1.0, 1.2246]})
+
+        pair_style = PairStyle(pair_infos=[pair_info])
+
+        self.assertEqual(pair_style,
+                         PairStyle({CUBA.PAIR_POTENTIAL: _LJ_POTENTIAL}))
+        # a pair style in the SP is used as it is
+        self.assertIs(get_pair_style({CUBA.PAIR_POTENTIAL: pair_style}),
+                      pair_style)
+
+    def test_get_pair_style_cache_is_bounded(self):
+        configurations = [_LJ_POTENTIAL.replace("1.12246", str(cutoff))
+                          for cutoff in range(1, 20)]
+        for configuration in configurations:
+            get_pair_style({CUBA.PAIR_POTENTIAL: configuration})
 
-        # additional tests for having wildcards due to #66
-        self.assertTrue("pair_coeff * * lj/cut 1.0 1.0 1.2246" in lines)
-        self.assertTrue("pair_coeff * * coul/cut 1.2246" in lines)
+        self.assertLessEqual(len(_PAIR_STYLES), _PAIR_STYLE_CACHE_SIZE)
+        self.assertIn(configurations[-1], _PAIR_STYLES)
 
 
 if __name__ == '__main__':
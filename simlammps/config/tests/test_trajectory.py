@@ -0,0 +1,44 @@
+import unittest
+
+from simlammps.config.script_writer import ScriptWriter
+from simlammps.config.trajectory import TrajectorySampling
+
+
+class TestTrajectorySampling(unittest.TestCase):
+
+    def test_default_attributes(self):
+        sampling = TrajectorySampling(every=10, filename="dump.lammpstrj")
+        self.assertEqual(sampling.attributes,
+                         ["x", "y", "z", "vx", "vy", "vz"])
+
+    def test_id_and_type_are_not_repeated(self):
+        sampling = TrajectorySampling(every=10,
+                                      filename="dump.lammpstrj",
+                                      attributes=["id", "type", "fx"])
+        self.assertEqual(sampling.attributes, ["fx"])
+
+    def test_invalid_sampling(self):
+        with self.assertRaises(ValueError):
+            TrajectorySampling(every=0, filename="dump.lammpstrj")
+        with self.assertRaises(ValueError):
+            TrajectorySampling(every=1.5, filename="dump.lammpstrj")
+        with self.assertRaises(ValueError):
+            TrajectorySampling(every=1,
+                               filename="dump.lammpstrj",
+                               attributes=["id"])
+
+    def test_dump_commands(self):
+        sampling = TrajectorySampling(every=5,
+                                      filename="dump.lammpstrj",
+                                      attributes=["x", "y", "z"])
+
+        lines = ScriptWriter.get_dump(sampling).splitlines()
+
+        self.assertIn("dump simphony_trajectory all custom 5 dump.lammpstrj"
+                      " id type x y z", lines)
+        self.assertIn("undump simphony_trajectory",
+                      ScriptWriter.get_undump().splitlines())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+DEFAULT_TRAJECTORY_ATTRIBUTES = ("x", "y", "z", "vx", "vy", "vz")
+
+
+class TrajectorySampling(object):
+    """ Configuration of sampling the trajectory during a run
+
+    The per-atom quantities are written by LAMMPS (using `dump custom`)
+    every 'every' steps of a run.  The lammps id and type of each atom are
+    always written.
+
+    Parameters
+    ----------
+    every : int
+        number of steps between samples
+    filename : str
+        name of the dump file where the samples are written to
+    attributes : sequence of str, optional
+        per-atom quantities to be sampled (as named by LAMMPS's
+        `dump custom`, e.g. "x", "vx", "fx").  If None, then coordinates and
+        velocities are sampled.
+
+    Raises
+    ------
+    ValueError
+        if 'every' is not a positive integer or no attributes are given
+
+    """
+    def __init__(self, every, filename, attributes=None):
+        if int(every) != every or every < 1:
+            raise ValueError(
+                "Sampling interval needs to be a positive integer "
+                "not '{}'".format(every))
+        self.every = int(every)
+        self.filename = filename
+
+        if attributes is None:
+            attributes = DEFAULT_TRAJECTORY_ATTRIBUTES
+        self.attributes = [attribute for attribute in attributes
+                           if attribute not in ("id", "type")]
+        if not self.attributes:
+            raise ValueError("No attributes to be sampled were given")
@@ -0,0 +1,179 @@
+"""Ensemble runs of LAMMPS.
+
+This module provides a way to run several independent replicas (i.e.
+LammpsWrapper engines of the file-io interface) with one launch of LAMMPS.
+"""
+import os
+
+from simlammps.config.mpi import MpiLauncher
+from simlammps.io.lammps_process import LammpsProcess, get_rank_errors
+from simlammps.lammps_wrapper import _TEMP_DIRECTORY, _get_lammps_name
+
+# world-style variable with the script of each partition
+_SCRIPT_VARIABLE = "simphony_replica"
+
+
+def run_ensemble(engines, processes_per_replica=1, mpi_launcher=None):
+    """Run the engines as replicas of one multi-partition LAMMPS launch.
+
+    Each engine (replica) is run in its own LAMMPS partition (see the
+    '-partition' command-line switch of LAMMPS) so that the startup of
+    LAMMPS is only paid once for the whole ensemble. The input data file
+    and script of each replica are generated as by LammpsWrapper.run and
+    the results (i.e. the written data file of each partition) are read
+    back into the datasets of its engine, as if each engine had been run
+    on its own.
+
+    Parameters
+    ----------
+    engines : sequence of LammpsWrapper
+        engines (of the file-io interface) to be run
+    processes_per_replica : int, optional
+        number of (MPI) processes of each partition
+    mpi_launcher : MpiLauncher, optional
+        launcher of LAMMPS. Its number of processes is replaced by the
+        total number of processes of the partitions. If None, the
+        launcher of the first engine (or "mpirun") is used.
+
+    Raises
+    ------
+    ValueError
+        if there are no engines, an engine uses the internal interface
+        or 'processes_per_replica' is not a positive integer
+    RuntimeError
+        if LAMMPS did not run correctly
+
+    """
+    engines = list(engines)
+    if not engines:
+        raise ValueError("An ensemble needs at least one engine")
+    if any(engine._use_internal_interface for engine in engines):
+        raise ValueError(
+            "Ensembles can only be run with the file-io interface")
+    if int(processes_per_replica) != processes_per_replica or \
+            processes_per_replica < 1:
+        raise ValueError(
+            "Number of processes per replica needs to be a positive "
+            "integer not '{}'".format(processes_per_replica))
+
+    number_replicas = len(engines)
+    mpi_launcher = _get_ensemble_launcher(
+        mpi_launcher or engines[0]._mpi_launcher,
+        number_replicas * processes_per_replica)
+
+    for engine in engines:
+        engine._finish_async_run()
+    run_guards = [engine._data_manager.run_guard for engine in engines]
+    for run_guard in run_guards:
+        run_guard.begin()
+        run_guard.attach()
+    try:
+        with _TEMP_DIRECTORY() as temp_dir:
+            scripts = []
+            for index, engine in enumerate(engines):
+                engine._prepare_run()
+                commands = engine._prepare_file_io_run(
+                    temp_dir, suffix=_get_suffix(index))
+                script = os.path.join(
+                    temp_dir, "in{}.lammps".format(_get_suffix(index)))
+                with open(script, "w") as script_file:
+                    script_file.write(commands)
+                scripts.append(script)
+
+            partition_log = os.path.join(temp_dir, "log.partition")
+            arguments = ["-partition",
+                         "{}x{}".format(number_replicas,
+                                        processes_per_replica),
+                         "-plog", partition_log,
+                         "-pscreen", "none"]
+            arguments += engines[0]._get_accelerator_arguments()
+            process = LammpsProcess(lammps_name=_get_lammps_name(),
+                                    log_directory=temp_dir,
+                                    mpi_launcher=mpi_launcher,
+                                    arguments=arguments,
+                                    check=False)
+            try:
+                process.run(get_partition_commands(scripts))
+            except RuntimeError as error:
+                # the partitions only report their errors in their logs
+                # (see '-pscreen none')
+                msg = str(error)
+                for index, rank, message in get_partition_errors(
+                        partition_log, number_replicas):
+                    if rank is None:
+                        msg += "\nerror (partition {}): {}".format(
+                            index, message)
+                    else:
+                        msg += "\nerror (partition {}, rank {}): {}".format(
+                            index, rank, message)
+                raise RuntimeError(msg)
+
+            for index, engine in enumerate(engines):
+                engine._finish_file_io_run(
+                    temp_dir,
+                    log_filename="{}.{}".format(partition_log, index),
+                    suffix=_get_suffix(index))
+                engine._finish_run()
+                engine._update_cuds()
+    finally:
+        for run_guard in run_guards:
+            run_guard.end()
+
+
+def get_partition_commands(scripts):
+    """Return the commands which run a script in each partition
+
+    Parameters
+    ----------
+    scripts : sequence of str
+        names of the scripts (one for each partition)
+
+    """
+    return "variable {} world {}\ninclude ${{{}}}\n".format(
+        _SCRIPT_VARIABLE, " ".join(scripts), _SCRIPT_VARIABLE)
+
+
+def get_partition_errors(partition_log, number_partitions):
+    """Get the errors reported in the logs of the partitions
+
+    Parameters
+    ----------
+    partition_log : str
+        base name of the partition logs (see the '-plog' command-line
+        switch of LAMMPS), i.e. the log of partition N is 'partition_log.N'
+    number_partitions : int
+        number of partitions
+
+    Returns
+    -------
+    list of tuple
+        (partition, rank, message) of each error where rank is None if the
+        error occurred on all ranks of the partition. Missing logs (e.g. as
+        LAMMPS could not be started) are skipped.
+
+    """
+    errors = []
+    for index in xrange(number_partitions):
+        try:
+            with open("{}.{}".format(partition_log, index)) as log_file:
+                output = log_file.read()
+        except IOError:
+            continue
+        errors.extend((index, rank, message)
+                      for rank, message in get_rank_errors(output))
+    return errors
+
+
+def _get_ensemble_launcher(mpi_launcher, number_processes):
+    """Get the launcher of an ensemble with the number of processes."""
+    if mpi_launcher is None:
+        return MpiLauncher(number_processes)
+    return MpiLauncher(number_processes,
+                       launcher=mpi_launcher.launcher,
+                       bind_to=mpi_launcher.bind_to,
+                       hostfile=mpi_launcher.hostfile,
+                       extra_arguments=mpi_launcher.extra_arguments)
+
+
+def _get_suffix(index):
+    return ".{}".format(index)
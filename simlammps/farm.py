@@ -0,0 +1,269 @@
+"""Farm of LAMMPS jobs.
+
+This module provides a way to run many (small) independent configurations
+concurrently, each in its own worker process.
+"""
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+import uuid
+
+import numpy
+
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+
+from simlammps.columnar_particles import ColumnarParticles
+from simlammps.common.utils import MaterialLookupTable
+from simlammps.lammps_wrapper import LammpsWrapper
+
+# interval (in seconds) in which the running jobs are polled
+_POLL_INTERVAL = 0.01
+
+
+class FarmResult(object):
+    """ Result of a job of a farm
+
+    Parameters
+    ----------
+    index : int
+        index of the job (in the list of jobs of the farm)
+    datasets : list of ColumnarParticles, optional
+        datasets of the engine after the run (empty if the job failed)
+    error : str, optional
+        description of the error (None if the job succeeded)
+    timed_out : bool, optional
+        True if the job was stopped as it exceeded the timeout
+
+    """
+    def __init__(self, index, datasets=None, error=None, timed_out=False):
+        self.index = index
+        self.datasets = list(datasets or [])
+        self.error = error
+        self.timed_out = timed_out
+
+    @property
+    def succeeded(self):
+        """ True if the job has been run successfully """
+        return self.error is None
+
+
+def run_farm(jobs, use_internal_interface=False, timeout=None,
+             mpi_launcher=None, number_threads=1, max_cores=None,
+             accelerator=None, configure=None):
+    """Run jobs concurrently, each with its own engine in a worker process.
+
+    Each job is run in a fresh worker process (so a crash or hang of
+    LAMMPS only affects its job) and the number of concurrent workers is
+    limited so that the cores used by the jobs (number of MPI processes
+    times number of threads of each job) do not exceed 'max_cores'.
+
+    The datasets of each job are returned in columnar form (i.e. arrays
+    of uids, coordinates and attributes) so that no Particle objects are
+    passed between the processes.
+
+    Parameters
+    ----------
+    jobs : sequence of CUDS or callable
+        configuration of each job: a CUDS or a callable which returns the
+        CUDS (and is only called in the worker process)
+    use_internal_interface : bool, optional
+        if True, the internal interface is used by the engines, otherwise
+        the file-io interface
+    timeout : float, optional
+        maximum time (in seconds) of each job. A job exceeding it is
+        stopped (together with any LAMMPS process started by it).
+    mpi_launcher : MpiLauncher, optional
+        MPI launcher of each job (only supported by the file-io interface)
+    number_threads : int, optional
+        number of (OpenMP) threads of each job (see OMP_NUM_THREADS)
+    max_cores : int, optional
+        maximum number of cores used at the same time. If None, the number
+        of CPUs is used.
+    accelerator : Accelerator, optional
+        accelerator package of the engines
+    configure : callable, optional
+        called with the engine (LammpsWrapper) of each job before it is
+        run, e.g. to set its neighbor settings
+
+    Returns
+    -------
+    list of FarmResult
+        result of each job (in the order of the jobs)
+
+    Raises
+    ------
+    ValueError
+        if the MPI launcher is used with the internal interface or the
+        number of threads is not a positive integer
+
+    """
+    if use_internal_interface and mpi_launcher is not None:
+        raise ValueError(
+            "MPI launchers are only supported by the file-io interface")
+    if int(number_threads) != number_threads or number_threads < 1:
+        raise ValueError(
+            "Number of threads needs to be a positive integer "
+            "not '{}'".format(number_threads))
+
+    cores_per_job = number_threads * (
+        mpi_launcher.number_processes if mpi_launcher else 1)
+    if max_cores is None:
+        max_cores = multiprocessing.cpu_count()
+    number_workers = max(1, max_cores // cores_per_job)
+
+    settings = dict(use_internal_interface=use_internal_interface,
+                    mpi_launcher=mpi_launcher,
+                    number_threads=number_threads,
+                    accelerator=accelerator,
+                    configure=configure)
+
+    results = [None] * len(jobs)
+    pending = list(enumerate(jobs))
+    pending.reverse()
+    running = []
+    while pending or running:
+        while pending and len(running) < number_workers:
+            index, job = pending.pop()
+            running.append(_Worker(index, job, settings, timeout))
+
+        time.sleep(_POLL_INTERVAL)
+        still_running = []
+        for worker in running:
+            result = worker.poll()
+            if result is None:
+                still_running.append(worker)
+            else:
+                results[worker.index] = result
+        running = still_running
+
+    return results
+
+
+class _Worker(object):
+    """ Worker process running one job """
+    def __init__(self, index, job, settings, timeout):
+        self.index = index
+        self._receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_run_job, args=(job, settings, sender))
+        self._process.start()
+        sender.close()
+        self._deadline = None if timeout is None else time.time() + timeout
+
+    def poll(self):
+        """ Return the result of the job (or None if still running) """
+        if self._receiver.poll():
+            try:
+                status, value = self._receiver.recv()
+            except EOFError:
+                # the worker exited without a result
+                status, value = None, None
+            self._process.join()
+            if status == "ok":
+                return FarmResult(self.index,
+                                  datasets=[_create_particles(columns)
+                                            for columns in value])
+            elif status == "error":
+                return FarmResult(self.index, error=value)
+            return FarmResult(
+                self.index,
+                error="Worker exited with code {}".format(
+                    self._process.exitcode))
+
+        if self._deadline is not None and time.time() > self._deadline:
+            self._kill()
+            return FarmResult(self.index,
+                              error="Job exceeded the timeout",
+                              timed_out=True)
+        return None
+
+    def _kill(self):
+        """ Kill the worker and the processes started by it """
+        try:
+            # the worker leads its own process group (see _run_job)
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except OSError:
+            self._process.terminate()
+        self._process.join()
+        self._receiver.close()
+
+
+def _run_job(job, settings, connection):
+    """ Run a job (in the worker process) and send its result """
+    # a process group of its own, so that the worker can be stopped
+    # together with the LAMMPS processes it has started
+    os.setpgrp()
+    os.environ["OMP_NUM_THREADS"] = str(settings["number_threads"])
+
+    try:
+        cuds = job() if callable(job) else job
+        engine = LammpsWrapper(
+            cuds=cuds,
+            use_internal_interface=settings["use_internal_interface"],
+            accelerator=settings["accelerator"])
+        mpi_launcher = settings["mpi_launcher"]
+        if mpi_launcher is not None:
+            engine.set_mpi_launcher(
+                mpi_launcher.number_processes,
+                launcher=mpi_launcher.launcher,
+                bind_to=mpi_launcher.bind_to,
+                hostfile=mpi_launcher.hostfile,
+                extra_arguments=mpi_launcher.extra_arguments)
+        if settings["configure"] is not None:
+            settings["configure"](engine)
+        engine.run()
+        result = ("ok", [_get_columns(dataset)
+                         for dataset in engine.iter_datasets()])
+    except Exception:
+        result = ("error", traceback.format_exc())
+    connection.send(result)
+    connection.close()
+
+
+def _get_columns(dataset):
+    """ Get the columnar form of a dataset (see _create_particles)
+
+    All attributes supported by the dataset are stored. The uids are
+    stored as (N, 16) array of bytes and the materials as atom types of a
+    material table, so that the columns consist of arrays only.
+
+    """
+    uids = dataset.get_uids()
+    columns = {"name": dataset.name,
+               "data": dict(dataset.data),
+               "uids": numpy.frombuffer(
+                   b"".join(uid.bytes for uid in uids),
+                   dtype=numpy.uint8).reshape((len(uids), 16)),
+               "coordinates": dataset.get_coordinates(),
+               "attributes": {}}
+    cuba_keys = dataset.get_supported_attributes()
+    for cuba_key in cuba_keys:
+        if cuba_key != CUBA.MATERIAL_TYPE:
+            columns["attributes"][cuba_key] = dataset.get_attribute(cuba_key)
+    if CUBA.MATERIAL_TYPE in cuba_keys:
+        material_uids = dataset.get_attribute(CUBA.MATERIAL_TYPE)
+        materials, indices = numpy.unique(material_uids, return_inverse=True)
+        columns["materials"] = list(materials)
+        columns["attributes"][CUBA.MATERIAL_TYPE] = indices + 1
+    return columns
+
+
+def _create_particles(columns):
+    """ Create particles from their columnar form (see _get_columns) """
+    material_table = None
+    if "materials" in columns:
+        material_table = MaterialLookupTable(
+            {atom_type: material_uid for atom_type, material_uid
+             in enumerate(columns["materials"], 1)})
+    particles = ColumnarParticles(
+        columns["name"],
+        columns["coordinates"],
+        data_columns=columns["attributes"],
+        material_table=material_table,
+        uids=[uuid.UUID(bytes=uid_bytes.tobytes())
+              for uid_bytes in columns["uids"]])
+    particles.data = DataContainer(columns["data"])
+    return particles
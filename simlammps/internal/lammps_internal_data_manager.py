@@ -1,14 +1,18 @@
-import uuid
+
+import numpy
 
 from simphony.core.cuba import CUBA
 from simphony.core.data_container import DataContainer
 from simphony.cuds.particles import Particle
 
 from .particle_data_cache import ParticleDataCache
+from .particle_record import ParticleRecord
 from ..abc_data_manager import ABCDataManager
-from ..common import globals
-from ..common.atom_style_description import ATOM_STYLE_DESCRIPTIONS
+from ..common.utils import MaterialLookupTable
+from ..common.atom_style_description import (ATOM_STYLE_DESCRIPTIONS,
+                                              get_all_cuba_attributes)
 from ..config.domain import get_box
+from ..config.neighbor import NeighborSettings
 from ..config.script_writer import ScriptWriter
 
 
@@ -31,7 +35,7 @@ class MaterialAtomTypeManager(object):
         self._material_to_atom = {}
 
         # inverse of _material_to_atom
-        self._atom_to_material = {}
+        self._material_table = MaterialLookupTable({})
 
         self.update_materials(materials)
 
@@ -48,9 +52,10 @@ class MaterialAtomTypeManager(object):
                 self._material_to_atom[material.uid] = atom_type
 
         # get inverse
-        if len(self._atom_to_material) != len(self._material_to_atom):
-            self._atom_to_material = {
-                v: k for k, v in self._material_to_atom.iteritems()}
+        if len(self._material_table.material_uids) != \
+                len(self._material_to_atom):
+            self._material_table = MaterialLookupTable(
+                {v: k for k, v in self._material_to_atom.iteritems()})
 
     def get_material_uid(self, atom_type):
         """ Return material uid
@@ -62,7 +67,18 @@ class MaterialAtomTypeManager(object):
 
 
         """
-        return self._atom_to_material[atom_type]
+        return self._material_table(atom_type)
+
+    def get_material_uids(self, atom_types):
+        """ Return array of material uids of an array of atom types
+
+        Raises
+        ------
+        KeyError
+            if any atom_type is unknown.
+
+        """
+        return self._material_table.get_material_uids(atom_types)
 
     def get_atom_type(self, material_uid):
         """ Return atom type
@@ -75,8 +91,31 @@ class MaterialAtomTypeManager(object):
             self.update_materials([material_uid])
         return self._material_to_atom[material_uid]
 
+    def get_atom_types(self, material_uids):
+        """ Return array of atom types of a sequence of material uids
+
+        If we are not yet aware of a material uid, we will add it to our
+        list and assign it a lammps_atom.
+
+        """
+        atom_types = {material_uid: self.get_atom_type(material_uid)
+                      for material_uid in set(material_uids)}
+        return numpy.fromiter(
+            (atom_types[material_uid] for material_uid in material_uids),
+            dtype=numpy.int32,
+            count=len(material_uids))
+
+    @property
+    def number_of_atom_types(self):
+        """ number of atom types (i.e. of known materials) """
+        return len(self._material_to_atom)
+
     def has_atom_type(self, atom_type):
-        return atom_type in self._atom_to_material
+        try:
+            self._material_table(atom_type)
+            return True
+        except KeyError:
+            return False
 
     def iter_material_uids(self):
         for material_ui in self._material_to_atom.iterkeys():
@@ -97,41 +136,42 @@ class LammpsInternalDataManager(ABCDataManager):
         state data
     atom_style : AtomStyle
            atom_style
+    comm : mpi4py.MPI.Comm, optional
+        communicator of lammps. If given, the same commands are expected
+        to be made on all ranks of the communicator (i.e. the same driver
+        is run on each rank) and the generated uids are broadcast from
+        rank 0 so that all ranks agree on the particles.
+    neighbor_settings : NeighborSettings, optional
+        settings of the neighbor lists and atom sorting used when the
+        simulation box is created.
+    decomposition_settings : DecompositionSettings, optional
+        settings of the domain decomposition used when the simulation
+        box is created.
     """
-    def __init__(self, lammps, state_data, atom_style):
+    def __init__(self, lammps, state_data, atom_style, comm=None,
+                 neighbor_settings=None, decomposition_settings=None):
         super(LammpsInternalDataManager, self).__init__()
 
         self._lammps = lammps
+        self._comm = comm
+        if neighbor_settings is None:
+            neighbor_settings = NeighborSettings()
+        self._neighbor_settings = neighbor_settings
+        self._decomposition_settings = decomposition_settings
         self._state_data = state_data
         self._atom_style = atom_style
 
         materials = [m for m in state_data.iter(item_type=CUBA.MATERIAL)]
         self._material_atom_type_manager = MaterialAtomTypeManager(materials)
 
-        dummy_bc = {CUBA.FACE: ("periodic",
-                                "periodic",
-                                "periodic")}
-        commands = "dimension 3\n"
-        script_writer = ScriptWriter(self._atom_style)
-        commands = script_writer.get_initial_setup()
-
-        commands += ScriptWriter.get_boundary(dummy_bc)
-        for command in commands.splitlines():
-            self._lammps.command(command)
+        # number of atom types of the simulation box
+        self._number_types = 0
 
-        # create initial box with dummy values
-        vectors = [(25.0, 0.0, 0.0),
-                   (0.0, 22.0, 0.0),
-                   (0.0, 0.0, 6.196)]
-        dummy_box_data = {CUBA.VECTOR: vectors,
-                          CUBA.ORIGIN: (0.0, 0.0, 0.0)}
-        self._lammps.command(get_box([dummy_box_data], command_format=True))
+        # map from atom type to the mass set in lammps
+        self._masses = {}
 
-        # due to not being able to alter the number of types (issue #66),
-        # we set the number of supported types to a high number and then
-        # give dummy values for the unused types
-        self._lammps.command(
-            "create_box {} box".format(globals.MAX_NUMBER_TYPES))
+        self._create_simulation_box(
+            max(1, self._material_atom_type_manager.number_of_atom_types))
 
         # map from uname of Particles to Set of (particle) uids
         self._particles = {}
@@ -165,8 +205,13 @@ class LammpsInternalDataManager(ABCDataManager):
             non-changing unique name of particles
 
         """
+        old_data = self._pc_data[uname]
         self._pc_data[uname] = DataContainer(data)
 
+        if any(old_data.get(key) != data.get(key)
+               for key in (CUBA.VECTOR, CUBA.ORIGIN)):
+            self._update_simulation_box()
+
     def _handle_delete_particles(self, uname):
         """Handle when a Particles is deleted
 
@@ -208,6 +253,100 @@ class LammpsInternalDataManager(ABCDataManager):
 
         # TODO bonds
 
+    def _create_simulation_box(self, number_types):
+        """Set up lammps and create a simulation box
+
+        The box is created with dummy values (see _update_simulation_box)
+
+        Parameters
+        ----------
+        number_types : int
+            number of atom types of the box
+
+        """
+        dummy_bc = {CUBA.FACE: ("periodic",
+                                "periodic",
+                                "periodic")}
+        script_writer = ScriptWriter(self._atom_style,
+                                     self._neighbor_settings,
+                                     self._decomposition_settings)
+        commands = script_writer.get_initial_setup()
+
+        commands += ScriptWriter.get_boundary(dummy_bc)
+        for command in commands.splitlines():
+            self._lammps.command(command)
+
+        # create initial box with dummy values
+        vectors = [(25.0, 0.0, 0.0),
+                   (0.0, 22.0, 0.0),
+                   (0.0, 0.0, 6.196)]
+        dummy_box_data = {CUBA.VECTOR: vectors,
+                          CUBA.ORIGIN: (0.0, 0.0, 0.0)}
+        self._lammps.command(get_box([dummy_box_data], command_format=True))
+
+        self._lammps.command("create_box {} box".format(number_types))
+        self._number_types = number_types
+
+        # the masses of the new box are not set yet
+        self._masses = {}
+
+    def _update_number_of_types(self):
+        """Grow the number of atom types of the box to the number of materials
+
+        LAMMPS does not allow the number of atom types to be changed once
+        the box has been created (issue #66), so the box is recreated (and
+        all atoms re-added) when there are more materials than atom types.
+
+        """
+        number_types = self._material_atom_type_manager.number_of_atom_types
+        if number_types > self._number_types:
+            self._recreate_simulation_box(number_types)
+
+    def _recreate_simulation_box(self, number_types):
+        """Recreate the simulation box and re-add all atoms
+
+        Parameters
+        ----------
+        number_types : int
+            number of atom types of the box
+
+        """
+        saved_particles = self._get_all_particles()
+
+        self._lammps.command("clear")
+        self._create_simulation_box(number_types)
+        if self._pc_data:
+            self._update_simulation_box()
+
+        # Use a new cache
+        self._particle_data_cache = \
+            ParticleDataCache(self._lammps,
+                              self._atom_style,
+                              self._material_atom_type_manager)
+
+        # re-add the saved atoms
+        for uname, particles in saved_particles.iteritems():
+            self._add_atoms(particles, uname, safe=True)
+
+    def _get_all_particles(self):
+        """Get a (stand-alone) copy of all particles
+
+        Returns
+        -------
+        dict
+            map from uname of Particles to list of Particle
+
+        """
+        saved_particles = {}
+        for uname, uids in self._particles.iteritems():
+            saved_particles[uname] = [
+                Particle(uid=uid,
+                         coordinates=self._particle_data_cache.get_coordinates(
+                             uid),
+                         data=self._particle_data_cache.get_particle_data(uid))
+                for uid in uids]
+        return saved_particles
+
     def _update_simulation_box(self):
         """Update simulation box
 
@@ -272,17 +411,7 @@ class LammpsInternalDataManager(ABCDataManager):
         self._particles[uname].remove(deleted_uid)
 
         # Make a local copy of ALL the particles EXCEPT for the deleted one
-        saved_particles = {}
-        for uname in self._particles:
-            saved_particles[uname] = {}
-            for uid in self._particles[uname]:
-                coordinates = self._particle_data_cache.get_coordinates(uid)
-                data = self._particle_data_cache.get_particle_data(uid)
-
-                p = Particle(uid=uid,
-                             coordinates=coordinates,
-                             data=data)
-                saved_particles[uname][uid] = p
+        saved_particles = self._get_all_particles()
 
         self._lammps.command("delete_atoms group all compress yes")
 
@@ -293,8 +422,8 @@ class LammpsInternalDataManager(ABCDataManager):
                               self._material_atom_type_manager)
 
         # re-add the saved atoms
-        for uname in saved_particles:
-            self._add_atoms(saved_particles[uname].values(), uname, safe=True)
+        for uname, particles in saved_particles.iteritems():
+            self._add_atoms(particles, uname, safe=True)
 
     def has_particle(self, uid, uname):
         """Has particle
@@ -312,6 +441,10 @@ class LammpsInternalDataManager(ABCDataManager):
     def iter_particles(self, uname, uids=None):
         """Iterate over the particles of a certain type
 
+        The particles are yielded as (lightweight, read-only)
+        ParticleRecord whose coordinates and data are only read from the
+        cache when accessed (see ParticleRecord.to_particle to change one).
+
         Parameters
         ----------
         uids : list of particle uids
@@ -321,12 +454,16 @@ class LammpsInternalDataManager(ABCDataManager):
             non-changing unique name of particles
 
         """
+        cache = self._particle_data_cache
+        particles = self._particles[uname]
         if uids:
             for uid in uids:
-                yield self.get_particle(uid, uname)
+                if uid not in particles:
+                    raise KeyError("uid ({}) was not found".format(uid))
+                yield ParticleRecord(uid, cache.get_index(uid), cache)
         else:
-            for uid in self._particles[uname]:
-                yield self.get_particle(uid, uname)
+            for uid in particles:
+                yield ParticleRecord(uid, cache.get_index(uid), cache)
 
     def number_of_particles(self, uname):
         """Get number of particles in a container
@@ -339,6 +476,149 @@ class LammpsInternalDataManager(ABCDataManager):
         """
         return len(self._particles[uname])
 
+    def get_uids(self, uname):
+        """Get the uids of the particles of a container
+
+        The uids are ordered by the lammps atom id (i.e. this order does
+        not change until particles are added or removed)
+
+        Parameters
+        ----------
+        uname : string
+            non-changing unique name of particles
+
+        """
+        uids = list(self._particles[uname])
+        order = numpy.argsort(self._particle_data_cache.get_indices(uids))
+        return [uids[i] for i in order]
+
+    def get_coordinates(self, uname, uids=None):
+        """Get the coordinates of particles as an array
+
+        Parameters
+        ----------
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        uids = self._get_existing_uids(uname, uids, KeyError)
+        return self._particle_data_cache.get_coordinates_array(uids)
+
+    def get_attribute(self, cuba_key, uname, uids=None):
+        """Get the values of a CUBA attribute of particles as an array
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        uids = self._get_existing_uids(uname, uids, KeyError)
+        return self._particle_data_cache.get_data_array(cuba_key, uids)
+
+    def get_supported_attributes(self):
+        """Get the CUBA keys of the attributes of the particles
+
+        """
+        return get_all_cuba_attributes(self._atom_style)
+
+    def set_coordinates(self, coordinates, uname, uids=None):
+        """Set the coordinates of particles from an array
+
+        Parameters
+        ----------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        uids = self._get_existing_uids(uname, uids, ValueError)
+        self._particle_data_cache.set_coordinates_array(uids, coordinates)
+
+    def set_attribute(self, cuba_key, values, uname, uids=None):
+        """Set the values of a CUBA attribute of particles from an array
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        values : array_like
+            (N,) or (N, k) array with the value of each particle
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        uids = self._get_existing_uids(uname, uids, ValueError)
+        if cuba_key == CUBA.MATERIAL_TYPE:
+            self._update_material_atom_type_manager()
+        self._particle_data_cache.set_data_array(cuba_key, uids, values)
+
+    def add_from_arrays(self, coordinates, data_columns, uname, uids=None):
+        """Add particles given as arrays
+
+        Parameters
+        ----------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        data_columns : dict
+            map from CUBA key to an array with the value of each particle.
+            If CUBA.MATERIAL_TYPE is missing, the material of the particle
+            container is used. Other missing attributes of the atom style
+            (e.g. CUBA.VELOCITY) are set to zero.
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of the particles. If None, then uids are generated.
+
+        Returns
+        -------
+        uuid : list of UUID4
+            uids of added particles
+
+        """
+        uids = self._get_new_uids(uname, uids, len(coordinates))
+
+        if CUBA.MATERIAL_TYPE not in data_columns and \
+                CUBA.MATERIAL_TYPE in self._pc_data[uname]:
+            data_columns = dict(data_columns)
+            data_columns[CUBA.MATERIAL_TYPE] = \
+                [self._pc_data[uname][CUBA.MATERIAL_TYPE]] * len(uids)
+
+        # TODO we should improve this as we are calling this although we
+        # don't know if there were any changes to the materials
+        self._update_material_atom_type_manager()
+
+        atom_types = self._particle_data_cache.add_arrays(uids,
+                                                          coordinates,
+                                                          data_columns)
+        self._particles[uname].update(uids)
+
+        self._create_atoms(
+            {atom_type: number for atom_type, number
+             in enumerate(numpy.bincount(atom_types)) if number > 0})
+        return uids
+
+    def get_uids_of_lammps_ids(self):
+        """Get map from lammps atom id to particle uid
+
+        """
+        return self._particle_data_cache.get_uids_of_lammps_ids()
+
     def read(self):
         """read latest state
 
@@ -354,7 +634,6 @@ class LammpsInternalDataManager(ABCDataManager):
         self._update_material_atom_type_manager()
 
         if ATOM_STYLE_DESCRIPTIONS[self._atom_style].has_mass_per_type:
-            # TODO set once and update only when mass has changed
             self._update_mass()
 
         if self._particles:
@@ -367,8 +646,71 @@ class LammpsInternalDataManager(ABCDataManager):
         # or when some of them do not contain any particles
         # (i.e. someone has deleted all the particles)
 
+    def restore(self):
+        """Restore the state of LAMMPS from the cached data
+
+        Used after LAMMPS has been restarted (e.g. after a crash of an
+        isolated LAMMPS, see LammpsWorker): the simulation box is recreated
+        and all atoms are re-added as of the last flush or read.
+
+        """
+        self._recreate_simulation_box(self._number_types)
+
+        # the atoms are re-added at random positions, so their cached
+        # state is sent right away (and not only at the next flush)
+        if self._particles:
+            self.flush()
+
+    def set_neighbor_settings(self, neighbor_settings):
+        """Set the settings of the neighbor lists and atom sorting
+
+        As the atom map can only be set before the simulation box is
+        created, the box is recreated (and all atoms re-added) if the
+        atom map changes.
+
+        Parameters
+        ----------
+        neighbor_settings : NeighborSettings
+            settings of the neighbor lists and atom sorting
+
+        """
+        old_atom_map = self._neighbor_settings.atom_map
+        self._neighbor_settings = neighbor_settings
+        if neighbor_settings.atom_map != old_atom_map:
+            self._recreate_simulation_box(self._number_types)
+        else:
+            for command in ScriptWriter.get_neighbor(
+                    neighbor_settings).splitlines():
+                self._lammps.command(command)
+
+    def set_decomposition_settings(self, decomposition_settings):
+        """Set the settings of the domain decomposition
+
+        As the processor grid can only be set before the simulation box
+        is created, the box is recreated (and all atoms re-added) if the
+        grid changes.
+
+        Parameters
+        ----------
+        decomposition_settings : DecompositionSettings or None
+            settings of the domain decomposition and load balancing
+
+        """
+        old_processors = getattr(self._decomposition_settings,
+                                 "processors", None)
+        self._decomposition_settings = decomposition_settings
+        processors = getattr(decomposition_settings, "processors", None)
+        if processors != old_processors:
+            self._recreate_simulation_box(self._number_types)
+        else:
+            comm_style = getattr(decomposition_settings, "comm_style",
+                                 "brick")
+            self._lammps.command("comm_style {}".format(comm_style))
+
     def _update_mass(self):
-        mass = {}
+        """ Set the mass of each atom type (only if it has changed)
+
+        """
         for material in self._state_data.iter(item_type=CUBA.MATERIAL):
             atom_type = self._material_atom_type_manager.get_atom_type(
                 material.uid)
@@ -377,14 +719,11 @@ class LammpsInternalDataManager(ABCDataManager):
                     "Material does not have the required mass")
             else:
                 mass = material.data[CUBA.MASS]
-                # TODO format mass correctly
-                self._lammps.command("mass {} {}".format(atom_type,
-                                                         mass))
-
-        # set the mass of all unused types (see issue #66)
-        for atom_type in range(1, globals.MAX_NUMBER_TYPES + 1):
-            if not self._material_atom_type_manager.has_atom_type(atom_type):
-                self._lammps.command("mass {} {}".format(atom_type, 1.0))
+                if self._masses.get(atom_type) != mass:
+                    # TODO format mass correctly
+                    self._lammps.command("mass {} {}".format(atom_type,
+                                                             mass))
+                    self._masses[atom_type] = mass
 
     def _update_from_lammps(self):
         self._particle_data_cache.retrieve()
@@ -400,9 +739,37 @@ class LammpsInternalDataManager(ABCDataManager):
             non-changing unique name of particle container
 
         """
-        self._particle_data_cache.set_particle(particle.coordinates,
-                                               particle.data,
-                                               particle.uid)
+        if isinstance(particle, ParticleRecord) and \
+                particle.is_unchanged_view_of(self._particle_data_cache):
+            # nothing to be set as the record is just a view of the cache
+            return
+
+        self._particle_data_cache.set_particle(
+            particle.coordinates,
+            self._get_particle_data(particle, uname),
+            particle.uid)
+
+    def _get_particle_data(self, particle, uname):
+        """ Get data of a particle
+
+        If the particle has no CUBA.MATERIAL_TYPE, the material of the
+        particle container (i.e. CUBA.MATERIAL_TYPE of its data) is used.
+
+        Parameters
+        ----------
+        particle : Particle
+            particle
+        uname : string
+            non-changing unique name of particle container
+
+        """
+        data = particle.data
+        if CUBA.MATERIAL_TYPE not in data and \
+                CUBA.MATERIAL_TYPE in self._pc_data[uname]:
+            data = DataContainer(data)
+            data[CUBA.MATERIAL_TYPE] = \
+                self._pc_data[uname][CUBA.MATERIAL_TYPE]
+        return data
 
     def _add_atoms(self, iterable, uname, safe=False):
         """ Add multiple particles as atoms to lammps
@@ -414,7 +781,8 @@ class LammpsInternalDataManager(ABCDataManager):
         Parameters
         ----------
         iterable : iterable of Particle objects
-            particle with CUBA.MATERIAL_TYPE
+            particle with CUBA.MATERIAL_TYPE (or without if the particle
+            container has a CUBA.MATERIAL_TYPE)
 
         uname : str
             non-changing unique name of particle container
@@ -441,12 +809,18 @@ class LammpsInternalDataManager(ABCDataManager):
                 self._material_atom_type_manager.iter_material_uids():
             number_added_per_material[material_uid] = 0
 
-        uids = []
-        for particle in iterable:
-            if particle.uid is None:
-                particle.uid = uuid.uuid4()
+        particles = list(iterable)
+        without_uid = [particle for particle in particles
+                       if particle.uid is None]
+        if without_uid:
+            for particle, uid in zip(without_uid,
+                                     self._generate_uids(len(without_uid))):
+                particle.uid = uid
 
-            number_added_per_material[particle.data[CUBA.MATERIAL_TYPE]] += 1
+        uids = []
+        for particle in particles:
+            data = self._get_particle_data(particle, uname)
+            number_added_per_material[data[CUBA.MATERIAL_TYPE]] += 1
 
             if not safe and particle.uid in self._particles[uname]:
                 raise ValueError(
@@ -454,23 +828,111 @@ class LammpsInternalDataManager(ABCDataManager):
                         particle.uid))
 
             self._particles[uname].add(particle.uid)
-            self._set_particle(particle, uname)
+            self._particle_data_cache.set_particle(particle.coordinates,
+                                                   data,
+                                                   particle.uid)
 
             uids.append(particle.uid)
 
-        # create atoms in lammps
-        for material, number in number_added_per_material.iteritems():
-            if number > 0:
-                atom_type = \
-                    self._material_atom_type_manager.get_atom_type(material)
-                self._lammps.command(
-                    "create_atoms {} random {} 42 NULL".format(atom_type,
-                                                               number))
+        self._create_atoms(
+            {self._material_atom_type_manager.get_atom_type(material): number
+             for material, number in number_added_per_material.iteritems()
+             if number > 0})
+        return uids
+
+    def _create_atoms(self, number_per_atom_type):
+        """ Create atoms in lammps
+
+        The atoms are randomly added somewhere in the simulation box by
+        LAMMPS (their positions and other values are corrected/updated
+        during next flush)
+
+        Parameters
+        ----------
+        number_per_atom_type : dict
+            map from atom type to the number of atoms to be created
+
+        """
+        for atom_type, number in sorted(number_per_atom_type.iteritems()):
+            self._lammps.command(
+                "create_atoms {} random {} 42 NULL".format(atom_type,
+                                                           number))
+
+    def _get_existing_uids(self, uname, uids, error_type):
+        """ Get uids of existing particles
+
+        Parameters
+        ----------
+        uname : str
+            non-changing unique name of particle container
+        uids : sequence of uuid.UUID or None
+            uids of particles (or None for all particles)
+        error_type : type
+            type of exception raised if a particle does not exist
+
+        """
+        if uids is None:
+            return self.get_uids(uname)
+
+        uids = list(uids)
+        for uid in uids:
+            if uid not in self._particles[uname]:
+                raise error_type(
+                    "particle id ({}) was not found".format(uid))
+        return uids
+
+    def _get_new_uids(self, uname, uids, number_particles):
+        """ Get (or generate) uids for new particles
+
+        Parameters
+        ----------
+        uname : str
+            non-changing unique name of particle container
+        uids : sequence of uuid.UUID or None
+            uids of particles (or None if they should be generated)
+        number_particles : int
+            number of new particles
+
+        Raises
+        ------
+        ValueError :
+            when there is a particle with an uid that already exists
+            in the container.
+
+        """
+        if uids is None:
+            return self._generate_uids(number_particles)
+
+        uids = list(uids)
+        for uid in uids:
+            if uid in self._particles[uname]:
+                raise ValueError(
+                    "particle with same uid ({}) already exists".format(uid))
+        if len(set(uids)) != len(uids):
+            raise ValueError("uids of particles are not unique")
         return uids
 
+    def _generate_uids(self, number):
+        """ Generate uids (e.g. of new particles)
+
+        If there is a communicator, the uids are generated on rank 0
+        and broadcast to all ranks.
+
+        """
+        if self._comm is None:
+            return super(LammpsInternalDataManager, self)._generate_uids(
+                number)
+
+        uids = None
+        if self._comm.Get_rank() == 0:
+            uids = super(LammpsInternalDataManager, self)._generate_uids(
+                number)
+        return self._comm.bcast(uids, root=0)
+
     def _update_material_atom_type_manager(self):
         """ Update materials from state data
 
         """
         materials = [m for m in self._state_data.iter(item_type=CUBA.MATERIAL)]
         self._material_atom_type_manager.update_materials(materials)
+        self._update_number_of_types()
@@ -0,0 +1,322 @@
+""" LAMMPS library run in a child process
+
+The internal interface can use LammpsWorker instead of the LAMMPS python
+wrapper, so that a crash of LAMMPS does not end the python process.
+
+"""
+import ctypes
+import mmap
+import multiprocessing
+import os
+import tempfile
+import weakref
+
+# ctypes of the data types of gather_atoms/scatter_atoms (0: int, 1: double)
+_CTYPES = {0: ctypes.c_int, 1: ctypes.c_double}
+
+# initial size (in bytes) of the shared buffer
+_INITIAL_BUFFER_SIZE = mmap.PAGESIZE
+
+# directory of the shared buffer (memory-backed if available)
+_SHARED_MEMORY_DIRECTORY = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# methods of the library which are forwarded as they are
+_FORWARDED_METHODS = ("command", "extract_global", "get_natoms")
+
+
+class LammpsWorker(object):
+    """ LAMMPS library hosted by a child process
+
+    The worker provides the methods of the LAMMPS python wrapper
+    (lammps.lammps) which are used by the internal interface, while the
+    library itself is run in a child process which is driven over a pipe.
+    The arrays of gather_atoms/scatter_atoms are exchanged through a
+    shared memory buffer (a memory-mapped file), so only the requests are
+    sent through the pipe.
+
+    If LAMMPS crashes (i.e. the child process exits), a new child process
+    is started, the restart handler (see set_restart_handler) is called
+    to restore the state of LAMMPS and a RuntimeError is raised for the
+    call during which LAMMPS crashed.  Errors reported by LAMMPS are
+    raised as RuntimeError (while the child process keeps running).
+
+    Parameters
+    ----------
+    cmdargs : list of str, optional
+        command-line arguments of LAMMPS
+
+    """
+    def __init__(self, cmdargs=None):
+        self._cmdargs = list(cmdargs or [])
+        self._process = None
+        self._connection = None
+        self._buffer = None
+        self._restart_handler = None
+        self._restoring = False
+
+        # number of times LAMMPS has been restarted (after a crash)
+        self.number_restarts = 0
+
+        self._start()
+
+    def set_restart_handler(self, restart_handler):
+        """ Set the handler which restores the state after a restart
+
+        Parameters
+        ----------
+        restart_handler : callable or None
+            called (without arguments) after LAMMPS has been restarted.
+            A bound method is referenced weakly (i.e. it does not keep its
+            object alive), so that its object can own the worker.
+
+        """
+        if getattr(restart_handler, "__self__", None) is not None:
+            restart_handler = _WeakMethod(restart_handler)
+        self._restart_handler = restart_handler
+
+    def command(self, command):
+        """ Run a LAMMPS command """
+        self._call("command", command)
+
+    def extract_global(self, name, data_type):
+        """ Get a global value of LAMMPS """
+        return self._call("extract_global", name, data_type)
+
+    def get_natoms(self):
+        """ Get the total number of atoms """
+        return self._call("get_natoms")
+
+    def available_styles(self, category):
+        """ Get the styles of a category compiled into LAMMPS
+
+        Returns None if the styles cannot be queried (i.e. older versions
+        of the LAMMPS python module).
+
+        """
+        return self._call("available_styles", category)
+
+    def gather_atoms(self, name, data_type, count):
+        """ Gather a per-atom quantity of all atoms (ordered by atom id)
+
+        Returns
+        -------
+        ctypes array
+            values of the atoms (c_int if data_type is 0, c_double if 1)
+
+        """
+        length = self._call("gather_atoms", name, data_type, count)
+        return self._buffer.read(_CTYPES[data_type], length)
+
+    def scatter_atoms(self, name, data_type, count, data):
+        """ Scatter a per-atom quantity of all atoms (ordered by atom id)
+
+        """
+        self._buffer.write(data)
+        self._call("scatter_atoms", name, data_type, count, len(data))
+
+    def close(self):
+        """ Close LAMMPS and stop the child process
+
+        (The file of the shared buffer is already removed once the child
+        process has been started.)
+
+        """
+        if self._process is None:
+            return
+        try:
+            self._connection.send(("close", ()))
+            self._connection.recv()
+        except (EOFError, IOError, OSError):
+            pass
+        self._stop()
+
+    def __del__(self):
+        # the worker might not have been started (or be partly destroyed
+        # at the exit of the interpreter)
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _call(self, name, *args):
+        """ Call a method of the library in the child process """
+        if self._process is None:
+            raise RuntimeError("LAMMPS has been closed")
+        try:
+            self._connection.send((name, args))
+            status, value = self._connection.recv()
+        except (EOFError, IOError, OSError):
+            exitcode = self._stop()
+            self._start()
+            self.number_restarts += 1
+            # a crash while restoring is not restored again
+            if self._restart_handler is not None and not self._restoring:
+                self._restoring = True
+                try:
+                    self._restart_handler()
+                finally:
+                    self._restoring = False
+            raise RuntimeError(
+                "LAMMPS crashed (exit code {}) during '{}' and has been "
+                "restarted".format(exitcode, name))
+        if status == "error":
+            raise RuntimeError(value)
+        return value
+
+    def _start(self):
+        """ Start the child process (and wait until LAMMPS is created) """
+        handle, filename = tempfile.mkstemp(prefix="simlammps_",
+                                            dir=_SHARED_MEMORY_DIRECTORY)
+        try:
+            os.ftruncate(handle, _INITIAL_BUFFER_SIZE)
+            os.close(handle)
+            connection, child_connection = multiprocessing.Pipe()
+            self._process = multiprocessing.Process(
+                target=_serve,
+                args=(child_connection, self._cmdargs, filename))
+            self._process.daemon = True
+            self._process.start()
+            child_connection.close()
+            self._connection = connection
+            self._buffer = _SharedBuffer(filename)
+
+            try:
+                status, value = self._connection.recv()
+            except EOFError:
+                status, value = "error", "LAMMPS exited with code {}".format(
+                    self._stop())
+        finally:
+            # both processes have opened the buffer
+            os.remove(filename)
+
+        if status == "error":
+            self._stop()
+            raise RuntimeError(value)
+
+    def _stop(self):
+        """ Stop the child process and return its exit code """
+        process, self._process = self._process, None
+        if process is None:
+            return None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        process.join(1.0)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        return process.exitcode
+
+
+class _WeakMethod(object):
+    """ Bound method which does not keep its object alive
+
+    Calling it does nothing once its object has been destroyed.
+
+    Parameters
+    ----------
+    method : instancemethod
+        bound method
+
+    """
+    def __init__(self, method):
+        self._object = weakref.ref(method.__self__)
+        self._function = method.__func__
+
+    def __call__(self):
+        obj = self._object()
+        if obj is not None:
+            self._function(obj)
+
+
+class _SharedBuffer(object):
+    """ Memory shared by the processes (a file mapped by each process)
+
+    The buffer is grown (by the writing process) as needed and the reading
+    process maps the grown file when it reads beyond its mapping.
+
+    Parameters
+    ----------
+    filename : str
+        name of the file of the buffer
+
+    """
+    def __init__(self, filename):
+        self._file = open(filename, "r+b")
+        self._map = None
+        self._remap()
+
+    def write(self, data):
+        """ Write a ctypes array to the buffer """
+        nbytes = ctypes.sizeof(data)
+        if nbytes > len(self._map):
+            self._file.truncate(max(nbytes, 2 * len(self._map)))
+            self._remap()
+        self._map[:nbytes] = ctypes.string_at(data, nbytes)
+
+    def read(self, ctype, length):
+        """ Read a ctypes array (of ctype and length) from the buffer """
+        array_type = ctype * length
+        if ctypes.sizeof(array_type) > len(self._map):
+            self._remap()
+        return array_type.from_buffer_copy(self._map)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+
+def _serve(connection, cmdargs, filename):
+    """ Host LAMMPS and serve the requests (in the child process) """
+    try:
+        import lammps
+        lmp = lammps.lammps(cmdargs=cmdargs)
+        shared_buffer = _SharedBuffer(filename)
+    except Exception as e:
+        connection.send(("error", "LAMMPS could not be started: {}".format(e)))
+        return
+    connection.send(("ok", None))
+
+    while True:
+        try:
+            name, args = connection.recv()
+        except EOFError:
+            # the worker has been stopped
+            break
+        try:
+            if name == "close":
+                lmp.close()
+                result = None
+            elif name == "gather_atoms":
+                data = lmp.gather_atoms(*args)
+                shared_buffer.write(data)
+                result = len(data)
+            elif name == "scatter_atoms":
+                atom_name, data_type, count, length = args
+                lmp.scatter_atoms(
+                    atom_name, data_type, count,
+                    shared_buffer.read(_CTYPES[data_type], length))
+                result = None
+            elif name == "available_styles":
+                result = None
+                if hasattr(lmp, "available_styles"):
+                    result = list(lmp.available_styles(*args))
+            elif name in _FORWARDED_METHODS:
+                result = getattr(lmp, name)(*args)
+            else:
+                raise ValueError("Unsupported request '{}'".format(name))
+        except Exception as e:
+            connection.send(("error", "{}: {}".format(type(e).__name__, e)))
+        else:
+            connection.send(("ok", result))
+        if name == "close":
+            break
+    connection.close()
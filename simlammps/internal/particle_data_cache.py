@@ -15,6 +15,15 @@ class ParticleDataCache(object):
     in order to retrieve this data from LAMMPS and send this
     data to LAMMPS.
 
+    When LAMMPS runs on several (MPI) ranks, the data of all atoms is
+    gathered on each rank (see gather_atoms) and each rank takes the
+    values of its own atoms when the data is scattered, so every rank
+    holds the same (complete) cache.
+
+    The data is stored as arrays (one row per particle, ordered by the
+    index in the lammps arrays) which grow as particles are added and
+    which are passed to lammps without conversion.
+
     Parameters
     ----------
     lammps :
@@ -24,6 +33,13 @@ class ParticleDataCache(object):
     material_atom_type_manager : MaterialAtomTypeManager
         class that manages the relationship between material-uid and atom_type
 
+    Attributes
+    ----------
+    revision : int
+        increased whenever values of cached particles are changed (e.g. by
+        a retrieve), so that a reader can tell if values it has read are
+        still current
+
     """
     def __init__(self, lammps, atoms_style, material_atom_type_manager):
         self._lammps = lammps
@@ -35,65 +51,54 @@ class ParticleDataCache(object):
         # map from uid to 'index in lammps arrays'
         self._index_of_uid = {}
 
-        # cache of particle-related data (stored by CUBA keyword)
+        # cache of particle-related data (stored by CUBA keyword). The
+        # arrays can have more rows than particles (see _reserve).
         self._cache = {}
 
         # cache of coordinates
-        self._coordinates = []
+        self._coordinates = _new_array(0, 3, numpy.float64)
 
-        self._cache[CUBA.MATERIAL_TYPE] = []
+        for cuba_key in self._get_cuba_keys():
+            count, dtype = _get_layout(cuba_key)
+            self._cache[cuba_key] = _new_array(0, count, dtype)
 
-        for attribute in self._data_attributes:
-            self._cache[attribute.cuba_key] = []
+        # number of times values of cached particles have been changed
+        # (i.e. adding particles does not change the revision)
+        self.revision = 0
 
     def retrieve(self):
         """ Retrieve all data from lammps
 
         """
-        self._coordinates = self._lammps.gather_atoms("x", 1, 3)
+        self.revision += 1
+        self._coordinates = _from_lammps(
+            self._lammps.gather_atoms("x", 1, 3), 3, numpy.float64)
 
         for attribute in self._data_attributes:
-            keyword = KEYWORDS[attribute.cuba_key.name]
-
-            # we handle material type seperately
-            if attribute.cuba_key == CUBA.MATERIAL_TYPE:
-                self._cache[attribute.cuba_key] = self._lammps.gather_atoms(
-                    "type",
-                    0,
-                    1)
-                continue
-
-            self._cache[attribute.cuba_key] = self._lammps.gather_atoms(
-                attribute.lammps_key,
-                _get_type(keyword),
-                _get_count(keyword))
+            count, dtype = _get_layout(attribute.cuba_key)
+            self._cache[attribute.cuba_key] = _from_lammps(
+                self._lammps.gather_atoms(attribute.lammps_key,
+                                          _get_type(dtype),
+                                          count),
+                count,
+                dtype)
 
     def send(self):
         """ Send data to lammps
 
         """
+        number_particles = len(self._index_of_uid)
         self._lammps.scatter_atoms(
             "x", 1, 3,
-            (ctypes.c_double * len(self._coordinates))(*self._coordinates))
+            _to_lammps(self._coordinates[:number_particles]))
 
         for attribute in self._data_attributes:
-            keyword = KEYWORDS[attribute.cuba_key.name]
-            values = self._cache[attribute.cuba_key]
-
-            # we handle material type seperately
-            if attribute.cuba_key == CUBA.MATERIAL_TYPE:
-                self._lammps.scatter_atoms("type",
-                                           0,
-                                           1,
-                                           (ctypes.c_int * len(
-                                               values))(*values))
-                continue
-
-            self._lammps.scatter_atoms(attribute.lammps_key,
-                                       _get_type(keyword),
-                                       _get_count(keyword),
-                                       (_get_ctype(keyword) * len(values))(
-                                           *values))
+            count, dtype = _get_layout(attribute.cuba_key)
+            self._lammps.scatter_atoms(
+                attribute.lammps_key,
+                _get_type(dtype),
+                count,
+                _to_lammps(self._cache[attribute.cuba_key][:number_particles]))
 
     def get_particle_data(self, uid):
         """ get particle data
@@ -109,9 +114,23 @@ class ParticleDataCache(object):
             data of the particle
 
         """
-        data = DataContainer()
+        return self.get_particle_data_of_index(self._index_of_uid[uid])
+
+    def get_particle_data_of_index(self, index):
+        """ get particle data
+
+        Parameters
+        ----------
+        index : int
+            index of particle in the cache
 
-        index = self._index_of_uid[uid]
+        Returns
+        -------
+        data : DataContainer
+            data of the particle
+
+        """
+        data = DataContainer()
 
         for attribute in self._data_attributes:
             # we handle material type seperately
@@ -119,18 +138,16 @@ class ParticleDataCache(object):
                 # convert from the integer atom_type to material-uid)
                 data[CUBA.MATERIAL_TYPE] = \
                     self._material_atom_type_manager.get_material_uid(
-                        self._cache[CUBA.MATERIAL_TYPE][index])
+                        int(self._cache[CUBA.MATERIAL_TYPE][index]))
                 continue
 
-            count = _get_count(KEYWORDS[attribute.cuba_key.name])
-            i = index * count
-            if count > 1:
+            value = self._cache[attribute.cuba_key][index]
+            if value.ndim > 0:
                 # always assuming that its a tuple
                 # ( see https://github.com/simphony/simphony-common/issues/18 )
-                data[attribute.cuba_key] = tuple(
-                    self._cache[attribute.cuba_key][i:i+count])
+                data[attribute.cuba_key] = tuple(value.tolist())
             else:
-                data[attribute.cuba_key] = self._cache[attribute.cuba_key][i]
+                data[attribute.cuba_key] = value.item()
         return data
 
     def get_coordinates(self, uid):
@@ -141,9 +158,197 @@ class ParticleDataCache(object):
         uid : uid
             uid of particle
         """
-        i = self._index_of_uid[uid] * 3
-        coordinates = self._coordinates[i:i+3]
-        return tuple(coordinates)
+        return self.get_coordinates_of_index(self._index_of_uid[uid])
+
+    def get_coordinates_of_index(self, index):
+        """ Get coordinates for a particle
+
+        Parameters
+        ----------
+        index : int
+            index of particle in the cache
+        """
+        return tuple(self._coordinates[index].tolist())
+
+    def get_index(self, uid):
+        """ Get the index (in the lammps arrays) of a particle
+
+        Parameters
+        ----------
+        uid : uuid.UUID
+            uid of particle
+
+        Raises
+        ------
+        KeyError
+            if the uid is unknown
+
+        """
+        return self._index_of_uid[uid]
+
+    def get_uids_of_lammps_ids(self):
+        """ Get map from lammps atom id to particle uid
+
+        The data in the lammps arrays (see gather_atoms/scatter_atoms) is
+        ordered by atom id, so the atom id is the index in the cache plus one.
+
+        """
+        return {index + 1: uid for uid, index
+                in self._index_of_uid.iteritems()}
+
+    def get_indices(self, uids):
+        """ Get the indices (in the lammps arrays) of particles
+
+        Parameters
+        ----------
+        uids : sequence of uuid.UUID
+            uids of particles
+
+        Returns
+        -------
+        numpy.ndarray
+            index of each particle
+
+        Raises
+        ------
+        KeyError
+            if a uid is unknown
+
+        """
+        return numpy.fromiter((self._index_of_uid[uid] for uid in uids),
+                              dtype=numpy.intp,
+                              count=len(uids))
+
+    def get_coordinates_array(self, uids):
+        """ Get the coordinates of particles
+
+        Parameters
+        ----------
+        uids : sequence of uuid.UUID
+            uids of particles
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+
+        """
+        return self._coordinates[self.get_indices(uids)]
+
+    def get_data_array(self, cuba_key, uids):
+        """ Get the values of a CUBA attribute of particles
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        uids : sequence of uuid.UUID
+            uids of particles
+
+        Returns
+        -------
+        numpy.ndarray
+            (N,) or (N, k) array with the value of each particle
+
+        Raises
+        ------
+        KeyError
+            if the attribute is not supported
+
+        """
+        self._check_supported(cuba_key)
+        values = self._cache[cuba_key][self.get_indices(uids)]
+
+        if cuba_key == CUBA.MATERIAL_TYPE:
+            # convert from the integer atom_type to material-uid
+            return self._material_atom_type_manager.get_material_uids(values)
+        return values
+
+    def set_coordinates_array(self, uids, coordinates):
+        """ Set the coordinates of particles
+
+        Parameters
+        ----------
+        uids : sequence of uuid.UUID
+            uids of particles
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+
+        """
+        self._coordinates[self.get_indices(uids)] = coordinates
+        self.revision += 1
+
+    def set_data_array(self, cuba_key, uids, values):
+        """ Set the values of a CUBA attribute of particles
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        uids : sequence of uuid.UUID
+            uids of particles
+        values : array_like
+            (N,) or (N, k) array with the value of each particle
+
+        Raises
+        ------
+        KeyError
+            if the attribute is not supported
+
+        """
+        self._cache[cuba_key][self.get_indices(uids)] = \
+            self._to_lammps_values(cuba_key, values, len(uids))
+        self.revision += 1
+
+    def add_arrays(self, uids, coordinates, data_columns):
+        """ Add particles given as arrays
+
+        Parameters
+        ----------
+        uids : sequence of uuid.UUID
+            uids of the (new) particles
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        data_columns : dict
+            map from CUBA key to an array with the value of each particle.
+            CUBA.MATERIAL_TYPE is required while missing attributes of the
+            atom style (e.g. CUBA.VELOCITY) are set to zero.
+
+        Returns
+        -------
+        numpy.ndarray
+            atom type of each added particle
+
+        Raises
+        ------
+        KeyError
+            if CUBA.MATERIAL_TYPE is missing
+
+        """
+        number_particles = len(uids)
+        if CUBA.MATERIAL_TYPE not in data_columns:
+            raise KeyError("Particles need a material ({})".format(
+                CUBA.MATERIAL_TYPE))
+
+        values_of_attributes = {}
+        for attribute in self._data_attributes:
+            if attribute.cuba_key in data_columns:
+                values_of_attributes[attribute.cuba_key] = \
+                    self._to_lammps_values(attribute.cuba_key,
+                                           data_columns[attribute.cuba_key],
+                                           number_particles)
+
+        start = len(self._index_of_uid)
+        end = start + number_particles
+        self._reserve(end)
+        for index, uid in enumerate(uids, start):
+            self._index_of_uid[uid] = index
+
+        self._coordinates[start:end] = coordinates
+        for cuba_key, array in self._cache.iteritems():
+            array[start:end] = values_of_attributes.get(cuba_key, 0)
+
+        return values_of_attributes[CUBA.MATERIAL_TYPE]
 
     def set_particle(self, coordinates, data, uid):
         """ set particle coordinates and data
@@ -158,13 +363,15 @@ class ParticleDataCache(object):
             uuid of the particle
 
         """
-        if uid not in self._index_of_uid:
-            self._index_of_uid[uid] = len(self._index_of_uid)
-
-        i = self._index_of_uid[uid] * 3
-        self._coordinates[i:i+3] = coordinates[0:3]
+        index = self._index_of_uid.get(uid)
+        if index is None:
+            index = len(self._index_of_uid)
+            self._reserve(index + 1)
+            self._index_of_uid[uid] = index
+        else:
+            self.revision += 1
 
-        index = self._index_of_uid[uid]
+        self._coordinates[index] = coordinates[0:3]
 
         # add each attribute
         for attribute in self._data_attributes:
@@ -173,59 +380,164 @@ class ParticleDataCache(object):
             if attribute.cuba_key == CUBA.MATERIAL_TYPE:
                 # convert to atom_type (int)
                 value = self._material_atom_type_manager.get_atom_type(value)
-            self._add_to_cache(attribute.cuba_key,
-                               index,
-                               value)
+            self._cache[attribute.cuba_key][index] = value
+
+    def _get_cuba_keys(self):
+        """ Get the CUBA keys of the cached attributes """
+        return set([CUBA.MATERIAL_TYPE] + [
+            attribute.cuba_key for attribute in self._data_attributes])
 
-    def _add_to_cache(self, cuba_key, index, value):
-        """ Add value to cache
+    def _reserve(self, number_particles):
+        """ Grow the arrays so that they have room for the particles
+
+        The arrays grow (at least) by doubling, so that adding particles
+        one by one does not copy the arrays each time.
+
+        Parameters
+        ----------
+        number_particles : int
+            number of particles to be held
+
+        """
+        capacity = len(self._coordinates)
+        if number_particles <= capacity:
+            return
+        capacity = max(number_particles, 2 * capacity)
+        self._coordinates = _resize(self._coordinates, capacity)
+        for cuba_key in self._cache:
+            self._cache[cuba_key] = _resize(self._cache[cuba_key], capacity)
+
+    def _check_supported(self, cuba_key):
+        """ Check that the attribute is cached
+
+        Raises
+        ------
+        KeyError
+            if the attribute is not supported
+
+        """
+        if cuba_key not in self._cache:
+            raise KeyError(
+                "Attribute '{}' is not supported".format(cuba_key))
+
+    def _to_lammps_values(self, cuba_key, values, number_particles):
+        """ Convert array of cuba values to array of lammps values
 
         Parameters
         ----------
         cuba_key : CUBA
             cuba key
-        index : int
-            index in cache
-        value : float or int or float[3] or int[3]
-            value added to cache
+        values : array_like
+            value of each particle
+        number_particles : int
+            number of particles
+
+        Returns
+        -------
+        numpy.ndarray
+            (N,) or (N, k) array of values
+
+        Raises
+        ------
+        KeyError
+            if the attribute is not supported
 
         """
-        keyword = KEYWORDS[cuba_key.name]
-        shape = keyword.shape
-
-        if shape == [1]:
-            if index < len(self._cache[cuba_key]):
-                self._cache[cuba_key][index] = value
-            elif index == len(self._cache[cuba_key]):
-                self._cache[cuba_key].append(value)
-            else:
-                msg = "Problem with index {}".format(index)
-                raise IndexError(msg)
-        elif shape == [3]:
-            index = index * 3
-            self._cache[cuba_key][index:index+3] = value[0:3]
-        else:
-            raise RuntimeError("Unsupported shape: {0}".format(shape))
+        self._check_supported(cuba_key)
+        if cuba_key == CUBA.MATERIAL_TYPE:
+            # convert to atom_type (int)
+            values = self._material_atom_type_manager.get_atom_types(values)
+
+        count, dtype = _get_layout(cuba_key)
+        shape = (number_particles,) if count == 1 else \
+            (number_particles, count)
+        values = numpy.asarray(values, dtype=dtype)
+        if values.shape != shape:
+            raise ValueError(
+                "Values of '{}' do not have the shape {}".format(
+                    cuba_key, shape))
+        return values
+
+
+def _get_layout(cuba_key):
+    """ Get number and type of the lammps values of an attribute
+
+    Returns
+    -------
+    count : int
+        number of values per particle
+    dtype : numpy.dtype
+        type of values
+
+    """
+    # material type is stored as atom type
+    if cuba_key == CUBA.MATERIAL_TYPE:
+        return 1, numpy.int32
+
+    keyword = KEYWORDS[cuba_key.name]
+    return _get_count(keyword), keyword.dtype
 
 
-def _get_ctype(keyword):
-    """ get ctype
+def _new_array(number_particles, count, dtype):
+    """ Create a (zeroed) array of the values of particles
+
+    Returns
+    -------
+    numpy.ndarray
+        (N,) array if count is 1 otherwise (N, count) array
+
+    """
+    shape = (number_particles,) if count == 1 else (number_particles, count)
+    return numpy.zeros(shape, dtype=dtype)
+
+
+def _resize(array, number_particles):
+    """ Get a copy of the array with room for more particles """
+    resized = numpy.zeros((number_particles,) + array.shape[1:],
+                          dtype=array.dtype)
+    resized[:len(array)] = array
+    return resized
+
+
+def _from_lammps(values, count, dtype):
+    """ Get an array of the values gathered from lammps
 
     Parameters
     ----------
-    keyword : Keyword
+    values : sequence
+        flat sequence of values (e.g. ctypes array of gather_atoms)
+    count : int
+        number of values per particle
+    dtype : numpy.dtype
+        type of values
+
+    Returns
+    -------
+    numpy.ndarray
+        (N,) array if count is 1 otherwise (N, count) array
 
     """
-    if keyword.dtype == numpy.int32:
-        return ctypes.c_int
-    elif keyword.dtype == numpy.float64:
-        return ctypes.c_double
-    else:
-        raise RuntimeError(
-            "Unsupported type {}".format(keyword.dtype))
+    array = numpy.array(values, dtype=dtype)
+    if count > 1:
+        array = array.reshape((-1, count))
+    return array
+
+
+def _to_lammps(array):
+    """ Get a ctypes array (for scatter_atoms) sharing the array's memory
 
+    Parameters
+    ----------
+    array : numpy.ndarray
+        values (of type int32 or float64) to be scattered
 
-def _get_type(keyword):
+    """
+    array = numpy.ascontiguousarray(array)
+    ctype = ctypes.c_int if array.dtype == numpy.int32 else ctypes.c_double
+    return (ctype * array.size).from_buffer(array)
+
+
+def _get_type(dtype):
     """ get type
 
     Get type which is a 1 or 0 to signify if its a
@@ -233,16 +545,16 @@ def _get_type(keyword):
 
     Parameters
     ----------
-    keyword : Keyword
+    dtype : numpy.dtype
 
     """
-    if keyword.dtype == numpy.int32:
+    if dtype == numpy.int32:
         return 0
-    elif keyword.dtype == numpy.float64:
+    elif dtype == numpy.float64:
         return 1
     else:
         raise RuntimeError(
-            "Unsupported type {}".format(keyword.dtype))
+            "Unsupported type {}".format(dtype))
 
 
 def _get_count(keyword):
@@ -0,0 +1,102 @@
+from simphony.core.data_container import DataContainer
+from simphony.cuds.particles import Particle
+
+from simlammps.common.read_only_data_container import ReadOnlyDataContainer
+
+
+class ParticleRecord(object):
+    """ Read-only particle which is a view onto a row of the cache
+
+    The coordinates and data of the particle are only read from the
+    ParticleDataCache when they are first accessed and are then kept by
+    the record, so values which have been read do not change when the
+    cache is changed later (e.g. by a run).  As long as a value has not
+    been read, the record reflects the current value of the cache, i.e.
+    records are meant to be read while iterating.
+
+    The record cannot be changed (its data is a ReadOnlyDataContainer).
+    A changeable Particle is created with to_particle, e.g. to change a
+    particle and pass it to `update`.
+
+    Parameters
+    ----------
+    uid : uuid.UUID
+        uid of the particle
+    index : int
+        index of the particle in the cache
+    cache : ParticleDataCache
+        cache containing the particle
+
+    """
+    __slots__ = ("_uid", "_index", "_cache", "_revision", "_coordinates",
+                 "_data")
+
+    def __init__(self, uid, index, cache):
+        self._uid = uid
+        self._index = index
+        self._cache = cache
+        # revision of the cache when the values were read (None if
+        # nothing has been read or the values were read from different
+        # revisions)
+        self._revision = None
+        self._coordinates = None
+        self._data = None
+
+    @property
+    def uid(self):
+        return self._uid
+
+    @property
+    def coordinates(self):
+        if self._coordinates is None:
+            self._note_read()
+            self._coordinates = self._cache.get_coordinates_of_index(
+                self._index)
+        return self._coordinates
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._note_read()
+            self._data = ReadOnlyDataContainer(
+                self._cache.get_particle_data_of_index(self._index))
+        return self._data
+
+    def is_unchanged_view_of(self, cache):
+        """ Check if the record still has the values of the cache
+
+        Parameters
+        ----------
+        cache : ParticleDataCache
+            cache
+
+        Returns
+        -------
+        bool
+            True if the record belongs to the cache and the values read
+            by the record are still current (i.e. setting the record would
+            not change the cache).
+
+        """
+        if self._cache is not cache:
+            return False
+        nothing_read = self._coordinates is None and self._data is None
+        return nothing_read or self._revision == cache.revision
+
+    def to_particle(self):
+        """ Return a (stand-alone) Particle with the values of the record
+
+        """
+        return Particle(uid=self.uid,
+                        coordinates=self.coordinates,
+                        data=DataContainer(self.data))
+
+    def __reduce__(self):
+        return self.to_particle().__reduce__()
+
+    def _note_read(self):
+        """ Note that a value is read from the current revision """
+        if self._coordinates is None and self._data is None:
+            self._revision = self._cache.revision
+        elif self._revision != self._cache.revision:
+            self._revision = None
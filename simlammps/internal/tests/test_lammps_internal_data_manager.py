@@ -0,0 +1,130 @@
+import unittest
+import uuid
+
+from simphony.api import CUDS
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.meta.api import Material
+from simphony.cuds.particles import Particle, Particles
+
+from simlammps.common.atom_style import AtomStyle
+from simlammps.internal.lammps_internal_data_manager import (
+    LammpsInternalDataManager)
+
+
+class _Lammps(object):
+    """ Lammps replacement which only records the commands
+
+    The per-atom quantities which are scattered are recorded as well.
+
+    """
+    def __init__(self):
+        self.commands = []
+        self.scattered = {}
+
+    def command(self, command):
+        self.commands.append(command)
+
+    def scatter_atoms(self, name, data_type, count, data):
+        self.scattered[name] = list(data)
+
+
+class _Comm(object):
+    """ Communicator replacement of a (non-zero) rank
+
+    Each broadcast returns the next of the objects sent by rank 0.
+
+    """
+    def __init__(self, broadcasts):
+        self._broadcasts = list(broadcasts)
+
+    def Get_rank(self):
+        return 1
+
+    def bcast(self, obj, root=0):
+        assert obj is None
+        return self._broadcasts.pop(0)
+
+
+class TestLammpsInternalDataManagerWithComm(unittest.TestCase):
+
+    def setUp(self):
+        self.material = Material()
+        self.material.data[CUBA.MASS] = 1.0
+        state_data = CUDS()
+        state_data.add([self.material])
+
+        self.uname_of_rank_0 = uuid.uuid4()
+        self.uids_of_rank_0 = [uuid.uuid4(), uuid.uuid4()]
+        self.comm = _Comm([[self.uname_of_rank_0], self.uids_of_rank_0])
+        self.manager = LammpsInternalDataManager(_Lammps(),
+                                                 state_data,
+                                                 AtomStyle.ATOMIC,
+                                                 comm=self.comm)
+
+    def test_uids_of_rank_0_are_used(self):
+        particles = Particles("foo")
+        particles.data = DataContainer(
+            {CUBA.VECTOR: [(10.0, 0.0, 0.0),
+                           (0.0, 10.0, 0.0),
+                           (0.0, 0.0, 10.0)]})
+        container = self.manager.new_particles(particles)
+
+        data = DataContainer({CUBA.MATERIAL_TYPE: self.material.uid,
+                              CUBA.VELOCITY: (0.0, 0.0, 0.0)})
+        uids = container.add([Particle(coordinates=(1.0, 1.0, 1.0),
+                                       data=data),
+                              Particle(coordinates=(2.0, 2.0, 2.0),
+                                       data=data)])
+
+        self.assertEqual(uids, self.uids_of_rank_0)
+        self.assertEqual(container._uname, self.uname_of_rank_0)
+
+
+class TestLammpsInternalDataManagerRestore(unittest.TestCase):
+
+    def setUp(self):
+        self.material = Material()
+        self.material.data[CUBA.MASS] = 1.0
+        state_data = CUDS()
+        state_data.add([self.material])
+
+        self.lammps = _Lammps()
+        self.manager = LammpsInternalDataManager(self.lammps,
+                                                 state_data,
+                                                 AtomStyle.ATOMIC)
+
+    def test_restore(self):
+        particles = Particles("foo")
+        particles.data = DataContainer(
+            {CUBA.VECTOR: [(10.0, 0.0, 0.0),
+                           (0.0, 10.0, 0.0),
+                           (0.0, 0.0, 10.0)]})
+        container = self.manager.new_particles(particles)
+        data = DataContainer({CUBA.MATERIAL_TYPE: self.material.uid,
+                              CUBA.VELOCITY: (0.0, 0.0, 0.0)})
+        uids = container.add([Particle(coordinates=(1.0, 1.0, 1.0),
+                                       data=data),
+                              Particle(coordinates=(2.0, 2.0, 2.0),
+                                       data=data)])
+        del self.lammps.commands[:]
+
+        self.manager.restore()
+
+        # the box has been recreated and the atoms re-added
+        commands = self.lammps.commands
+        self.assertTrue(any(command.startswith("create_box")
+                            for command in commands))
+        self.assertIn("create_atoms 1 random 2 42 NULL", commands)
+        self.assertIn("mass 1 1.0", commands)
+        self.assertEqual(set(container.get_uids()), set(uids))
+        self.assertEqual(container.get(uids[1]).coordinates,
+                         (2.0, 2.0, 2.0))
+
+        # the cached coordinates have been sent to LAMMPS
+        self.assertEqual(sorted(self.lammps.scattered["x"]),
+                         [1.0, 1.0, 1.0, 2.0, 2.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
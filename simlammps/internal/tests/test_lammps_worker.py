@@ -0,0 +1,160 @@
+import ctypes
+import os
+import sys
+import types
+import unittest
+import weakref
+
+from simlammps.internal.lammps_worker import LammpsWorker
+
+
+class _Lammps(object):
+    """ Lammps replacement (hosted by the child process of the worker)
+
+    The command "crash" exits the process and the command "error" raises
+    an exception (as LAMMPS does on errors).
+
+    """
+    def __init__(self, cmdargs=None):
+        self._commands = []
+        self._atoms = {}
+
+    def command(self, command):
+        if command == "crash":
+            os._exit(1)
+        if command == "error":
+            raise Exception("ERROR: Unknown command")
+        self._commands.append(command)
+
+    def extract_global(self, name, data_type):
+        # number of commands run by this instance
+        return len(self._commands)
+
+    def gather_atoms(self, name, data_type, count):
+        values = self._atoms[name]
+        ctype = ctypes.c_int if data_type == 0 else ctypes.c_double
+        return (ctype * len(values))(*values)
+
+    def scatter_atoms(self, name, data_type, count, data):
+        self._atoms[name] = list(data)
+
+    def close(self):
+        pass
+
+
+class _Owner(object):
+    """ Object which owns the worker and restores its state """
+    def __init__(self, worker):
+        self.worker = worker
+        self.number_restores = 0
+
+    def restore(self):
+        self.number_restores += 1
+
+
+class TestLammpsWorker(unittest.TestCase):
+
+    def setUp(self):
+        # the worker imports the lammps module in its child process
+        lammps_module = types.ModuleType("lammps")
+        lammps_module.lammps = _Lammps
+        self.addCleanup(_restore_module, sys.modules.get("lammps"))
+        sys.modules["lammps"] = lammps_module
+
+        self.worker = LammpsWorker(cmdargs=["-log", "none"])
+        self.addCleanup(self.worker.close)
+
+    def test_command(self):
+        self.worker.command("units lj")
+        self.worker.command("atom_style atomic")
+        self.assertEqual(self.worker.extract_global("ntimestep", 0), 2)
+
+    def test_scatter_and_gather_atoms(self):
+        # larger than the initial size of the shared buffer
+        coordinates = [0.5 * i for i in range(3 * 10000)]
+        atom_types = [1 + i % 3 for i in range(10000)]
+
+        self.worker.scatter_atoms(
+            "x", 1, 3,
+            (ctypes.c_double * len(coordinates))(*coordinates))
+        self.worker.scatter_atoms(
+            "type", 0, 1, (ctypes.c_int * len(atom_types))(*atom_types))
+
+        self.assertEqual(list(self.worker.gather_atoms("x", 1, 3)),
+                         coordinates)
+        self.assertEqual(list(self.worker.gather_atoms("type", 0, 1)),
+                         atom_types)
+
+    def test_error(self):
+        with self.assertRaisesRegexp(RuntimeError, "Unknown command"):
+            self.worker.command("error")
+
+        # the worker is still usable (and has not been restarted)
+        self.worker.command("units lj")
+        self.assertEqual(self.worker.extract_global("ntimestep", 0), 1)
+        self.assertEqual(self.worker.number_restarts, 0)
+
+    def test_restart_after_crash(self):
+        restarts = []
+        self.worker.set_restart_handler(
+            lambda: restarts.append(
+                self.worker.extract_global("ntimestep", 0)))
+        self.worker.command("units lj")
+
+        with self.assertRaisesRegexp(RuntimeError, "crashed"):
+            self.worker.command("crash")
+
+        # the handler has been called with the new LAMMPS
+        self.assertEqual(restarts, [0])
+        self.assertEqual(self.worker.number_restarts, 1)
+        self.worker.command("units lj")
+        self.assertEqual(self.worker.extract_global("ntimestep", 0), 1)
+
+    def test_crash_while_restoring(self):
+        self.worker.set_restart_handler(
+            lambda: self.worker.command("crash"))
+
+        with self.assertRaisesRegexp(RuntimeError, "crashed"):
+            self.worker.command("crash")
+
+        self.assertEqual(self.worker.number_restarts, 2)
+        self.worker.command("units lj")
+
+    def test_close(self):
+        self.worker.close()
+        with self.assertRaises(RuntimeError):
+            self.worker.command("units lj")
+
+    def test_bound_restart_handler(self):
+        owner = _Owner(self.worker)
+        self.worker.set_restart_handler(owner.restore)
+
+        with self.assertRaisesRegexp(RuntimeError, "crashed"):
+            self.worker.command("crash")
+        self.assertEqual(owner.number_restores, 1)
+
+        # the handler does not keep its object alive
+        owner_ref = weakref.ref(owner)
+        del owner
+        self.assertIsNone(owner_ref())
+        with self.assertRaisesRegexp(RuntimeError, "crashed"):
+            self.worker.command("crash")
+
+    def test_del(self):
+        worker = LammpsWorker()
+        process = worker._process
+        del worker
+
+        # the child process has been stopped
+        self.assertFalse(process.is_alive())
+
+
+def _restore_module(module):
+    if module is None:
+        sys.modules.pop("lammps", None)
+    else:
+        sys.modules["lammps"] = module
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import pickle
+import unittest
+import uuid
+
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.meta.api import Material
+from simphony.cuds.particles import Particle
+
+from simlammps.common.atom_style import AtomStyle
+from simlammps.internal.lammps_internal_data_manager import (
+    MaterialAtomTypeManager)
+from simlammps.internal.particle_data_cache import ParticleDataCache
+from simlammps.internal.particle_record import ParticleRecord
+
+
+class TestParticleRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.material = Material()
+        self.cache = ParticleDataCache(
+            lammps=None,
+            atoms_style=AtomStyle.ATOMIC,
+            material_atom_type_manager=MaterialAtomTypeManager(
+                [self.material]))
+
+        self.uids = [uuid.uuid4(), uuid.uuid4()]
+        for i, uid in enumerate(self.uids):
+            data = DataContainer({CUBA.MATERIAL_TYPE: self.material.uid,
+                                  CUBA.VELOCITY: (0.1 * i, 0.0, 0.0)})
+            self.cache.set_particle((i, i, i), data, uid)
+
+    def test_view(self):
+        record = ParticleRecord(self.uids[1], 1, self.cache)
+
+        self.assertEqual(record.uid, self.uids[1])
+        self.assertEqual(record.coordinates, (1.0, 1.0, 1.0))
+        self.assertEqual(record.data[CUBA.VELOCITY], (0.1, 0.0, 0.0))
+        self.assertEqual(record.data[CUBA.MATERIAL_TYPE], self.material.uid)
+
+    def test_read_only(self):
+        record = ParticleRecord(self.uids[0], 0, self.cache)
+
+        with self.assertRaises(AttributeError):
+            record.coordinates = (5.0, 5.0, 5.0)
+        with self.assertRaises(AttributeError):
+            record.uid = uuid.uuid4()
+        with self.assertRaises(AttributeError):
+            record.data = DataContainer()
+        with self.assertRaises(TypeError):
+            record.data[CUBA.VELOCITY] = (1.0, 1.0, 1.0)
+        # the record has no __dict__
+        with self.assertRaises(AttributeError):
+            record.foo = 1
+
+    def test_values_are_kept_once_read(self):
+        record = ParticleRecord(self.uids[0], 0, self.cache)
+        unread_record = ParticleRecord(self.uids[0], 0, self.cache)
+        record.coordinates
+        record.data
+
+        data = DataContainer({CUBA.MATERIAL_TYPE: self.material.uid,
+                              CUBA.VELOCITY: (1.0, 1.0, 1.0)})
+        self.cache.set_particle((5.0, 5.0, 5.0), data, self.uids[0])
+
+        self.assertEqual(record.coordinates, (0.0, 0.0, 0.0))
+        self.assertEqual(record.data[CUBA.VELOCITY], (0.0, 0.0, 0.0))
+        # a record which has not been read reflects the cache
+        self.assertEqual(unread_record.coordinates, (5.0, 5.0, 5.0))
+
+    def test_unchanged_view(self):
+        record = ParticleRecord(self.uids[0], 0, self.cache)
+        self.assertTrue(record.is_unchanged_view_of(self.cache))
+
+        # reading the values does not change the record
+        record.coordinates
+        self.assertTrue(record.is_unchanged_view_of(self.cache))
+
+        other_cache = ParticleDataCache(
+            lammps=None,
+            atoms_style=AtomStyle.ATOMIC,
+            material_atom_type_manager=MaterialAtomTypeManager([]))
+        self.assertFalse(record.is_unchanged_view_of(other_cache))
+
+        # the values read by the record are no longer those of the cache
+        self.cache.set_coordinates_array([self.uids[0]], [[5.0, 5.0, 5.0]])
+        self.assertFalse(record.is_unchanged_view_of(self.cache))
+        self.assertTrue(ParticleRecord(
+            self.uids[0], 0, self.cache).is_unchanged_view_of(self.cache))
+
+    def test_to_particle(self):
+        record = ParticleRecord(self.uids[1], 1, self.cache)
+
+        particle = record.to_particle()
+
+        self.assertIs(type(particle), Particle)
+        self.assertEqual(particle.uid, record.uid)
+        self.assertEqual(particle.coordinates, record.coordinates)
+        self.assertEqual(particle.data, record.data)
+
+        # the particle can be changed
+        particle.data[CUBA.VELOCITY] = (1.0, 1.0, 1.0)
+        self.assertEqual(record.data[CUBA.VELOCITY], (0.1, 0.0, 0.0))
+
+    def test_pickle(self):
+        record = ParticleRecord(self.uids[1], 1, self.cache)
+
+        particle = pickle.loads(pickle.dumps(record))
+
+        self.assertIs(type(particle), Particle)
+        self.assertEqual(particle.uid, record.uid)
+        self.assertEqual(particle.coordinates, record.coordinates)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,19 +1,25 @@
+import numpy
+
 from simphony.api import CUDS
 from simphony.core import CUBA
 from simphony.cuds.meta.api import Material
 from simphony.cuds.particles import Particle, Particles
 
+from .lammps_columnar_data_handler import LammpsColumnarDataHandler
 from .lammps_data_file_parser import LammpsDataFileParser
 from .lammps_data_file_writer import LammpsDataFileWriter
 from .lammps_data_line_interpreter import LammpsDataLineInterpreter
 from .lammps_simple_data_handler import LammpsSimpleDataHandler
 from ..common.atom_style import (AtomStyle, get_atom_style)
+from ..columnar_particles import ColumnarParticles
 from ..common.atom_style_description import ATOM_STYLE_DESCRIPTIONS
-from ..common.utils import create_material_to_atom_type_map
+from ..common.atom_style_layout import get_atom_style_layout
+from ..common.utils import (create_material_to_atom_type_map,
+                            MaterialLookupTable)
 from ..config.domain import get_box
 
 
-def read_data_file(filename, atom_style=None, name=None):
+def read_data_file(filename, atom_style=None, name=None, columnar=False):
     """ Reads LAMMPS data file and create CUDS objects
 
     Reads LAMMPS data file and create a Particles and CUDS. The CUDS
@@ -34,6 +40,10 @@ def read_data_file(filename, atom_style=None, name=None):
     name : str, optional
         name to be given to returned Particles.  If None, then filename is
         used.
+    columnar : bool, optional
+        If True, then the returned particles are a ColumnarParticles which
+        is backed by the arrays read from file (Particle objects are only
+        created when needed).
 
     Returns
     -------
@@ -43,7 +53,8 @@ def read_data_file(filename, atom_style=None, name=None):
         SD containing materials
 
     """
-    handler = LammpsSimpleDataHandler()
+    handler = LammpsColumnarDataHandler() if columnar \
+        else LammpsSimpleDataHandler()
     parser = LammpsDataFileParser(handler=handler)
 
     parser.parse(filename)
@@ -56,8 +67,6 @@ def read_data_file(filename, atom_style=None, name=None):
 
     types = (atom_t for atom_t in
              range(1, handler.get_number_atom_types() + 1))
-    atoms = handler.get_atoms()
-    velocities = handler.get_velocities()
     masses = handler.get_masses()
 
     box_origin = handler.get_box_origin()
@@ -83,30 +92,80 @@ def read_data_file(filename, atom_style=None, name=None):
         material.data[CUBA.MASS] = mass
         statedata.update([material])
 
-    def convert_atom_type_to_material(atom_type):
-        return type_to_material_map[atom_type]
+    material_table = MaterialLookupTable(type_to_material_map)
+
+    box_data = {CUBA.ORIGIN: box_origin,
+                CUBA.VECTOR: box_vectors}
+
+    if columnar:
+        particles = _create_columnar_particles(
+            handler,
+            atom_style,
+            name=name if name else filename,
+            material_table=material_table)
+        particles.data = box_data
+        return particles, statedata
+
+    atoms = handler.get_atoms()
+    velocities = handler.get_velocities()
 
-    interpreter = LammpsDataLineInterpreter(atom_style,
-                                            convert_atom_type_to_material)
+    interpreter = LammpsDataLineInterpreter(atom_style, material_table)
 
     # create particles
     particles = Particles(name=name if name else filename)
     data = particles.data
-    data.update({CUBA.ORIGIN: box_origin,
-                 CUBA.VECTOR: box_vectors})
+    data.update(box_data)
     particles.data = data
 
-    # add each particle
+    # add all particles
+    new_particles = []
     for lammps_id, values in atoms.iteritems():
         coordinates, data = interpreter.convert_atom_values(values)
         data.update(interpreter.convert_velocity_values(velocities[lammps_id]))
 
-        p = Particle(coordinates=coordinates, data=data)
-        particles.add([p])
+        new_particles.append(Particle(coordinates=coordinates, data=data))
+    particles.add(new_particles)
 
     return particles, statedata
 
 
+def _create_columnar_particles(handler,
+                               atom_style,
+                               name,
+                               material_table):
+    """ Create ColumnarParticles from the arrays of a columnar handler
+
+    Parameters
+    ----------
+    handler : LammpsColumnarDataHandler
+        handler containing the parsed data
+    atom_style : AtomStyle
+        style of atoms in the file
+    name : str
+        name of the particles
+    material_table : MaterialLookupTable
+        converts from atom_type to material
+
+    """
+    layout = get_atom_style_layout(atom_style)
+    atom_values = handler.get_atom_values()
+    velocity_values = handler.get_velocity_values()
+
+    columns = {CUBA.MATERIAL_TYPE: atom_values[:, 0].astype(numpy.int32)}
+    layout.extract_columns(layout.atom_columns, atom_values, columns)
+    if velocity_values is not None:
+        layout.extract_columns(layout.velocity_columns,
+                               velocity_values,
+                               columns)
+
+    offset = layout.coordinates_offset
+    return ColumnarParticles(
+        name=name,
+        coordinates=atom_values[:, offset:offset + 3],
+        data_columns=columns,
+        material_table=material_table)
+
+
 def write_data_file(filename,
                     particles,
                     state_data,
@@ -0,0 +1,139 @@
+import numpy
+
+
+class LammpsColumnarDataHandler(object):
+    """  Class to handle what is parsed by LammpsDataFileParser
+
+        Class stores the parsed atoms and velocities as arrays (i.e. one
+        row per atom, ordered by the lammps atom-id) instead of as
+        a dictionary of lists (see LammpsSimpleDataHandler).
+    """
+    def __init__(self):
+        self.begin()
+
+    def begin(self):
+        """ Handle begin of file parsing
+
+        """
+        # Clear/prepare cache of data
+        self._number_types = None
+        self._masses = {}
+        self._box_origin = None
+        self._box_vectors = None
+        self._atom_type = None
+        self._atom_ids = []
+        self._atom_rows = []
+        self._velocity_ids = []
+        self._velocity_rows = []
+        self._atom_values = None
+        self._velocity_values = None
+
+    def end(self):
+        """ Handle end of file parsing
+
+        Converts the parsed atom and velocity lines to arrays
+
+        """
+        atom_ids = numpy.array(self._atom_ids, dtype=numpy.int64)
+        order = numpy.argsort(atom_ids, kind="mergesort")
+        self._atom_ids = atom_ids[order]
+        self._atom_values = _to_array(self._atom_rows)[order]
+        self._atom_rows = []
+
+        if self._velocity_rows:
+            velocity_ids = numpy.array(self._velocity_ids, dtype=numpy.int64)
+            order = numpy.argsort(velocity_ids, kind="mergesort")
+            if not numpy.array_equal(velocity_ids[order], self._atom_ids):
+                raise RuntimeError(
+                    "Velocities do not match the atoms of the file")
+            self._velocity_values = _to_array(self._velocity_rows)[order]
+        self._velocity_ids = []
+        self._velocity_rows = []
+
+    def process_number_atom_types(self, number_types):
+        self._number_types = number_types
+
+    def get_number_atom_types(self):
+        return self._number_types
+
+    def process_masses(self, id, value):
+        self._masses[id] = value
+
+    def get_masses(self):
+        return self._masses
+
+    def process_box_origin(self, values):
+        self._box_origin = values
+
+    def get_box_origin(self):
+        return self._box_origin
+
+    def process_box_vectors(self, values):
+        self._box_vectors = values
+
+    def get_box_vectors(self):
+        return self._box_vectors
+
+    def process_atom_type(self, atom_type):
+        self._atom_type = atom_type
+
+    def get_atom_type(self):
+        ''' Returns atom type
+
+         Returns
+         -------
+         atom_type : string
+            Atom type.  None if atom type is not known
+        '''
+        return self._atom_type
+
+    def process_atoms(self, id, values):
+        self._atom_ids.append(id)
+        self._atom_rows.append(values)
+
+    def get_atom_ids(self):
+        """ Returns the atom ids (sorted) as an array
+
+        """
+        return self._atom_ids
+
+    def get_atom_values(self):
+        """ Returns the values of each atom line
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, k) array (ordered by atom id) of the values of the atom
+            lines without atom-id (i.e. atom-type, x, y, z, ...)
+
+        """
+        return self._atom_values
+
+    def process_velocities(self, id, values):
+        self._velocity_ids.append(id)
+        self._velocity_rows.append(values)
+
+    def get_velocity_values(self):
+        """ Returns the values of each velocity line
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, k) array (ordered by atom id) of the values of the velocity
+            lines without atom-id or None if there were no velocities.
+
+        """
+        return self._velocity_values
+
+
+def _to_array(rows):
+    """ Convert list of rows to a 2d-array
+
+    Rows can have a different number of values (e.g. the optional image
+    flags of atom lines) so only the columns which all rows have are kept.
+
+    """
+    number_columns = min(len(row) for row in rows) if rows else 0
+    return numpy.array([row[:number_columns] for row in rows],
+                       dtype=numpy.float64).reshape((len(rows),
+                                                     number_columns))
@@ -3,9 +3,8 @@ import time
 import numpy
 
 from simphony.core.cuba import CUBA
-from simphony.core.keywords import KEYWORDS
 
-from ..common.atom_style_description import ATOM_STYLE_DESCRIPTIONS
+from ..common.atom_style_layout import get_atom_style_layout
 from ..common.atom_style import get_lammps_string
 
 
@@ -42,6 +41,7 @@ class LammpsDataFileWriter(object):
                  ):
         self._file = open(filename, 'w')
         self._atom_style = atom_style
+        self._layout = get_atom_style_layout(atom_style)
         self._material_to_atom_type = material_to_atom_type
         self._number_atoms = number_atoms
         self._written_atoms = 0
@@ -103,46 +103,92 @@ class LammpsDataFileWriter(object):
         lammps_id = self._written_atoms
         atom_type = self._material_to_atom_type[
             particle.data[CUBA.MATERIAL_TYPE]]
+        layout = self._layout
 
-        # first comes 'id' and 'type'
-        atom_line = '{0} {1}'.format(lammps_id, atom_type)
+        # first comes 'id' and 'type', then everything that is specific
+        # to this atom_style, then the coordinates and some meta-information
+        atom_values = [lammps_id, atom_type]
+        atom_values.extend(layout.flatten_values(layout.atom_columns,
+                                                 particle.data))
+        atom_values.extend(particle.coordinates[0:3])
+        atom_values.append(particle.uid)
+        self._file.write(layout.atom_line_format.format(*atom_values))
 
-        # then write everything that is specific to this atom_style
-        atom_description = ATOM_STYLE_DESCRIPTIONS[self._atom_style]
-        for info in atom_description.attributes:
-            value = info.convert_from_cuba(particle.data[info.cuba_key]) \
-                if info.convert_from_cuba else particle.data[info.cuba_key]
+        # save velocity line which will be written later
+        velocity_values = [lammps_id]
+        velocity_values.extend(layout.flatten_values(layout.velocity_columns,
+                                                     particle.data))
+        self._velocity_lines.append(
+            layout.velocity_line_format.format(*velocity_values))
 
-            atom_line += ' {}'.format(format_cuba_value(value,
-                                                        info.cuba_key))
+        self._write_velocities_if_complete()
 
-        # then write the coordinates
-        coordinates = format_cuba_value(particle.coordinates,
-                                        CUBA.VELOCITY)  # using similar type
-        atom_line += ' {} 0 0 0'.format(coordinates)
+        return lammps_id
 
-        # add some meta-information
-        atom_line += " # uid:'{}'\n".format(particle.uid)
+    def write_atoms(self, coordinates, data_columns, uids):
+        """ Write atoms given as arrays
 
-        self._file.write(atom_line)
+        The atoms are written as by write_atom but without creating
+        a Particle for each atom.
 
-        # save velocity line which will be written later
-        velocity_line = '{0}'.format(lammps_id)
-        for info in atom_description.velocity_attributes:
-            value = info.convert_from_cuba(particle.data[info.cuba_key]) \
-                if info.convert_from_cuba else particle.data[info.cuba_key]
+        Parameters
+        ---------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each atom
+        data_columns : dict
+            map from CUBA key to an array with the value of each atom
+            (containing required info for atom_type)
+        uids : list of uuid.UUID
+            uid of each atom
+
+        Returns
+        -------
+        lammps_ids : list of int
+            id used by lammps in file of each atom
+
+        """
+        if not uids:
+            return []
+
+        first_id = self._written_atoms + 1
+        self._written_atoms += len(uids)
+
+        if self._written_atoms > self._number_atoms:
+            raise RuntimeError("Trying to write more atoms than expected")
+
+        lammps_ids = range(first_id, self._written_atoms + 1)
+        atom_types = [self._material_to_atom_type[material]
+                      for material in data_columns[CUBA.MATERIAL_TYPE]]
+        layout = self._layout
+
+        atom_columns = [lammps_ids, atom_types]
+        atom_columns.extend(layout.flatten_columns(layout.atom_columns,
+                                                   data_columns))
+        atom_columns.extend(numpy.asarray(coordinates)[:, :3].T.tolist())
+        atom_columns.append(uids)
+        self._file.writelines(layout.atom_line_format.format(*values)
+                              for values in zip(*atom_columns))
+
+        velocity_columns = [lammps_ids]
+        velocity_columns.extend(layout.flatten_columns(
+            layout.velocity_columns, data_columns))
+        self._velocity_lines.extend(
+            layout.velocity_line_format.format(*values)
+            for values in zip(*velocity_columns))
 
-            velocity_line += ' {}'.format(
-                format_cuba_value(value, info.cuba_key))
-        self._velocity_lines.append(velocity_line + '\n')
+        self._write_velocities_if_complete()
 
+        return lammps_ids
+
+    def _write_velocities_if_complete(self):
+        """ Write the (saved) velocity lines once all atoms are written
+
+        """
         if self._written_atoms == self._number_atoms:
             self._file.write("\nVelocities\n\n")
             self._file.writelines(self._velocity_lines)
             self._file.write("\n")
 
-        return lammps_id
-
     def close(self):
         self._file.close()
         if self._written_atoms != self._number_atoms:
@@ -151,24 +197,3 @@ class LammpsDataFileWriter(object):
                     self._number_atoms,
                     self._written_atoms))
 
-
-def format_number(value, dtype):
-    if dtype == numpy.float64:
-        return '{0:.16e}'.format(value)
-    else:
-        return '{}'.format(value)
-
-
-def format_cuba_value(cuba_value, cuba_key):
-    keyword = KEYWORDS[cuba_key.name]
-
-    shape = keyword.shape
-    dtype = keyword.dtype
-    if shape == [1]:
-        return format_number(cuba_value, dtype)
-    elif shape == [3]:
-        return '{} {} {}'.format(format_number(cuba_value[0], dtype),
-                                 format_number(cuba_value[1], dtype),
-                                 format_number(cuba_value[2], dtype))
-    else:
-        raise RuntimeError("Unsupported shape: ".format(shape))
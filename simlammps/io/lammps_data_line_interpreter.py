@@ -1,7 +1,7 @@
 from simphony.core.cuba import CUBA
-from simphony.core.keywords import KEYWORDS
 
-from ..common.atom_style_description import ATOM_STYLE_DESCRIPTIONS
+from ..common.atom_style_layout import (AtomStyleLayout,
+                                        get_atom_style_layout)
 
 
 class LammpsDataLineInterpreter(object):
@@ -43,6 +43,7 @@ class LammpsDataLineInterpreter(object):
     """
     def __init__(self, atom_style, convert_atom_type_to_material):
         self._atom_style = atom_style
+        self._layout = get_atom_style_layout(atom_style)
         self._convert_atom_type_to_material = convert_atom_type_to_material
 
     def convert_atom_values(self, values):
@@ -66,14 +67,12 @@ class LammpsDataLineInterpreter(object):
         cuba_values = {CUBA.MATERIAL_TYPE:
                        self._convert_atom_type_to_material(values[0])}
 
-        index = 1
-        for value_info in ATOM_STYLE_DESCRIPTIONS[self._atom_style].attributes:
-            cuba_values[value_info.cuba_key], index = \
-                LammpsDataLineInterpreter.process_value(value_info,
-                                                        values,
-                                                        index)
+        AtomStyleLayout.extract_values(self._layout.atom_columns,
+                                       values,
+                                       cuba_values)
 
         # coordinates come next
+        index = self._layout.coordinates_offset
         coordinates = tuple(values[index:index+3])
 
         return coordinates, cuba_values
@@ -93,52 +92,8 @@ class LammpsDataLineInterpreter(object):
 
         """
 
-        index = 0
         cuba_velocity_values = {}
-        atom_style_description = ATOM_STYLE_DESCRIPTIONS[self._atom_style]
-        for value_info in atom_style_description.velocity_attributes:
-            cuba_velocity_values[value_info.cuba_key], index = \
-                LammpsDataLineInterpreter.process_value(value_info,
-                                                        values,
-                                                        index)
-
+        AtomStyleLayout.extract_values(self._layout.velocity_columns,
+                                       values,
+                                       cuba_velocity_values)
         return cuba_velocity_values
-
-    @staticmethod
-    def process_value(value_info, values, index):
-        """ return cuba value and updated index
-
-        Parameters
-        ----------
-        value_info : ValueInfo
-            information on value info
-        values : list of numbers
-            values to be processed
-        index : int
-            starting index of values to be processed
-
-        Returns:
-        --------
-        cuba_value : CUBA
-            value in correct cuba form (e.g. type)
-        index : int
-            incremented index (i.e. incremented pass this value)
-
-        """
-        keyword = KEYWORDS[value_info.cuba_key.name]
-
-        # TODO we are assuming that we only have a single
-        # -dimension array (e.g. shape is [1] or [3]
-        # instead of shape being something like a [2, 3] matrix)
-        shape = keyword.shape
-        if shape == [1]:
-            cuba_value = values[index]
-            index += 1
-        else:
-            cuba_value = tuple(values[index:index+shape[0]])
-            index += shape[0]
-
-        if value_info.convert_to_cuba:
-            cuba_value = value_info.convert_to_cuba(cuba_value)
-
-        return cuba_value, index
@@ -0,0 +1,395 @@
+""" LAMMPS dump file reader
+
+This module provides a way to read trajectories written by the
+lammps command `dump custom` frame by frame
+"""
+import gzip
+
+import numpy
+
+from simphony.core.cuba import CUBA
+from simphony.cuds.particles import Particle, Particles
+
+
+# columns of a dump file which hold integer values
+_INTEGER_COLUMNS = frozenset(["id", "mol", "proc", "procp1", "type",
+                              "ix", "iy", "iz"])
+
+# columns (in order of preference) holding the coordinates of an atom
+_COORDINATE_COLUMNS = [("x", "y", "z"),
+                       ("xu", "yu", "zu")]
+
+_VELOCITY_COLUMNS = ("vx", "vy", "vz")
+
+
+class LammpsDumpFileReader(object):
+    """  Class reads Lammps dump files (produced by lammps command
+    `dump custom`) one frame at a time.
+
+    The file is never read completely into memory. Each iteration over
+    the reader streams over the file and yields one DumpFrame per
+    snapshot. While streaming, the byte-offset of each frame is recorded
+    so that, once the file has been passed through, any frame can be
+    directly accessed with get_frame.
+
+    Files ending with '.gz' are read as gzip-compressed files.
+
+    A dump file looks like the following::
+
+        ITEM: TIMESTEP
+        100
+        ITEM: NUMBER OF ATOMS
+        2
+        ITEM: BOX BOUNDS pp pp pp
+        0.0 10.0
+        0.0 10.0
+        0.0 10.0
+        ITEM: ATOMS id type x y z vx vy vz
+        1 1 1.0 1.0 1.0 0.0 0.0 0.0
+        2 1 2.0 2.0 2.0 0.0 0.0 0.0
+
+    Parameters
+    ----------
+    filename : str
+        filename of lammps dump file
+    sort_by_id : bool, optional
+        if True (and the dump contains an 'id' column), the atoms of each
+        frame are sorted by their lammps id.
+
+    """
+    def __init__(self, filename, sort_by_id=True):
+        self._filename = filename
+        self._sort_by_id = sort_by_id
+
+        # byte-offset of each frame (complete once a pass has finished)
+        self._offsets = []
+        self._index_complete = False
+
+    def __iter__(self):
+        return self.iter_frames()
+
+    def iter_frames(self):
+        """ Iterate over all frames of the file
+
+        Yields
+        ------
+        frame : DumpFrame
+
+        """
+        with self._open() as f:
+            offsets = []
+            while True:
+                offset = f.tell()
+                frame = self._read_frame(f)
+                if frame is None:
+                    break
+                offsets.append(offset)
+                yield frame
+        self._offsets = offsets
+        self._index_complete = True
+
+    def number_of_frames(self):
+        """ Return the number of frames in the file
+
+        """
+        self._build_index()
+        return len(self._offsets)
+
+    def get_frame(self, index):
+        """ Return frame number 'index'
+
+        The frame-offset index is built (with a single pass over the
+        file) when it is not yet known.
+
+        Parameters
+        ----------
+        index : int
+            index of frame (negative values count from the last frame)
+
+        Raises
+        ------
+        IndexError
+            if there is no frame with such index
+
+        """
+        self._build_index()
+        offset = self._offsets[index]
+        with self._open() as f:
+            f.seek(offset)
+            return self._read_frame(f)
+
+    def _build_index(self):
+        """ Build frame-offset index (if not already built)
+
+        Only the headers of each frame are interpreted, the atom-lines
+        are skipped.
+
+        """
+        if self._index_complete:
+            return
+
+        offsets = []
+        with self._open() as f:
+            while True:
+                offset = f.tell()
+                header = _read_header(f)
+                if header is None:
+                    break
+                for _ in xrange(header.number_of_atoms):
+                    f.readline()
+                offsets.append(offset)
+        self._offsets = offsets
+        self._index_complete = True
+
+    def _open(self):
+        if self._filename.endswith(".gz"):
+            return gzip.open(self._filename, 'rb')
+        else:
+            return open(self._filename, 'rb')
+
+    def _read_frame(self, f):
+        """ Read the next frame from file
+
+        Returns
+        -------
+        frame : DumpFrame
+            read frame or None if the end of the file is reached
+
+        """
+        header = _read_header(f)
+        if header is None:
+            return None
+
+        number_columns = len(header.columns)
+        lines = [f.readline() for _ in xrange(header.number_of_atoms)]
+        values = numpy.array(b" ".join(lines).split(), dtype=numpy.float64)
+        if values.size != header.number_of_atoms * number_columns:
+            raise RuntimeError(
+                "Frame at timestep {} of '{}' is incomplete".format(
+                    header.timestep, self._filename))
+        values = values.reshape((header.number_of_atoms, number_columns))
+
+        if self._sort_by_id and "id" in header.columns:
+            order = numpy.argsort(values[:, header.columns.index("id")],
+                                  kind="mergesort")
+            values = values[order]
+
+        return DumpFrame(header, values)
+
+
+class DumpFrame(object):
+    """  A single snapshot of a lammps dump file
+
+    The per-atom values are kept as columns (numpy arrays) which can be
+    accessed by the name used in the dump file (e.g. frame['vx']).
+
+    Attributes
+    ----------
+    timestep : int
+        timestep of the snapshot
+    number_of_atoms : int
+        number of atoms in the snapshot
+    columns : list of str
+        names of the per-atom columns (as written in the dump file)
+    box_bounds : list of tuple
+        (lo, hi) bounds for each dimension
+    box_tilt : tuple of float
+        (xy, xz, yz) tilt factors or None for orthogonal boxes
+    boundary : list of str
+        lammps boundary flags for each dimension (e.g. 'pp')
+
+    """
+    def __init__(self, header, values):
+        self.timestep = header.timestep
+        self.number_of_atoms = header.number_of_atoms
+        self.columns = header.columns
+        self.box_bounds = header.box_bounds
+        self.box_tilt = header.box_tilt
+        self.boundary = header.boundary
+        self._values = values
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def __getitem__(self, column):
+        """ Return the values of a column
+
+        Integer columns (e.g. 'id', 'type') are returned as integer arrays
+
+        """
+        try:
+            values = self._values[:, self.columns.index(column)]
+        except ValueError:
+            raise KeyError("Column '{}' is not in the frame".format(column))
+        if column in _INTEGER_COLUMNS:
+            return values.astype(numpy.int64)
+        return values
+
+    def get_columns(self, columns):
+        """ Return an (N, k) array of the given columns
+
+        Parameters
+        ----------
+        columns : sequence of str
+            names of columns
+
+        """
+        try:
+            indices = [self.columns.index(column) for column in columns]
+        except ValueError:
+            raise KeyError(
+                "Columns '{}' are not all in the frame".format(columns))
+        return self._values[:, indices]
+
+    def get_coordinates(self):
+        """ Return an (N, 3) array of the (unscaled) coordinates
+
+        Raises
+        ------
+        KeyError
+            if the frame does not contain any coordinates
+
+        """
+        for names in _COORDINATE_COLUMNS:
+            if all(name in self.columns for name in names):
+                return self.get_columns(names)
+
+        if all(name in self.columns for name in ("xs", "ys", "zs")):
+            if self.box_tilt:
+                raise RuntimeError(
+                    "Scaled coordinates of non-orthogonal boxes "
+                    "are not supported")
+            lo = numpy.array([bound[0] for bound in self.box_bounds])
+            hi = numpy.array([bound[1] for bound in self.box_bounds])
+            return lo + self.get_columns(("xs", "ys", "zs")) * (hi - lo)
+
+        raise KeyError("Frame does not contain coordinates")
+
+    def get_velocities(self):
+        """ Return an (N, 3) array of the velocities
+
+        """
+        return self.get_columns(_VELOCITY_COLUMNS)
+
+    def get_box_origin(self):
+        return tuple(bound[0] for bound in self.box_bounds)
+
+    def get_box_vectors(self):
+        if self.box_tilt:
+            raise RuntimeError(
+                "Non-orthogonal simulation boxes are not supported")
+        diffs = [bound[1] - bound[0] for bound in self.box_bounds]
+        return [(diffs[0], 0.0, 0.0),
+                (0.0, diffs[1], 0.0),
+                (0.0, 0.0, diffs[2])]
+
+    def get_particles(self, name=None, convert_atom_type_to_material=None):
+        """ Return the frame as Particles
+
+        Each atom is given a Particle with the coordinates, velocity
+        (if the frame contains velocities) and material type (if
+        'convert_atom_type_to_material' is given).
+
+        Parameters
+        ----------
+        name : str, optional
+            name to be given to the returned Particles. If None, then
+            the name is based on the timestep.
+        convert_atom_type_to_material : function, optional
+            converts from atom_type to material
+
+        Returns
+        -------
+        particles : Particles
+
+        """
+        particles = Particles(
+            name=name if name else "timestep_{}".format(self.timestep))
+        data = particles.data
+        data.update({CUBA.ORIGIN: self.get_box_origin(),
+                     CUBA.VECTOR: self.get_box_vectors()})
+        particles.data = data
+
+        coordinates = self.get_coordinates().tolist()
+        velocities = self.get_velocities().tolist() \
+            if all(name in self.columns for name in _VELOCITY_COLUMNS) \
+            else None
+        types = self["type"].tolist() \
+            if convert_atom_type_to_material and "type" in self.columns \
+            else None
+
+        new_particles = []
+        for index, coordinate in enumerate(coordinates):
+            p = Particle(coordinates=tuple(coordinate))
+            if velocities is not None:
+                p.data[CUBA.VELOCITY] = tuple(velocities[index])
+            if types is not None:
+                p.data[CUBA.MATERIAL_TYPE] = \
+                    convert_atom_type_to_material(types[index])
+            new_particles.append(p)
+        particles.add(new_particles)
+
+        return particles
+
+
+class _FrameHeader(object):
+    """ Header information of a frame
+
+    """
+    def __init__(self):
+        self.timestep = None
+        self.number_of_atoms = 0
+        self.box_bounds = []
+        self.box_tilt = None
+        self.boundary = []
+        self.columns = []
+
+
+def _read_header(f):
+    """ Read the header (all items until the atom-lines) of a frame
+
+    Returns
+    -------
+    header : _FrameHeader
+        header of frame or None if the end of the file is reached
+
+    """
+    header = _FrameHeader()
+    while True:
+        line = f.readline()
+        if not line:
+            if header.timestep is None:
+                return None
+            raise RuntimeError("Unexpected end of dump file")
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith(b"ITEM:"):
+            raise RuntimeError(
+                "Unexpected line in dump file: '{}'".format(line))
+
+        item = line[len(b"ITEM:"):].strip().decode("ascii")
+        if item.startswith("TIMESTEP"):
+            header.timestep = int(f.readline())
+        elif item.startswith("NUMBER OF ATOMS"):
+            header.number_of_atoms = int(f.readline())
+        elif item.startswith("BOX BOUNDS"):
+            flags = item.split()[2:]
+            if len(flags) == 6:
+                # triclinic, e.g. "BOX BOUNDS xy xz yz pp pp pp"
+                header.boundary = flags[3:]
+                bounds = [map(float, f.readline().split())
+                          for _ in xrange(3)]
+                header.box_tilt = tuple(bound[2] for bound in bounds)
+                header.box_bounds = [(bound[0], bound[1])
+                                     for bound in bounds]
+            else:
+                header.boundary = flags
+                header.box_bounds = [tuple(map(float, f.readline().split()))
+                                     for _ in xrange(3)]
+        elif item.startswith("ATOMS"):
+            header.columns = item.split()[1:]
+            return header
+        else:
+            # unknown items (e.g. 'UNITS', 'TIME') hold a single value
+            f.readline()
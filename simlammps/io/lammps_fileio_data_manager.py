@@ -1,41 +1,23 @@
 import os
 
+import numpy
+
 from simphony.core.cuba import CUBA
 from simphony.core.data_container import DataContainer
-from simphony.cuds.particles import Particle, Particles
 
+from .lammps_columnar_data_handler import LammpsColumnarDataHandler
 from .lammps_data_file_parser import LammpsDataFileParser
 from .lammps_data_file_writer import LammpsDataFileWriter
-from .lammps_data_line_interpreter import LammpsDataLineInterpreter
-from .lammps_simple_data_handler import LammpsSimpleDataHandler
+from .particle_columns import ParticleColumns
 from ..abc_data_manager import ABCDataManager
 from ..common.atom_style_description import (ATOM_STYLE_DESCRIPTIONS,
                                              get_all_cuba_attributes)
-from ..common.utils import create_material_to_atom_type_map
+from ..common.atom_style_layout import get_atom_style_layout
+from ..common.utils import (create_material_to_atom_type_map,
+                            MaterialLookupTable)
 from ..config.domain import get_box
 
 
-def _filter_unsupported_data(iterable, supported_cuba):
-    """Ensure iterators only provide particles with only supported data
-
-    Parameters
-    ----------
-    iterable : iterator of Particles
-        iterable of particles
-    supported_cuba: list of CUBA
-        what cuba is supported
-
-    """
-    for particle in iterable:
-        data = particle.data
-        supported_data = {cuba: data[cuba] for cuba in
-                          data if cuba in supported_cuba}
-        supported_particle = Particle(coordinates=particle.coordinates,
-                                      uid=particle.uid,
-                                      data=supported_data)
-        yield supported_particle
-
-
 class LammpsFileIoDataManager(ABCDataManager):
     """  Class managing Lammps data information using file-io
 
@@ -44,9 +26,10 @@ class LammpsFileIoDataManager(ABCDataManager):
     data existing in Lammps (via lammps data file) and allows this data to be
     queried and to be changed.
 
-    Class maintains a cache of the particle information. This information
-    is read from file whenever the read() method is called and written to
-    the file whenever the flush() method is called.
+    Class maintains a cache of the particle information (stored as arrays,
+    see ParticleColumns). This information is read from file whenever the
+    read() method is called and written to the file whenever the flush()
+    method is called.
 
     Parameters
     ----------
@@ -63,12 +46,17 @@ class LammpsFileIoDataManager(ABCDataManager):
 
         self._atom_style = atom_style
 
-        # map from lammps-id to simphony-uid
-        self._lammpsid_to_uid = {}
+        # name of container and uids of the particles written to the
+        # data-file (in the order of the lammps-ids)
+        self._written_particles = []
 
         # cache of particle containers
         self._pc_cache = {}
 
+        # simulation box of the particle containers (None if it needs to
+        # be recomputed from the data of the containers)
+        self._box = None
+
         self._supported_cuba = get_all_cuba_attributes(self._atom_style)
 
     def get_data(self, uname):
@@ -92,6 +80,7 @@ class LammpsFileIoDataManager(ABCDataManager):
 
         """
         self._pc_cache[uname].data = DataContainer(data)
+        self._box = None
 
     def _handle_delete_particles(self, uname):
         """Handle when a Particles is deleted
@@ -103,6 +92,7 @@ class LammpsFileIoDataManager(ABCDataManager):
 
         """
         del self._pc_cache[uname]
+        self._box = None
 
     def _handle_new_particles(self, uname, particles):
         """Add new particle container to this manager.
@@ -116,18 +106,15 @@ class LammpsFileIoDataManager(ABCDataManager):
             particle container to be added
 
         """
-        # create stand-alone particle container to use
-        # as a cache of for input/output to LAMMPS
-        pc = Particles(name="_")
+        # create stand-alone cache of the particles to use
+        # for input/output to LAMMPS
+        pc = ParticleColumns(self._supported_cuba)
         pc.data = DataContainer(particles.data)
-
-        for p in particles.iter(item_type=CUBA.PARTICLE):
-            pc.add([p])
-
-        for b in particles.iter(item_type=CUBA.BOND):
-            pc.add([b])
+        pc.add_particles(particles.iter(item_type=CUBA.PARTICLE),
+                         pc.data.get(CUBA.MATERIAL_TYPE))
 
         self._pc_cache[uname] = pc
+        self._box = None
 
     def get_particle(self, uid, uname):
         """Get particle
@@ -140,26 +127,21 @@ class LammpsFileIoDataManager(ABCDataManager):
             name of particle container
 
         """
-        return self._pc_cache[uname].get(uid)
+        return self._pc_cache[uname].get_particle(uid)
 
     def update_particles(self, iterable, uname):
         """Update particles
 
         """
-        self._pc_cache[uname].update(
-            _filter_unsupported_data(iterable, self._supported_cuba))
+        self._pc_cache[uname].update_particles(iterable,
+                                               self._get_material(uname))
 
     def add_particles(self, iterable, uname):
         """Add particles
 
         """
-        uids = self._pc_cache[uname].add(iterable)
-
-        # filter the cached particles of unsupported CUBA
-        self._pc_cache[uname].update(_filter_unsupported_data(
-            self._pc_cache[uname].iter(uids=uids), self._supported_cuba))
-
-        return uids
+        return self._pc_cache[uname].add_particles(iterable,
+                                                   self._get_material(uname))
 
     def remove_particle(self, uid, uname):
         """Remove particle
@@ -172,7 +154,7 @@ class LammpsFileIoDataManager(ABCDataManager):
             name of particle container
 
         """
-        self._pc_cache[uname].remove([uid])
+        self._pc_cache[uname].remove_particle(uid)
 
     def has_particle(self, uid, uname):
         """Has particle
@@ -197,7 +179,7 @@ class LammpsFileIoDataManager(ABCDataManager):
             uids is None then all particles will be iterated over.
 
         """
-        return self._pc_cache[uname].iter(uids=uids)
+        return self._pc_cache[uname].iter_particles(uids)
 
     def number_of_particles(self, uname):
         """Get number of particles in a container
@@ -208,7 +190,129 @@ class LammpsFileIoDataManager(ABCDataManager):
             non-changing unique name of particles
 
         """
-        return self._pc_cache[uname].count_of(CUBA.PARTICLE)
+        return len(self._pc_cache[uname])
+
+    def get_uids(self, uname):
+        """Get the uids of the particles of a container
+
+        Parameters
+        ----------
+        uname : string
+            non-changing unique name of particles
+
+        """
+        return self._pc_cache[uname].get_uids()
+
+    def get_coordinates(self, uname, uids=None):
+        """Get the coordinates of particles as an array
+
+        Parameters
+        ----------
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        pc = self._pc_cache[uname]
+        return pc.get_coordinates(pc.get_indices(uids))
+
+    def get_attribute(self, cuba_key, uname, uids=None):
+        """Get the values of a CUBA attribute of particles as an array
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        self._check_supported(cuba_key)
+        pc = self._pc_cache[uname]
+        return pc.get_attribute(cuba_key, pc.get_indices(uids))
+
+    def get_supported_attributes(self):
+        """Get the CUBA keys of the attributes of the particles
+
+        """
+        return list(self._supported_cuba)
+
+    def set_coordinates(self, coordinates, uname, uids=None):
+        """Set the coordinates of particles from an array
+
+        Parameters
+        ----------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        pc = self._pc_cache[uname]
+        pc.set_coordinates(pc.get_indices(uids, ValueError), coordinates)
+
+    def set_attribute(self, cuba_key, values, uname, uids=None):
+        """Set the values of a CUBA attribute of particles from an array
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        values : array_like
+            (N,) or (N, k) array with the value of each particle
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then the uids are in the order
+            given by get_uids.
+
+        """
+        self._check_supported(cuba_key)
+        pc = self._pc_cache[uname]
+        pc.set_attribute(cuba_key, pc.get_indices(uids, ValueError), values)
+
+    def add_from_arrays(self, coordinates, data_columns, uname, uids=None):
+        """Add particles given as arrays
+
+        Parameters
+        ----------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        data_columns : dict
+            map from CUBA key to an array with the value of each particle.
+            If CUBA.MATERIAL_TYPE is missing, the material of the particle
+            container is used. Other missing attributes of the atom style
+            (e.g. CUBA.VELOCITY) are set to zero.
+        uname : string
+            non-changing unique name of particles
+        uids : sequence of uuid.UUID, optional
+            uids of the particles. If None, then uids are generated.
+
+        """
+        return self._pc_cache[uname].add_arrays(coordinates,
+                                                data_columns,
+                                                uids,
+                                                self._get_material(uname))
+
+    def get_uids_of_lammps_ids(self):
+        """Get map from lammps atom id to particle uid
+
+        The map is valid for the data-file written by the last flush.
+
+        """
+        uids_of_lammps_ids = {}
+        for _, uids in self._written_particles:
+            first_id = len(uids_of_lammps_ids) + 1
+            uids_of_lammps_ids.update(enumerate(uids, first_id))
+        return uids_of_lammps_ids
 
     def flush(self, input_data_filename):
         """flush to file
@@ -237,57 +341,91 @@ class LammpsFileIoDataManager(ABCDataManager):
         """
         self._update_from_lammps(output_data_filename)
 
-    def _update_from_lammps(self, output_data_filename):
-        """read from file and update cache
+    def _get_material(self, uname):
+        """ Get the material of a particle container
 
-        """
-        assert os.path.isfile(output_data_filename)
+        Returns
+        -------
+        uuid.UUID
+            the material (CUBA.MATERIAL_TYPE) of the particle container or
+            None if the particle container has none
 
-        handler = LammpsSimpleDataHandler()
-        parser = LammpsDataFileParser(handler)
-        parser.parse(output_data_filename)
+        """
+        return self._pc_cache[uname].data.get(CUBA.MATERIAL_TYPE)
 
-        atom_type_to_material = {v: k for k, v
-                                 in self._material_to_atom.iteritems()}
+    def _check_supported(self, cuba_key):
+        """ Check that the CUBA attribute is supported
 
-        def convert_atom_type_to_material(atom_type):
-            return atom_type_to_material[atom_type]
+        Raises
+        ------
+        KeyError
+            if the attribute is not supported
 
-        interpreter = LammpsDataLineInterpreter(self._atom_style,
-                                                convert_atom_type_to_material)
+        """
+        if cuba_key not in self._supported_cuba:
+            raise KeyError(
+                "Attribute '{}' is not supported".format(cuba_key))
 
-        atoms = handler.get_atoms()
-        velocities = handler.get_velocities()
+    def _update_from_lammps(self, output_data_filename):
+        """read from file and update cache
 
-        assert(len(atoms) == len(velocities))
+        """
+        assert os.path.isfile(output_data_filename)
 
-        for lammps_id, values in atoms.iteritems():
-            uname, uid = self._lammpsid_to_uid[lammps_id]
-            cache_pc = self._pc_cache[uname]
-            p = cache_pc.get(uid)
-            p.coordinates, p.data = interpreter.convert_atom_values(values)
-            p.data.update(
-                interpreter.convert_velocity_values(velocities[lammps_id]))
+        handler = LammpsColumnarDataHandler()
+        parser = LammpsDataFileParser(handler)
+        parser.parse(output_data_filename)
 
-            cache_pc.update([p])
+        material_table = MaterialLookupTable(
+            {v: k for k, v in self._material_to_atom.iteritems()})
+
+        layout = get_atom_style_layout(self._atom_style)
+        atom_values = handler.get_atom_values()
+        velocity_values = handler.get_velocity_values()
+
+        offset = layout.coordinates_offset
+        coordinates = atom_values[:, offset:offset + 3]
+        columns = {CUBA.MATERIAL_TYPE: material_table.get_material_uids(
+            atom_values[:, 0].astype(numpy.int32))}
+        layout.extract_columns(layout.atom_columns, atom_values, columns)
+        if velocity_values is not None:
+            layout.extract_columns(layout.velocity_columns,
+                                   velocity_values,
+                                   columns)
+
+        # the atoms (ordered by lammps-id) of each container are
+        # a contiguous range of rows
+        lammps_ids = handler.get_atom_ids()
+        first_id = 1
+        for uname, uids in self._written_particles:
+            begin, end = numpy.searchsorted(lammps_ids,
+                                            [first_id, first_id + len(uids)])
+            rows = slice(begin, end)
+            pc = self._pc_cache[uname]
+            indices = pc.get_indices(
+                [uids[i] for i in lammps_ids[rows] - first_id])
+            pc.set_coordinates(indices, coordinates[rows])
+            for cuba_key, values in columns.iteritems():
+                pc.set_attribute(cuba_key, indices, values[rows])
+            first_id += len(uids)
 
     def _write_data_file(self, filename):
         """ Write data file containing current state of simulation
 
         """
-        # recreate (and store) map from lammps-id to simphony-id
-        self._lammpsid_to_uid = {}
+        self._written_particles = []
 
         # determine the number of particles
-        num_particles = sum(
-            pc.count_of(
-                CUBA.PARTICLE) for pc in self._pc_cache.itervalues())
+        num_particles = sum(len(pc) for pc in self._pc_cache.itervalues())
 
         # create the mapping from material to atom-type
         self._material_to_atom = create_material_to_atom_type_map(
             self._state_data)
 
-        box = get_box([pc.data for uid, pc in self._pc_cache.iteritems()])
+        if self._box is None:
+            self._box = get_box(
+                [pc.data for uid, pc in self._pc_cache.iteritems()])
+        box = self._box
 
         mass = self._get_mass() \
             if ATOM_STYLE_DESCRIPTIONS[self._atom_style].has_mass_per_type \
@@ -299,10 +437,20 @@ class LammpsFileIoDataManager(ABCDataManager):
                                       material_to_atom_type=mat_to_atom,
                                       simulation_box=box,
                                       material_type_to_mass=mass)
+
+        layout = get_atom_style_layout(self._atom_style)
+        cuba_keys = set([CUBA.MATERIAL_TYPE] + [
+            column.cuba_key for column
+            in layout.atom_columns + layout.velocity_columns])
         for uname, pc in self._pc_cache.iteritems():
-            for p in pc.iter(item_type=CUBA.PARTICLE):
-                lammps_id = writer.write_atom(p)
-                self._lammpsid_to_uid[lammps_id] = (uname, p.uid)
+            indices = pc.get_indices(None)
+            uids = pc.get_uids()
+            writer.write_atoms(
+                pc.get_coordinates(indices),
+                {cuba_key: pc.get_attribute(cuba_key, indices)
+                 for cuba_key in cuba_keys},
+                uids)
+            self._written_particles.append((uname, uids))
         writer.close()
 
     def _get_mass(self):
@@ -0,0 +1,152 @@
+""" LAMMPS log file reader
+
+This module provides functions to read the timing breakdown of the runs
+from a LAMMPS log file (or the screen output of LAMMPS).
+"""
+import re
+
+_LOOP_LINE = re.compile(
+    r"^Loop time of (\S+) on (\d+) procs(?: \([^)]*\))? for (\d+) steps "
+    r"with (\d+) atoms")
+
+# "Pair    | 0.61 | 0.62 | 0.65 | 1.2 | 65.3" (since LAMMPS 2016)
+# (the min/max columns of the "Other" section are blank)
+_SECTION_LINE = re.compile(r"^(\w+)\s*\|([^|]*)\|([^|]*)\|([^|]*)\|")
+
+# "Pair  time (%) = 0.62 (65.3)" (older versions)
+_OLD_SECTION_LINE = re.compile(r"^(\w+)\s+time \(%\) = (\S+) \(")
+
+# "Nlocal:    1000 ave 1200 max 800 min"
+_NLOCAL_LINE = re.compile(r"^Nlocal:\s+(\S+) ave (\S+) max (\S+) min")
+
+# older versions abbreviate some of the section names
+_SECTION_NAMES = {"Outpt": "Output"}
+
+
+class RunTiming(object):
+    """ Timing breakdown of one LAMMPS run
+
+    Parameters
+    ----------
+    loop_time : float
+        wall time of the run (in seconds)
+    number_processes : int
+        number of (MPI) processes
+    number_steps : int
+        number of steps of the run
+    number_atoms : int
+        number of atoms
+    sections : dict, optional
+        map from section (e.g. "Pair", "Neigh", "Comm") to the time spent
+        in it (averaged over the processes)
+    max_sections : dict, optional
+        map from section to the maximum time spent in it by one process.
+        Empty if the log does not report it.
+    local_atoms : tuple of float, optional
+        (average, maximum, minimum) number of atoms of a process at the
+        end of the run or None if the log does not report it
+
+    """
+    def __init__(self, loop_time, number_processes, number_steps,
+                 number_atoms, sections=None, max_sections=None,
+                 local_atoms=None):
+        self.loop_time = loop_time
+        self.number_processes = number_processes
+        self.number_steps = number_steps
+        self.number_atoms = number_atoms
+        self.sections = dict(sections or {})
+        self.max_sections = dict(max_sections or {})
+        self.local_atoms = local_atoms
+
+    @property
+    def imbalance_factor(self):
+        """ maximum over average number of atoms of a process (or None)
+
+        """
+        if not self.local_atoms or not self.local_atoms[0]:
+            return None
+        return self.local_atoms[1] / self.local_atoms[0]
+
+    def get_time(self, *sections):
+        """ Return the time spent in the sections
+
+        Parameters
+        ----------
+        sections : str
+            names of the sections (e.g. "Pair", "Neigh"). Sections which
+            are not reported count as 0.  If no section is given, the
+            loop time is returned.
+
+        """
+        if not sections:
+            return self.loop_time
+        return sum(self.sections.get(section, 0.0) for section in sections)
+
+
+def parse_run_timings(lines):
+    """ Parse the timing breakdowns of the runs in a LAMMPS log
+
+    Parameters
+    ----------
+    lines : iterable of str
+        lines of the log
+
+    Returns
+    -------
+    list of RunTiming
+        timing of each run (in order of the log)
+
+    """
+    timings = []
+    timing = None
+    for line in lines:
+        match = _LOOP_LINE.match(line)
+        if match:
+            timing = RunTiming(loop_time=float(match.group(1)),
+                               number_processes=int(match.group(2)),
+                               number_steps=int(match.group(3)),
+                               number_atoms=int(match.group(4)))
+            timings.append(timing)
+            continue
+
+        if timing is None:
+            continue
+
+        match = _NLOCAL_LINE.match(line)
+        if match:
+            timing.local_atoms = tuple(float(number)
+                                       for number in match.groups())
+            continue
+
+        match = _SECTION_LINE.match(line) or _OLD_SECTION_LINE.match(line)
+        if match:
+            name = _SECTION_NAMES.get(match.group(1), match.group(1))
+            try:
+                if match.re is _SECTION_LINE:
+                    timing.sections[name] = float(match.group(3))
+                    if match.group(4).strip():
+                        timing.max_sections[name] = float(match.group(4))
+                else:
+                    timing.sections[name] = float(match.group(2))
+            except ValueError:
+                # e.g. the header of the timing table
+                continue
+    return timings
+
+
+def read_run_timings(filename):
+    """ Read the timing breakdowns of the runs from a LAMMPS log file
+
+    Parameters
+    ----------
+    filename : str
+        name of the log file
+
+    Returns
+    -------
+    list of RunTiming
+        timing of each run (in order of the log)
+
+    """
+    with open(filename) as log_file:
+        return parse_run_timings(log_file)
@@ -4,8 +4,11 @@ This module provides a way to run the lammps or liggghts process
 """
 
 import os
+import re
 import subprocess
 
+from ..config.accelerator import get_available_styles
+
 
 class LammpsProcess(object):
     """ Class runs the lammps/liggghts program
@@ -17,29 +20,54 @@ class LammpsProcess(object):
     log_directory : str, optional
         name of directory of log file ('log.lammps') for lammps.
         If not given, then pwd is where 'log.lammps' will be written.
+    mpi_launcher : MpiLauncher, optional
+        if given, lammps is launched with MPI. As the input of MPI
+        programs cannot be relied on to be passed through stdin, the
+        commands are then written to an input file ('in.lammps' in the
+        log directory) which is passed with '-in'.
+    arguments : sequence of str, optional
+        additional command-line arguments of lammps (e.g. to enable
+        an accelerator package)
+    check : bool, optional
+        if True, lammps is started once (without commands) to check that
+        it runs. The check can be skipped when the launch is expensive
+        (e.g. a whole multi-partition world), in which case problems are
+        only reported by run.
 
     Raises
     ------
     RuntimeError
         if Lammps did not run correctly
     """
-    def __init__(self, lammps_name="lammps", log_directory=None):
+    def __init__(self, lammps_name="lammps", log_directory=None,
+                 mpi_launcher=None, arguments=None, check=True):
         self._lammps_name = lammps_name
+        self._mpi_launcher = mpi_launcher
+        self._arguments = list(arguments or [])
         self._returncode = 0
         self._stderr = ""
         self._stdout = ""
         if log_directory:
             self._log = os.path.join(log_directory, 'log.lammps')
+            self._input = os.path.join(log_directory, 'in.lammps')
         else:
             self._log = 'log.lammps'
+            self._input = 'in.lammps'
+
+        if check:
+            self._check()
+
+    def _check(self):
+        """ See if lammps can be started
 
-        # see if lammps can be started
+        """
         try:
             self.run(" ")
         except Exception:
             msg = "LAMMPS could not be started."
             if self._returncode == 127:
-                msg += " executable '{}' was not found.".format(lammps_name)
+                msg += " executable '{}' was not found.".format(
+                    self._get_arguments()[0])
             else:
                 msg += " stdout/err: " + self._stdout + " " + self._stderr
             raise RuntimeError(msg)
@@ -58,18 +86,131 @@ class LammpsProcess(object):
             if Lammps did not run correctly
         """
 
-        proc = subprocess.Popen(
-            [self._lammps_name, '-log', self._log], stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        self._stdout, self._stderr = proc.communicate(commands)
-        self._returncode = proc.returncode
+        if self._mpi_launcher:
+            self._run_mpi(commands)
+        else:
+            self._run_serial(commands)
+
+    def _run_serial(self, commands):
+        self._execute(commands)
 
         if self._returncode != 0 or self._stderr:
-            msg = "LAMMPS ('{}') did not run correctly. ".format(
-                self._lammps_name)
-            msg += "Error code: {} ".format(proc.returncode)
-            if self._stderr:
-                msg += "stderr: \'{}\n\' ".format(self._stderr)
-            if self._stdout:
-                msg += "stdout: \'{}\n\'".format(self._stdout)
+            raise RuntimeError(self._get_error_message())
+
+    def _run_mpi(self, commands):
+        with open(self._input, 'w') as input_file:
+            input_file.write(commands)
+
+        self._execute("")
+
+        # launchers can write (harmless) warnings to stderr so only the
+        # return code and the errors reported by lammps are checked
+        errors = get_rank_errors(self._stdout + "\n" + self._stderr)
+        if self._returncode != 0 or errors:
+            msg = self._get_error_message()
+            for rank, error in errors:
+                if rank is None:
+                    msg += "\nerror (all ranks): {}".format(error)
+                else:
+                    msg += "\nerror (rank {}): {}".format(rank, error)
             raise RuntimeError(msg)
+
+    def _execute(self, stdin_input):
+        """ Execute lammps and wait until it has finished
+
+        """
+        try:
+            proc = subprocess.Popen(
+                self._get_arguments(), stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError:
+            self._returncode = 127
+            raise RuntimeError(
+                "LAMMPS could not be started. executable '{}' was not "
+                "found.".format(self._get_arguments()[0]))
+        self._stdout, self._stderr = proc.communicate(stdin_input)
+        self._returncode = proc.returncode
+
+    def _get_arguments(self):
+        """ Return the command line which starts lammps
+
+        """
+        arguments = [self._lammps_name, '-log', self._log] + self._arguments
+        if self._mpi_launcher:
+            arguments += ['-in', self._input]
+            return self._mpi_launcher.get_command(arguments)
+        return arguments
+
+    def _get_error_message(self):
+        msg = "LAMMPS ('{}') did not run correctly. ".format(
+            self._lammps_name)
+        msg += "Error code: {} ".format(self._returncode)
+        if self._stderr:
+            msg += "stderr: \'{}\n\' ".format(self._stderr)
+        if self._stdout:
+            msg += "stdout: \'{}\n\'".format(self._stdout)
+        return msg
+
+
+_AVAILABLE_STYLES = {}
+
+
+def get_lammps_styles(lammps_name="lammps"):
+    """ Get the styles compiled into a LAMMPS executable
+
+    The styles are read from the help output ('lammps -h') once for each
+    executable.
+
+    Parameters
+    ----------
+    lammps_name : str
+        name of LAMMPS executable
+
+    Returns
+    -------
+    dict or None
+        map from style category (e.g. "pair") to set of styles or None if
+        the executable could not be run
+
+    """
+    try:
+        return _AVAILABLE_STYLES[lammps_name]
+    except KeyError:
+        pass
+
+    try:
+        proc = subprocess.Popen([lammps_name, '-h'], stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE)
+        stdout, _ = proc.communicate("")
+    except OSError:
+        return None
+
+    available_styles = get_available_styles(stdout)
+    _AVAILABLE_STYLES[lammps_name] = available_styles
+    return available_styles
+
+
+_ERROR_LINE = re.compile(r"^ERROR(?: on proc (\d+))?: (.*)$", re.MULTILINE)
+
+
+def get_rank_errors(output):
+    """ Get the errors reported by lammps
+
+    Lammps reports errors which occur on all ranks as "ERROR: ..." and
+    errors which occur on a single rank as "ERROR on proc N: ...".
+
+    Parameters
+    ----------
+    output : str
+        output of lammps
+
+    Returns
+    -------
+    list of tuple
+        (rank, message) of each error where rank is None if the error
+        occurred on all ranks
+
+    """
+    return [(int(rank) if rank else None, message.strip())
+            for rank, message in _ERROR_LINE.findall(output)]
@@ -0,0 +1,385 @@
+import uuid
+
+import numpy
+
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.core.keywords import KEYWORDS
+from simphony.cuds.particles import Particle
+
+
+class ParticleColumns(object):
+    """ Cache of the particles of a particle container stored as arrays
+
+    The coordinates and each (supported) CUBA attribute are stored as
+    arrays with one row per particle (in the order in which the particles
+    were added). The arrays grow as particles are added, so that whole
+    columns can be read and written without creating Particle objects.
+
+    Only the supported CUBA attributes are kept. A particle does not need
+    to have a value of every attribute (i.e. which rows of an attribute
+    have a value is tracked).
+
+    Parameters
+    ----------
+    supported_cuba : iterable of CUBA
+        CUBA attributes of the particles which are stored
+
+    Attributes
+    ----------
+    data : DataContainer
+        data of the particle container
+
+    """
+    def __init__(self, supported_cuba):
+        self.data = DataContainer()
+
+        # uid of each row and the row of each uid
+        self._uids = []
+        self._index_of_uid = {}
+
+        self._coordinates = numpy.zeros((0, 3), dtype=numpy.float64)
+
+        # values of each attribute and if a row has a value
+        self._columns = {}
+        self._has_value = {}
+        for cuba_key in supported_cuba:
+            self._columns[cuba_key] = _new_column(cuba_key, 0)
+            self._has_value[cuba_key] = numpy.zeros(0, dtype=bool)
+
+    def __len__(self):
+        return len(self._uids)
+
+    def has(self, uid):
+        return uid in self._index_of_uid
+
+    def get_uids(self):
+        """ Get the uids of the particles (in the order of the rows)
+
+        """
+        return list(self._uids)
+
+    def get_indices(self, uids, error_type=KeyError):
+        """ Get the rows of particles
+
+        Parameters
+        ----------
+        uids : sequence of uuid.UUID or None
+            uids of particles (or None for all particles)
+        error_type : type
+            type of exception raised if a particle does not exist
+
+        Returns
+        -------
+        numpy.ndarray
+            row of each particle
+
+        """
+        if uids is None:
+            return numpy.arange(len(self._uids))
+        for uid in uids:
+            if uid not in self._index_of_uid:
+                raise error_type("particle id ({}) was not found".format(uid))
+        return numpy.fromiter((self._index_of_uid[uid] for uid in uids),
+                              dtype=numpy.intp,
+                              count=len(uids))
+
+    def get_particle(self, uid):
+        """ Get a particle
+
+        Raises
+        ------
+        KeyError
+            if the particle does not exist
+
+        """
+        index = self._index_of_uid[uid]
+        data = DataContainer()
+        for cuba_key, column in self._columns.iteritems():
+            if self._has_value[cuba_key][index]:
+                data[cuba_key] = _to_cuba_value(column[index])
+        return Particle(coordinates=tuple(self._coordinates[index].tolist()),
+                        uid=uid,
+                        data=data)
+
+    def iter_particles(self, uids=None):
+        """ Iterate over particles
+
+        Parameters
+        ----------
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then all particles are iterated over.
+
+        Raises
+        ------
+        KeyError
+            if a particle does not exist
+
+        """
+        if uids is None:
+            uids = self.get_uids()
+        for uid in uids:
+            yield self.get_particle(uid)
+
+    def add_particles(self, iterable, material=None):
+        """ Add particles
+
+        Parameters
+        ----------
+        iterable : iterable of Particle
+            particles to be added. Particles without uid are given one.
+        material : uuid.UUID, optional
+            material (CUBA.MATERIAL_TYPE) of particles which have none
+
+        Returns
+        -------
+        uids : list of uuid.UUID
+            uids of the added particles
+
+        Raises
+        ------
+        ValueError :
+            when there is a particle with an uid that already exists
+            in the container.
+
+        """
+        uids = []
+        for particle in iterable:
+            if particle.uid is None:
+                particle.uid = uuid.uuid4()
+            elif particle.uid in self._index_of_uid:
+                raise ValueError(
+                    "particle with same uid ({}) already exists".format(
+                        particle.uid))
+            index = len(self._uids)
+            self._reserve(index + 1)
+            self._uids.append(particle.uid)
+            self._index_of_uid[particle.uid] = index
+            self._set_particle(index, particle, material)
+            uids.append(particle.uid)
+        return uids
+
+    def update_particles(self, iterable, material=None):
+        """ Update particles
+
+        Parameters
+        ----------
+        iterable : iterable of Particle
+            particles to be updated
+        material : uuid.UUID, optional
+            material (CUBA.MATERIAL_TYPE) of particles which have none
+
+        Raises
+        ------
+        ValueError :
+            if a particle does not exist
+
+        """
+        for particle in iterable:
+            index = self._index_of_uid.get(particle.uid)
+            if index is None:
+                raise ValueError(
+                    "particle id ({}) was not found".format(particle.uid))
+            self._set_particle(index, particle, material)
+
+    def remove_particle(self, uid):
+        """ Remove a particle
+
+        Raises
+        ------
+        KeyError
+            if the particle does not exist
+
+        """
+        index = self._index_of_uid.pop(uid)
+        del self._uids[index]
+        for moved_index in xrange(index, len(self._uids)):
+            self._index_of_uid[self._uids[moved_index]] = moved_index
+
+        # move the following rows up
+        end = len(self._uids) + 1
+        arrays = [self._coordinates] + self._columns.values() + \
+            self._has_value.values()
+        for array in arrays:
+            array[index:end - 1] = array[index + 1:end]
+
+    def add_arrays(self, coordinates, data_columns, uids=None, material=None):
+        """ Add particles given as arrays
+
+        Parameters
+        ----------
+        coordinates : numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+        data_columns : dict
+            map from CUBA key to an array with the value of each particle.
+            Unsupported attributes are ignored and missing attributes are
+            set to zero (except for CUBA.MATERIAL_TYPE).
+        uids : sequence of uuid.UUID, optional
+            uids of the particles. If None, then uids are generated.
+        material : uuid.UUID, optional
+            material (CUBA.MATERIAL_TYPE) of the particles if there is no
+            CUBA.MATERIAL_TYPE column
+
+        Returns
+        -------
+        uids : list of uuid.UUID
+            uids of the added particles
+
+        Raises
+        ------
+        ValueError :
+            when there is a particle with an uid that already exists
+            in the container.
+
+        """
+        number_particles = len(coordinates)
+        if uids is None:
+            uids = [uuid.uuid4() for _ in xrange(number_particles)]
+        else:
+            uids = list(uids)
+            for uid in uids:
+                if uid in self._index_of_uid:
+                    raise ValueError(
+                        "particle with same uid ({}) already exists".format(
+                            uid))
+            if len(set(uids)) != len(uids):
+                raise ValueError("uids of particles are not unique")
+
+        start = len(self._uids)
+        end = start + number_particles
+        self._reserve(end)
+        self._coordinates[start:end] = coordinates
+        for cuba_key, column in self._columns.iteritems():
+            if cuba_key in data_columns:
+                column[start:end] = _as_column(cuba_key,
+                                               data_columns[cuba_key])
+                has_value = True
+            elif cuba_key == CUBA.MATERIAL_TYPE:
+                column[start:end] = material
+                has_value = material is not None
+            else:
+                column[start:end] = 0
+                has_value = True
+            self._has_value[cuba_key][start:end] = has_value
+
+        for index, uid in enumerate(uids, start):
+            self._index_of_uid[uid] = index
+        self._uids.extend(uids)
+        return uids
+
+    def get_coordinates(self, indices):
+        """ Get the coordinates of the particles of the rows
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, 3) array with the coordinates of each particle
+
+        """
+        return self._coordinates[indices]
+
+    def get_attribute(self, cuba_key, indices):
+        """ Get the values of a CUBA attribute of the particles of the rows
+
+        Returns
+        -------
+        numpy.ndarray
+            (N,) or (N, k) array with the value of each particle
+
+        Raises
+        ------
+        KeyError
+            if the attribute is not supported or a particle has no value
+
+        """
+        if not numpy.all(self._has_value[cuba_key][indices]):
+            raise KeyError(
+                "Not all particles have a value of '{}'".format(cuba_key))
+        return self._columns[cuba_key][indices]
+
+    def set_coordinates(self, indices, coordinates):
+        """ Set the coordinates of the particles of the rows
+
+        """
+        self._coordinates[indices] = coordinates
+
+    def set_attribute(self, cuba_key, indices, values):
+        """ Set the values of a CUBA attribute of the particles of the rows
+
+        Raises
+        ------
+        KeyError
+            if the attribute is not supported
+
+        """
+        self._columns[cuba_key][indices] = _as_column(cuba_key, values)
+        self._has_value[cuba_key][indices] = True
+
+    def _set_particle(self, index, particle, material):
+        """ Set the row of a particle """
+        self._coordinates[index] = particle.coordinates[0:3]
+        for cuba_key, column in self._columns.iteritems():
+            value = particle.data.get(cuba_key)
+            if value is None and cuba_key == CUBA.MATERIAL_TYPE:
+                value = material
+            if value is not None:
+                column[index] = value
+            self._has_value[cuba_key][index] = value is not None
+
+    def _reserve(self, number_particles):
+        """ Grow the arrays so that they have room for the particles
+
+        The arrays grow (at least) by doubling, so that adding particles
+        one by one does not copy the arrays each time.
+
+        """
+        capacity = len(self._coordinates)
+        if number_particles <= capacity:
+            return
+        capacity = max(number_particles, 2 * capacity)
+        self._coordinates = _resize(self._coordinates, capacity)
+        for cuba_key in self._columns:
+            self._columns[cuba_key] = _resize(self._columns[cuba_key],
+                                              capacity)
+            self._has_value[cuba_key] = _resize(self._has_value[cuba_key],
+                                                capacity)
+
+
+def _new_column(cuba_key, number_particles):
+    """ Create a column of the values of a CUBA attribute
+
+    The material (CUBA.MATERIAL_TYPE) column holds the uid objects.
+
+    """
+    if cuba_key == CUBA.MATERIAL_TYPE:
+        return numpy.empty(number_particles, dtype=object)
+    keyword = KEYWORDS[cuba_key.name]
+    shape = (number_particles,) if keyword.shape == [1] else \
+        (number_particles,) + tuple(keyword.shape)
+    return numpy.zeros(shape, dtype=keyword.dtype)
+
+
+def _as_column(cuba_key, values):
+    """ Convert the values of a CUBA attribute to a column """
+    column = _new_column(cuba_key, len(values))
+    column[:] = values
+    return column
+
+
+def _resize(array, number_particles):
+    """ Get a copy of the array with room for more particles """
+    resized = numpy.zeros((number_particles,) + array.shape[1:],
+                          dtype=array.dtype)
+    resized[:len(array)] = array
+    return resized
+
+
+def _to_cuba_value(value):
+    """ Convert a value of a column to a CUBA value """
+    if isinstance(value, numpy.ndarray):
+        # always assuming that its a tuple
+        # ( see https://github.com/simphony/simphony-common/issues/18 )
+        return tuple(value.tolist())
+    elif isinstance(value, numpy.generic):
+        return value.item()
+    return value
@@ -77,6 +77,54 @@ class TestFileUtility(unittest.TestCase):
             assert_almost_equal(p.data[CUBA.RADIUS], 0.5 / 2)
             assert_almost_equal(p.data[CUBA.MASS], 1.0)
 
+    def test_read_columnar_atomic_style_data_file(self):
+        filename = self._write_example_file(
+            _explicit_atomic_style_file_contents)
+        reference, _ = read_data_file(filename)
+
+        particles, SD = read_data_file(filename, columnar=True)
+
+        self.assertEqual(4, particles.count_of(CUBA.PARTICLE))
+        assert_almost_equal(particles.data[CUBA.ORIGIN],
+                            reference.data[CUBA.ORIGIN])
+        assert_almost_equal(particles.data[CUBA.VECTOR],
+                            reference.data[CUBA.VECTOR])
+        _compare_particles_averages(particles,
+                                    reference,
+                                    get_all_cuba_attributes(AtomStyle.ATOMIC),
+                                    self)
+
+        # arrays are ordered by the lammps id
+        assert_almost_equal(particles.get_coordinates()[:, 0],
+                            [1.0, 2.0, 3.0, 4.0])
+        assert_almost_equal(particles.get_velocities(),
+                            [[1.0, 1.0, 1.0]] * 4)
+
+        material_masses = [SD.get(material_type).data[CUBA.MASS] for
+                           material_type in particles.get_material_types()]
+        self.assertEqual(material_masses, [1, 3, 1, 42])
+
+        material_uids = [material.uid for material
+                         in SD.iter(item_type=CUBA.MATERIAL)]
+        uids = particles.get_uids()
+        for uid, p in zip(uids, particles.iter(item_type=CUBA.PARTICLE)):
+            self.assertEqual(uid, p.uid)
+            self.assertEqual(particles.get(uid).coordinates, p.coordinates)
+            self.assertIn(p.data[CUBA.MATERIAL_TYPE], material_uids)
+
+    def test_read_columnar_sphere_style_data_file(self):
+        particles, SD = read_data_file(self._write_example_file(
+            _explicit_sphere_style_file_contents), columnar=True)
+
+        self.assertEqual(3, particles.count_of(CUBA.PARTICLE))
+        assert_almost_equal(particles.get_attribute(CUBA.RADIUS),
+                            [0.5 / 2] * 3)
+        for p in particles.iter(item_type=CUBA.PARTICLE):
+            assert_almost_equal(p.data[CUBA.ANGULAR_VELOCITY], [0.0, 0.0, 1.0])
+            assert_almost_equal(p.data[CUBA.VELOCITY], [5.0, 0.0, 0.0])
+            assert_almost_equal(p.data[CUBA.RADIUS], 0.5 / 2)
+            assert_almost_equal(p.data[CUBA.MASS], 1.0)
+
     def test_write_file_sphere(self):
         # given
         original_particles, SD = read_data_file(self._write_example_file(
@@ -0,0 +1,55 @@
+import unittest
+import tempfile
+import shutil
+import os
+
+import numpy
+
+from simlammps.io.lammps_data_file_parser import LammpsDataFileParser
+from simlammps.io.lammps_columnar_data_handler import (
+    LammpsColumnarDataHandler)
+from simlammps.io.tests.test_lammps_simple_data_handler import (
+    _write_example_file, _data_file_contents)
+
+
+class TestLammpsColumnarDataHandler(unittest.TestCase):
+    """ Tests the columnar data handler
+
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+        self.handler = LammpsColumnarDataHandler()
+        self.parser = LammpsDataFileParser(handler=self.handler)
+        self.filename = os.path.join(self.temp_dir, "test_data.txt")
+
+        _write_example_file(self.filename, _data_file_contents)
+
+    def test_number_atom_types(self):
+        self.parser.parse(self.filename)
+        self.assertEqual(3, self.handler.get_number_atom_types())
+
+    def test_masses(self):
+        self.parser.parse(self.filename)
+        self.assertEqual(self.handler.get_masses(), {1: 3, 2: 42, 3: 1})
+
+    def test_atoms(self):
+        self.parser.parse(self.filename)
+
+        numpy.testing.assert_array_equal(self.handler.get_atom_ids(),
+                                         [1, 2, 3, 4])
+        atom_values = self.handler.get_atom_values()
+        numpy.testing.assert_array_equal(atom_values[:, 0], [1, 2, 3, 2])
+        numpy.testing.assert_array_equal(atom_values[:, 1:4],
+                                         [[i, i, i] for i in range(1, 5)])
+
+    def test_velocities(self):
+        self.parser.parse(self.filename)
+
+        numpy.testing.assert_array_equal(self.handler.get_velocity_values(),
+                                         [[i, i, i] for i in range(1, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy.testing import assert_almost_equal
+from simphony.core.cuba import CUBA
+
+from simlammps.io.lammps_dump_file_reader import LammpsDumpFileReader
+
+
+class TestLammpsDumpFileReader(unittest.TestCase):
+    """ Tests the dump file reader class
+
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, "dump.lammpstrj")
+        with open(self.filename, "w") as f:
+            f.write(_dump_file_contents)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_frames(self):
+        reader = LammpsDumpFileReader(self.filename)
+
+        frames = [frame for frame in reader]
+
+        self.assertEqual([frame.timestep for frame in frames], [0, 10, 20])
+        for frame in frames:
+            self.assertEqual(frame.number_of_atoms, 3)
+            self.assertEqual(frame.columns,
+                             ["id", "type", "x", "y", "z", "vx", "vy", "vz"])
+            self.assertEqual(frame.boundary, ["pp", "pp", "pp"])
+
+    def test_columns(self):
+        reader = LammpsDumpFileReader(self.filename)
+
+        frame = reader.get_frame(1)
+
+        # atoms are sorted by id
+        self.assertEqual(frame["id"].tolist(), [1, 2, 3])
+        self.assertEqual(frame["type"].tolist(), [1, 2, 1])
+        assert_almost_equal(frame.get_coordinates(),
+                            [[1.1, 1.0, 1.0],
+                             [2.1, 2.0, 2.0],
+                             [3.1, 3.0, 3.0]])
+        assert_almost_equal(frame.get_velocities()[:, 0], [0.1, 0.2, 0.3])
+        with self.assertRaises(KeyError):
+            frame["omegax"]
+
+    def test_unsorted_columns(self):
+        reader = LammpsDumpFileReader(self.filename, sort_by_id=False)
+
+        frame = reader.get_frame(1)
+
+        self.assertEqual(frame["id"].tolist(), [2, 1, 3])
+
+    def test_get_frame(self):
+        reader = LammpsDumpFileReader(self.filename)
+
+        self.assertEqual(reader.number_of_frames(), 3)
+        self.assertEqual(reader.get_frame(2).timestep, 20)
+        self.assertEqual(reader.get_frame(0).timestep, 0)
+        self.assertEqual(reader.get_frame(-1).timestep, 20)
+        with self.assertRaises(IndexError):
+            reader.get_frame(3)
+
+    def test_gzip(self):
+        filename = self.filename + ".gz"
+        with gzip.open(filename, "wb") as f:
+            f.write(_dump_file_contents)
+        reader = LammpsDumpFileReader(filename)
+
+        self.assertEqual([frame.timestep for frame in reader], [0, 10, 20])
+        self.assertEqual(reader.get_frame(1).timestep, 10)
+
+    def test_box(self):
+        reader = LammpsDumpFileReader(self.filename)
+
+        frame = reader.get_frame(0)
+
+        assert_almost_equal(frame.get_box_origin(), (0.0, -1.0, 0.0))
+        assert_almost_equal(frame.get_box_vectors(),
+                            [(10.0, 0.0, 0.0),
+                             (0.0, 11.0, 0.0),
+                             (0.0, 0.0, 10.0)])
+
+    def test_get_particles(self):
+        reader = LammpsDumpFileReader(self.filename)
+        frame = reader.get_frame(2)
+
+        particles = frame.get_particles(
+            convert_atom_type_to_material=lambda atom_type: atom_type * 10)
+
+        self.assertEqual(particles.count_of(CUBA.PARTICLE), 3)
+        for p in particles.iter(item_type=CUBA.PARTICLE):
+            self.assertIn(p.data[CUBA.MATERIAL_TYPE], [10, 20])
+            self.assertIn(CUBA.VELOCITY, p.data)
+        assert_almost_equal(particles.data[CUBA.ORIGIN], (0.0, -1.0, 0.0))
+
+
+_dump_file_contents = """ITEM: TIMESTEP
+0
+ITEM: NUMBER OF ATOMS
+3
+ITEM: BOX BOUNDS pp pp pp
+0.0 10.0
+-1.0 10.0
+0.0 10.0
+ITEM: ATOMS id type x y z vx vy vz
+1 1 1.0 1.0 1.0 0.1 0.0 0.0
+2 2 2.0 2.0 2.0 0.2 0.0 0.0
+3 1 3.0 3.0 3.0 0.3 0.0 0.0
+ITEM: TIMESTEP
+10
+ITEM: NUMBER OF ATOMS
+3
+ITEM: BOX BOUNDS pp pp pp
+0.0 10.0
+-1.0 10.0
+0.0 10.0
+ITEM: ATOMS id type x y z vx vy vz
+2 2 2.1 2.0 2.0 0.2 0.0 0.0
+1 1 1.1 1.0 1.0 0.1 0.0 0.0
+3 1 3.1 3.0 3.0 0.3 0.0 0.0
+ITEM: TIMESTEP
+20
+ITEM: NUMBER OF ATOMS
+3
+ITEM: BOX BOUNDS pp pp pp
+0.0 10.0
+-1.0 10.0
+0.0 10.0
+ITEM: ATOMS id type x y z vx vy vz
+1 1 1.2 1.0 1.0 0.1 0.0 0.0
+2 2 2.2 2.0 2.0 0.2 0.0 0.0
+3 1 3.2 3.0 3.0 0.3 0.0 0.0
+"""
+
+
+if __name__ == '__main__':
+    unittest.main()
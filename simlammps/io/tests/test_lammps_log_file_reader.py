@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from simlammps.io.lammps_log_file_reader import (parse_run_timings,
+                                                 read_run_timings)
+
+
+class TestLammpsLogFileReader(unittest.TestCase):
+    """ Tests reading the timing breakdown of LAMMPS runs
+
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parse_timing_table(self):
+        timings = parse_run_timings(_log_contents.splitlines())
+
+        self.assertEqual(len(timings), 2)
+        first, second = timings
+        self.assertEqual(first.number_steps, 0)
+        self.assertEqual(second.loop_time, 1.25)
+        self.assertEqual(second.number_processes, 4)
+        self.assertEqual(second.number_steps, 100)
+        self.assertEqual(second.number_atoms, 4000)
+        self.assertEqual(sorted(second.sections),
+                         ["Comm", "Modify", "Neigh", "Other", "Output",
+                          "Pair"])
+        self.assertEqual(second.sections["Pair"], 0.8)
+        self.assertEqual(second.max_sections["Pair"], 0.9)
+        self.assertAlmostEqual(second.get_time("Pair", "Neigh", "Comm"),
+                               1.1)
+        self.assertEqual(second.get_time("Kspace"), 0.0)
+        self.assertEqual(second.get_time(), 1.25)
+        self.assertEqual(first.local_atoms, None)
+        self.assertEqual(first.imbalance_factor, None)
+        self.assertEqual(second.local_atoms, (1000.0, 1250.0, 750.0))
+        self.assertEqual(second.imbalance_factor, 1.25)
+
+    def test_parse_old_format(self):
+        timings = parse_run_timings(_old_log_contents.splitlines())
+
+        self.assertEqual(len(timings), 1)
+        timing = timings[0]
+        self.assertEqual(timing.number_processes, 1)
+        self.assertEqual(timing.number_steps, 50)
+        self.assertEqual(timing.sections,
+                         {"Pair": 0.5, "Neigh": 0.1, "Comm": 0.02,
+                          "Output": 0.0, "Other": 0.01})
+        self.assertEqual(timing.max_sections, {})
+
+    def test_parse_without_runs(self):
+        self.assertEqual(parse_run_timings(["units lj", "run 0"]), [])
+
+    def test_read_file(self):
+        filename = os.path.join(self.temp_dir, "log.lammps")
+        with open(filename, "w") as log_file:
+            log_file.write(_log_contents)
+
+        timings = read_run_timings(filename)
+
+        self.assertEqual([timing.number_steps for timing in timings],
+                         [0, 100])
+
+
+_log_contents = """LAMMPS (17 Nov 2016)
+run 0
+Loop time of 1e-06 on 4 procs for 0 steps with 4000 atoms
+
+MPI task timing breakdown:
+Section |  min time  |  avg time  |  max time  |%varavg| %total
+---------------------------------------------------------------
+Pair    | 0          | 0          | 0          |   0.0 |  0.00
+Other   |            | 1e-06      |            |       |100.00
+
+neighbor 0.5 bin
+run 100
+Loop time of 1.25 on 4 procs for 100 steps with 4000 atoms
+
+Performance: 34560.000 tau/day, 80.000 timesteps/s
+99.8% CPU use with 4 MPI tasks x no OpenMP threads
+
+MPI task timing breakdown:
+Section |  min time  |  avg time  |  max time  |%varavg| %total
+---------------------------------------------------------------
+Pair    | 0.7        | 0.8        | 0.9        |   2.1 | 64.00
+Neigh   | 0.2        | 0.2        | 0.2        |   0.1 | 16.00
+Comm    | 0.05       | 0.1        | 0.15       |   3.2 |  8.00
+Output  | 0          | 0          | 0          |   0.0 |  0.00
+Modify  | 0.1        | 0.1        | 0.1        |   0.1 |  8.00
+Other   |            | 0.05       |            |       |  4.00
+
+Nlocal:    1000 ave 1250 max 750 min
+Histogram: 1 0 0 0 2 0 0 0 0 1
+"""
+
+_old_log_contents = """LAMMPS (10 Feb 2015)
+run 50
+Loop time of 0.63 on 1 procs for 50 steps with 500 atoms
+
+Pair  time (%) = 0.5 (79.3651)
+Neigh time (%) = 0.1 (15.873)
+Comm  time (%) = 0.02 (3.1746)
+Outpt time (%) = 0 (0)
+Other time (%) = 0.01 (1.5873)
+"""
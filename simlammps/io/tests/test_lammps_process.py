@@ -2,7 +2,7 @@ import unittest
 import shutil
 import tempfile
 
-from simlammps.io.lammps_process import LammpsProcess
+from simlammps.io.lammps_process import LammpsProcess, get_rank_errors
 
 
 class TestLammpsProcess(unittest.TestCase):
@@ -28,6 +28,29 @@ class TestLammpsProcess(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             self.lammps = LammpsProcess(lammps_name=lammps_name)
 
+    def test_cannot_find_lammps_without_check(self):
+        lammps = LammpsProcess(lammps_name="this_is_not_lammps",
+                               log_directory=self.temp_dir, check=False)
+        with self.assertRaisesRegexp(RuntimeError, "this_is_not_lammps"):
+            lammps.run("print \"hello world\"")
+
+
+class TestGetRankErrors(unittest.TestCase):
+
+    def test_errors(self):
+        output = ("LAMMPS (1 Feb 2014)\n"
+                  "ERROR on proc 3: Out of range atoms - cannot compute PPPM "
+                  "(../pppm.cpp:1918)\n"
+                  "ERROR: Unknown command: thisisnotalammpscommmand\n")
+        self.assertEqual(
+            get_rank_errors(output),
+            [(3, "Out of range atoms - cannot compute PPPM "
+                 "(../pppm.cpp:1918)"),
+             (None, "Unknown command: thisisnotalammpscommmand")])
+
+    def test_no_errors(self):
+        self.assertEqual(get_rank_errors("Total wall time: 0:00:00\n"), [])
+
 
 if __name__ == '__main__':
     unittest.main()
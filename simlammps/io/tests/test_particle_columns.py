@@ -0,0 +1,113 @@
+import unittest
+import uuid
+
+import numpy
+from numpy.testing import assert_almost_equal
+
+from simphony.core.cuba import CUBA
+from simphony.cuds.particles import Particle
+
+from simlammps.io.particle_columns import ParticleColumns
+
+
+class TestParticleColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.material = uuid.uuid4()
+        self.columns = ParticleColumns([CUBA.MATERIAL_TYPE, CUBA.VELOCITY])
+        self.particles = [
+            Particle(coordinates=(i, i, i),
+                     data={CUBA.VELOCITY: (0.0, 0.0, i),
+                           CUBA.RADIUS: 1.0})
+            for i in range(3)]
+        self.uids = self.columns.add_particles(self.particles, self.material)
+
+    def test_add_particles(self):
+        self.assertEqual(len(self.columns), 3)
+        self.assertEqual(self.columns.get_uids(), self.uids)
+        for particle, uid in zip(self.particles, self.uids):
+            # uids are given to particles which have none
+            self.assertEqual(particle.uid, uid)
+
+            cached = self.columns.get_particle(uid)
+            self.assertEqual(cached.coordinates, particle.coordinates)
+            # unsupported data is dropped and the material is added
+            self.assertEqual(dict(cached.data),
+                             {CUBA.VELOCITY: particle.data[CUBA.VELOCITY],
+                              CUBA.MATERIAL_TYPE: self.material})
+
+    def test_add_existing_particle(self):
+        with self.assertRaises(ValueError):
+            self.columns.add_particles([self.particles[0]])
+        with self.assertRaises(ValueError):
+            self.columns.add_arrays(numpy.zeros((1, 3)), {},
+                                    uids=[self.uids[0]])
+
+    def test_particle_without_value(self):
+        uids = self.columns.add_particles(
+            [Particle(coordinates=(0.0, 0.0, 0.0))])
+
+        self.assertEqual(dict(self.columns.get_particle(uids[0]).data), {})
+        with self.assertRaises(KeyError):
+            self.columns.get_attribute(CUBA.VELOCITY,
+                                       self.columns.get_indices(None))
+
+    def test_update_particles(self):
+        particle = self.columns.get_particle(self.uids[1])
+        particle.coordinates = (5.0, 5.0, 5.0)
+        del particle.data[CUBA.VELOCITY]
+
+        self.columns.update_particles([particle])
+
+        updated = self.columns.get_particle(self.uids[1])
+        self.assertEqual(updated.coordinates, (5.0, 5.0, 5.0))
+        self.assertNotIn(CUBA.VELOCITY, updated.data)
+
+        with self.assertRaises(ValueError):
+            self.columns.update_particles([Particle(uid=uuid.uuid4())])
+
+    def test_remove_particle(self):
+        self.columns.remove_particle(self.uids[0])
+
+        self.assertEqual(self.columns.get_uids(), self.uids[1:])
+        self.assertFalse(self.columns.has(self.uids[0]))
+        assert_almost_equal(
+            self.columns.get_coordinates(self.columns.get_indices(None)),
+            [[1.0, 1.0, 1.0], [2.0, 2.0, 2.0]])
+        self.assertEqual(self.columns.get_particle(self.uids[2]).coordinates,
+                         (2.0, 2.0, 2.0))
+        with self.assertRaises(KeyError):
+            self.columns.remove_particle(self.uids[0])
+
+    def test_add_arrays(self):
+        uids = self.columns.add_arrays(numpy.ones((10, 3)), {})
+
+        self.assertEqual(len(self.columns), 13)
+        indices = self.columns.get_indices(uids)
+        assert_almost_equal(self.columns.get_coordinates(indices),
+                            numpy.ones((10, 3)))
+        # missing values are zero
+        assert_almost_equal(
+            self.columns.get_attribute(CUBA.VELOCITY, indices),
+            numpy.zeros((10, 3)))
+        # (no material is given)
+        with self.assertRaises(KeyError):
+            self.columns.get_attribute(CUBA.MATERIAL_TYPE, indices)
+
+    def test_set_arrays(self):
+        indices = self.columns.get_indices([self.uids[2], self.uids[0]])
+
+        self.columns.set_coordinates(indices, [[7.0, 7.0, 7.0],
+                                               [8.0, 8.0, 8.0]])
+        self.columns.set_attribute(CUBA.VELOCITY, indices,
+                                   [[1.0, 0.0, 0.0], [2.0, 0.0, 0.0]])
+
+        particle = self.columns.get_particle(self.uids[0])
+        self.assertEqual(particle.coordinates, (8.0, 8.0, 8.0))
+        self.assertEqual(particle.data[CUBA.VELOCITY], (2.0, 0.0, 0.0))
+        with self.assertRaises(ValueError):
+            self.columns.get_indices([uuid.uuid4()], ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
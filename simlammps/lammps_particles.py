@@ -1,27 +1,52 @@
+import numpy
+
 from simphony.cuds import Particles
 from simphony.core import CUBA
 
+from simlammps.common.read_only_data_container import ReadOnlyDataContainer
+
 
 class LammpsParticles(Particles):
     """ Responsible class to synchronize operations on particles
 
+    Parameters
+    ----------
+    manager : ABCDataManager
+        data manager which holds the particles
+    uname : string
+        non-changing unique name of particles
+    uid : uuid.UUID, optional
+        uid of the particle container. If None, then a uid is generated.
+
     Attributes
     ----------
     name : string
         name of particles
-    data : DataContainer
+    data : ReadOnlyDataContainer
         holds data
     data_extension : dict
         holds non-approved CUBA keywords
 
     """
-    def __init__(self, manager, uname):
+    def __init__(self, manager, uname, uid=None):
         # most of the work is delegated here to this manger
-        self._manager = manager
+        self._data_manager = manager
         self._uname = uname
 
+        # cached data of container (None if it needs to be retrieved)
+        self._cached_data = None
+
         super(LammpsParticles, self).__init__(name=uname)
 
+        if uid is not None:
+            self._uid = uid
+
+    @property
+    def _manager(self):
+        # the particles cannot be accessed while LAMMPS is running
+        self._data_manager.run_guard.wait()
+        return self._data_manager
+
     @property
     def name(self):
         return self._manager.get_name(self._uname)
@@ -32,10 +57,22 @@ class LammpsParticles(Particles):
 
     @property
     def data(self):
-        return self._manager.get_data(self._uname)
+        """ Data of the container
+
+        The data is cached (until new data is set), so it is only
+        retrieved from the data manager once and all accesses return the
+        same read-only container.  The data is changed by setting a
+        changed copy (e.g. `data = DataContainer(particles.data)`).
+
+        """
+        if self._cached_data is None:
+            self._cached_data = ReadOnlyDataContainer(
+                self._manager.get_data(self._uname))
+        return self._cached_data
 
     @data.setter
     def data(self, value):
+        self._cached_data = None
         self._manager.set_data(value, self._uname)
 
     def _add_particles(self, iterable):
@@ -106,6 +143,180 @@ class LammpsParticles(Particles):
         for _ in []:
             yield _
 
+    # array methods #######################################################
+    def get_uids(self):
+        """ Return the uids of the particles
+
+        The order of the uids is the order of the rows of the arrays
+        returned by get_coordinates and get_attribute (when no uids are
+        given) and does not change until particles are added or removed.
+
+        Returns
+        -------
+        list of uuid.UUID
+            uids of particles
+
+        """
+        return self._manager.get_uids(self._uname)
+
+    def get_coordinates(self, uids=None):
+        """ Return the coordinates of particles as an (N, 3) array
+
+        Parameters
+        ----------
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then all particles (in the order
+            given by get_uids).
+
+        Raises
+        ------
+        KeyError :
+            If any particle does not exist.
+
+        """
+        return self._manager.get_coordinates(self._uname, uids)
+
+    def get_velocities(self, uids=None):
+        """ Return the velocities of particles as an (N, 3) array
+
+        See get_attribute.
+
+        """
+        return self.get_attribute(CUBA.VELOCITY, uids)
+
+    def get_supported_attributes(self):
+        """ Return the CUBA keys of the attributes of the particles
+
+        These are the attributes of the atom style, i.e. the keys which
+        can be passed to get_attribute.
+
+        """
+        return self._manager.get_supported_attributes()
+
+    def get_attribute(self, cuba_key, uids=None):
+        """ Return the values of a CUBA attribute of particles as an array
+
+        The array has one row per particle, i.e. (N,) for scalars or
+        (N, k) for vectors. The values of CUBA.MATERIAL_TYPE are returned
+        as an array of material uids.
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then all particles (in the order
+            given by get_uids).
+
+        Raises
+        ------
+        KeyError :
+            If any particle does not exist or the attribute is not
+            supported.
+
+        """
+        return self._manager.get_attribute(cuba_key, self._uname, uids)
+
+    def set_coordinates(self, coordinates, uids=None):
+        """ Set the coordinates of particles from an (N, 3) array
+
+        Parameters
+        ----------
+        coordinates : array_like
+            (N, 3) array with the coordinates of each particle
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then all particles (in the order
+            given by get_uids).
+
+        Raises
+        ------
+        ValueError :
+            If any particle does not exist or the number of rows does not
+            match the number of particles.
+
+        """
+        coordinates = _as_coordinates(coordinates)
+        _check_number_of_rows(coordinates, self._get_number_of(uids))
+        self._manager.set_coordinates(coordinates, self._uname, uids)
+
+    def set_velocities(self, velocities, uids=None):
+        """ Set the velocities of particles from an (N, 3) array
+
+        See set_attribute.
+
+        """
+        self.set_attribute(CUBA.VELOCITY, velocities, uids)
+
+    def set_attribute(self, cuba_key, values, uids=None):
+        """ Set the values of a CUBA attribute of particles from an array
+
+        Parameters
+        ----------
+        cuba_key : CUBA
+            key of the attribute
+        values : array_like
+            (N,) or (N, k) array with the value of each particle
+        uids : sequence of uuid.UUID, optional
+            uids of particles. If None, then all particles (in the order
+            given by get_uids).
+
+        Raises
+        ------
+        ValueError :
+            If any particle does not exist or the number of rows does not
+            match the number of particles.
+        KeyError :
+            If the attribute is not supported.
+
+        """
+        _check_number_of_rows(values, self._get_number_of(uids))
+        self._manager.set_attribute(cuba_key, values, self._uname, uids)
+
+    def add_from_arrays(self, coordinates, data_columns=None, uids=None):
+        """ Add particles given as arrays
+
+        Parameters
+        ----------
+        coordinates : array_like
+            (N, 3) array with the coordinates of each particle
+        data_columns : dict, optional
+            map from CUBA key to an array with the value of each particle,
+            i.e. (N,) for scalars or (N, k) for vectors
+        uids : sequence of uuid.UUID, optional
+            uids of the particles. If None, then uids are generated.
+
+        Returns
+        -------
+        uids : list of uuid.UUID
+            The uids of the added particles.
+
+        Raises
+        ------
+        ValueError :
+            when there is a particle with an uid that already exists
+            in the container or the arrays do not have the same number of
+            rows.
+
+        """
+        coordinates = _as_coordinates(coordinates)
+        data_columns = data_columns if data_columns is not None else {}
+        for values in data_columns.itervalues():
+            _check_number_of_rows(values, len(coordinates))
+        if uids is not None:
+            _check_number_of_rows(uids, len(coordinates))
+        return self._manager.add_from_arrays(coordinates,
+                                             data_columns,
+                                             self._uname,
+                                             uids)
+
+    def _get_number_of(self, uids):
+        """ Return the number of particles refered to by uids
+
+        """
+        if uids is None:
+            return self._manager.number_of_particles(self._uname)
+        return len(uids)
+
     # count methods #######################################################
     def count_of(self, item_type):
         """ Return the count of item_type in the container.
@@ -134,3 +345,35 @@ class LammpsParticles(Particles):
         else:
             error_str = "Trying to obtain count a of non-supported item: {}"
             raise ValueError(error_str.format(item_type))
+
+
+def _as_coordinates(coordinates):
+    """ Return coordinates as an (N, 3) array
+
+    Raises
+    ------
+    ValueError :
+        If the coordinates do not have the shape (N, 3).
+
+    """
+    coordinates = numpy.asarray(coordinates, dtype=numpy.float64)
+    if coordinates.ndim != 2 or coordinates.shape[1] != 3:
+        raise ValueError(
+            "Coordinates need to have the shape (N, 3) not {}".format(
+                coordinates.shape))
+    return coordinates
+
+
+def _check_number_of_rows(values, number_particles):
+    """ Check that there is one value per particle
+
+    Raises
+    ------
+    ValueError :
+        If the number of values does not match the number of particles.
+
+    """
+    if len(values) != number_particles:
+        raise ValueError(
+            "Number of values ({}) does not match the number of "
+            "particles ({})".format(len(values), number_particles))
@@ -7,6 +7,8 @@ import contextlib
 import shutil
 import tempfile
 
+import numpy
+
 from simphony.api import CUDS, CUBA
 from simphony.core.data_container import DataContainer
 from simphony.cuds.abc_modeling_engine import ABCModelingEngine
@@ -14,12 +16,25 @@ from simphony.cuds.abc_particles import ABCParticles
 from simphony.cuds.meta import api
 import simphony.cuds.particles as scp
 
+from simlammps.common.async_run import AsyncRun
 from simlammps.common.atom_style import AtomStyle
+from simlammps.common.cuds_index import CudsIndex
+from simlammps.common.utils import get_data_fingerprint, get_fingerprint
+from simlammps.config.accelerator import get_accelerator_arguments
+from simlammps.config.decomposition import DecompositionSettings
+from simlammps.config.mpi import MpiLauncher, get_mpi_launcher_from_environment
+from simlammps.config.neighbor import NeighborSettings
+from simlammps.config.neighbor_tuning import NeighborTuning
+from simlammps.config.pair_style import PairStyle, PairStyleInfo, get_pair_style
 from simlammps.config.script_writer import ScriptWriter
+from simlammps.config.trajectory import TrajectorySampling
 from simlammps.internal.lammps_internal_data_manager import LammpsInternalDataManager
+from simlammps.internal.lammps_worker import LammpsWorker
 
+from simlammps.io.lammps_dump_file_reader import LammpsDumpFileReader
 from simlammps.io.lammps_fileio_data_manager import LammpsFileIoDataManager
-from simlammps.io.lammps_process import LammpsProcess
+from simlammps.io.lammps_log_file_reader import read_run_timings
+from simlammps.io.lammps_process import LammpsProcess, get_lammps_styles
 
 
 def _temp_directory():
@@ -35,10 +50,105 @@ def _temp_directory():
 _TEMP_DIRECTORY = contextlib.contextmanager(_temp_directory)
 
 
+def _get_library_styles(create_lammps, comm=None):
+    """Get the (pair) styles compiled into the LAMMPS library.
+
+    Returns None if the styles cannot be queried (i.e. older versions of
+    the LAMMPS python module).
+
+    Parameters
+    ----------
+    create_lammps : callable
+        creates the LAMMPS instance (i.e. lammps.lammps or LammpsWorker)
+    comm : mpi4py.MPI.Comm, optional
+        MPI communicator of LAMMPS
+    """
+    cmdargs = ["-log", "none", "-screen", "none"]
+    if comm is None:
+        probe = create_lammps(cmdargs=cmdargs)
+    else:
+        probe = create_lammps(cmdargs=cmdargs, comm=comm)
+    try:
+        if not hasattr(probe, 'available_styles'):
+            return None
+        styles = probe.available_styles('pair')
+        return None if styles is None else {'pair': set(styles)}
+    finally:
+        probe.close()
+
+
+def _get_lammps_name():
+    """Get the name of the LAMMPS executable (file-io interface)."""
+    return os.environ.get('SIM_LAMMPS_BIN', 'lammps')
+
+
+def _get_dataset_fingerprint(particle_container):
+    """Get a fingerprint of the data and the particles of a dataset.
+
+    Of the particles, only their number and their materials (see
+    _get_material_types) are fingerprinted.
+    """
+    return (get_data_fingerprint(particle_container.data),
+            particle_container.count_of(CUBA.PARTICLE),
+            _get_material_types(particle_container))
+
+
+def _get_material_types(particle_container):
+    """Get the materials (CUBA.MATERIAL_TYPE) of the particles of a dataset.
+
+    The materials of a dataset with array accessors (e.g. LammpsParticles)
+    are queried with one array call.
+
+    Returns
+    -------
+    frozenset
+        uids of the materials (None if a particle has no material)
+
+    """
+    if hasattr(particle_container, 'get_attribute'):
+        try:
+            return frozenset(particle_container.get_attribute(
+                CUBA.MATERIAL_TYPE))
+        except KeyError:
+            return None
+    material_types = frozenset(
+        particle.data.get(CUBA.MATERIAL_TYPE)
+        for particle in particle_container.iter(item_type=CUBA.PARTICLE))
+    return None if None in material_types else material_types
+
+
+def _get_number_restarts(lammps):
+    """Get the number of restarts of LAMMPS (only an isolated one restarts)."""
+    return getattr(lammps, 'number_restarts', 0)
+
+
+def _get_imbalance_factor(timings):
+    """Get the imbalance factor of the last run (None if not reported)."""
+    return timings[-1].imbalance_factor if timings else None
+
+# CUDS components (and their item type) which are loaded by the wrapper
+_CUDS_COMPONENTS = (
+    ('materials', CUBA.MATERIAL),
+    ('computational_method', CUBA.MOLECULAR_DYNAMICS),
+    ('box', CUBA.BOX),
+    ('thermostat', CUBA.THERMOSTAT),
+    ('integration_time', CUBA.INTEGRATION_TIME),
+    ('condition', CUBA.CONDITION),
+    ('interatomic_potential', CUBA.INTERATOMIC_POTENTIAL))
+
+# global cutoff of the Lennard-Jones pair style
+_LJ_GLOBAL_CUTOFF = 1.12246
+
+# mixing rule (Lorentz-Berthelot) for the Lennard-Jones coefficients of
+# pairs of materials without an explicit interatomic potential
+_LJ_MIXING_RULE = 'arithmetic'
+
+
 class LammpsWrapper(ABCModelingEngine):
     """Wrapper to LAMMPS-md."""
 
-    def __init__(self, use_internal_interface=False, **kwargs):
+    def __init__(self, use_internal_interface=False, comm=None,
+                 accelerator=None, isolated=False, **kwargs):
         """Constructor.
 
         Parameters
@@ -50,6 +160,24 @@ class LammpsWrapper(ABCModelingEngine):
             If true, then the internal interface (library) is used when
             communicating with LAMMPS, if false, then file-io interface is
             used where input/output files are used to communicate with LAMMPS
+
+        comm : mpi4py.MPI.Comm, optional
+            MPI communicator of the internal interface.  If given, LAMMPS is
+            run in parallel on the ranks of the communicator and the same
+            driver (i.e. the same calls to the wrapper) has to be run on
+            each rank (e.g. "mpirun -np 8 python drive.py").
+
+        accelerator : Accelerator, optional
+            accelerator package (e.g. Accelerator("omp", number_threads=8))
+            used by both interfaces.  If LAMMPS has not been compiled with
+            the package, a warning is issued and LAMMPS runs without it.
+
+        isolated : bool, optional
+            If true, the library of the internal interface is run in a
+            child process (see LammpsWorker), so a crash of LAMMPS does not
+            take down the driver.  After a crash, LAMMPS is restarted and
+            its state is restored from the datasets (as of the last run).
+            Not supported with an MPI communicator.
         """
         self.boundary_condition = DataContainer()
         self.BC = self.boundary_condition
@@ -61,14 +189,41 @@ class LammpsWrapper(ABCModelingEngine):
         self.SD = self.cuds_sd
 
         self._use_internal_interface = use_internal_interface
-        self._script_writer = ScriptWriter(AtomStyle.ATOMIC)
+        self._neighbor_settings = NeighborSettings()
+        self._decomposition_settings = None
+        self._script_writer = ScriptWriter(AtomStyle.ATOMIC,
+                                           self._neighbor_settings)
+        self._accelerator = accelerator
+        self._comm = comm
+        self._comm_size = 1 if comm is None else comm.Get_size()
+
+        if isolated and not self._use_internal_interface:
+            raise ValueError(
+                "Only the internal interface can be isolated")
+        if isolated and comm is not None:
+            raise ValueError(
+                "An isolated LAMMPS cannot be run with a communicator")
 
         if self._use_internal_interface:
-            import lammps
-            self._lammps = lammps.lammps(cmdargs=["-log", "none"])
+            if isolated:
+                create_lammps = LammpsWorker
+            else:
+                import lammps
+                create_lammps = lammps.lammps
+            cmdargs = ["-log", "none"]
+            if accelerator is not None:
+                cmdargs += get_accelerator_arguments(
+                    accelerator, _get_library_styles(create_lammps, comm))
+            if comm is None:
+                self._lammps = create_lammps(cmdargs=cmdargs)
+            else:
+                self._lammps = create_lammps(cmdargs=cmdargs, comm=comm)
             self._data_manager = LammpsInternalDataManager(self._lammps,
                                                            self.cuds_sd,
-                                                           AtomStyle.ATOMIC)
+                                                           AtomStyle.ATOMIC,
+                                                           comm=comm)
+            if isolated:
+                self._lammps.set_restart_handler(self._data_manager.restore)
         else:
             self._data_manager = LammpsFileIoDataManager(self.cuds_sd, AtomStyle.ATOMIC)
 
@@ -78,30 +233,67 @@ class LammpsWrapper(ABCModelingEngine):
         # Dataset uids which are added.
         self._dataset_uids = []
 
+        # MPI launcher of the file-io interface (None if run serially)
+        self._mpi_launcher = get_mpi_launcher_from_environment()
+
+        # imbalance factor of the last run (None if not reported)
+        self._imbalance_factor = None
+
+        # Tuning of the neighbor settings before runs (None if not tuned)
+        self._neighbor_tuning = None
+
+        # map from system fingerprint to its tuned neighbor settings
+        # (see _get_tuning_fingerprint)
+        self._tuned_neighbor_settings = {}
+
+        # asynchronous run which has not been finished yet (or None)
+        self._async_run = None
+
+        # Sampling of the trajectory during runs (None if not sampled)
+        self._trajectory_sampling = None
+
+        # temporary file of the sampled trajectory (None if not used)
+        self._trajectory_temp_file = None
+
+        # map from lammps atom id to particle uid of the sampled trajectory
+        self._trajectory_uids = {}
+
+        # fingerprints of the CUDS components as of the last load
+        # (see _get_cuds_fingerprints)
+        self._cuds_fingerprints = {}
+
+        # type-indexed snapshot of the CUDS (None until needed)
+        self._cuds_index = None
+
+        # uids of the datasets which the CUDS holds as proxy datasets
+        self._datasets_in_cuds = set()
+
         # Call the base class in order to load CUDS
         super(LammpsWrapper, self).__init__(**kwargs)
 
-    def _count_of(self, cuds, item_type):
-        """Workaround for broken CUDS counter."""
-        count = 0
-        for item in cuds.iter():
-            if isinstance(item, item_type):
-                count += 1
-        return count
+    def _get_cuds_index(self):
+        """Get the type-indexed snapshot of the CUDS.
+
+        The snapshot is shared by all checks and configuration steps.  It
+        is only replaced when loading the CUDS finds that it has changed
+        (see _load_cuds).
+        """
+        if self._cuds_index is None:
+            self._cuds_index = CudsIndex(self.cuds_sd)
+        return self._cuds_index
 
     def _check_cuds(self, cuds):
-        """Check the given cuds for consistency."""
+        """Check the given cuds (see CudsIndex) for consistency."""
         # FIXME: `count_of` is broken for non-meta classes,
         # e.g. Particles, Particle, Mesh, etc.
         # if cuds.count_of(CUBA.PARTICLES) != 1:
-        if self._count_of(cuds, scp.Particles) != 1:
+        number_datasets = cuds.count_instances(scp.Particles)
+        if number_datasets != 1:
             raise Exception('This version of simlammps'
                             ' needs only one particle dataset, not %s' %
-                            self._count_of(cuds, scp.Particles))
-        if cuds.count_of(CUBA.MATERIAL) != 1:
-            raise Exception('This version of simlammps needs'
-                            ' only one material not %s' %
-                            cuds.count_of(CUBA.MATERIAL))
+                            number_datasets)
+        if cuds.count_of(CUBA.MATERIAL) < 1:
+            raise Exception('simlammps needs at least one material')
 
         if cuds.count_of(CUBA.MOLECULAR_DYNAMICS) != 1:
             raise Exception('simlammps supports only MD')
@@ -109,8 +301,8 @@ class LammpsWrapper(ABCModelingEngine):
         if cuds.count_of(CUBA.BOX) != 1:
             raise Exception('simlammps needs one box')
 
-        if cuds.count_of(CUBA.INTERATOMIC_POTENTIAL) != 1:
-            raise Exception('Lammps needs one interatomic potention')
+        if cuds.count_of(CUBA.INTERATOMIC_POTENTIAL) < 1:
+            raise Exception('Lammps needs at least one interatomic potential')
 
         if cuds.count_of(CUBA.CONDITION) != 1:
             raise Exception('Sorry only one condition is accepted, not %s' %
@@ -119,12 +311,47 @@ class LammpsWrapper(ABCModelingEngine):
         if not cuds.count_of(CUBA.INTEGRATION_TIME):
             raise Exception('Only one integration time setup is accepted')
 
+    def _get_cuds_fingerprints(self, cuds):
+        """Get fingerprints of the CUDS components loaded by the wrapper.
+
+        Returns
+        -------
+        dict
+            map from name of component to the fingerprints of its items.
+            Particle datasets are represented by a map from their uid to
+            their fingerprint (see _get_dataset_fingerprint).
+
+        """
+        fingerprints = {}
+        for component, item_type in _CUDS_COMPONENTS:
+            fingerprints[component] = tuple(
+                get_fingerprint(item) for item in cuds.iter(item_type=item_type))
+        fingerprints['datasets'] = {
+            particle_container.uid: _get_dataset_fingerprint(particle_container)
+            for particle_container in cuds.iter(item_type=CUBA.PARTICLES)}
+        return fingerprints
+
     def _load_cuds(self):
-        """Load CUDS data into lammps engine."""
-        cuds = self.get_cuds()
-        if not cuds:
+        """Load CUDS data into lammps engine.
+
+        Only the CUDS components which have changed since the last load
+        are processed again.
+        """
+        if not self.get_cuds():
             return
 
+        # the snapshot of the CUDS taken for this load replaces the
+        # current one (see _get_cuds_index) only if the CUDS has changed
+        cuds = CudsIndex(self.cuds_sd)
+
+        fingerprints = self._get_cuds_fingerprints(cuds)
+        changed = set(
+            component for component, fingerprint in fingerprints.iteritems()
+            if fingerprint != self._cuds_fingerprints.get(component))
+        if not changed:
+            return
+        self._cuds_index = cuds
+
         # Move checks to a separate method
         self._check_cuds(cuds)
 
@@ -138,66 +365,161 @@ class LammpsWrapper(ABCModelingEngine):
             material_to_atom[mat.uid] = number_atom_types
             materials.append(mat)
 
-        if len(materials) != 1:
-            raise Exception('Invalid number of materials provided: %d' % len(materials))
+        if sum(number_particles for _, number_particles, _
+               in fingerprints['datasets'].itervalues()) == 0:
+            raise Exception('simlammps needs some particles')
+
+        if changed & {'materials', 'interatomic_potential'}:
+            self.solver_parameters[CUBA.PAIR_POTENTIAL] = \
+                self._get_pair_potential(cuds, material_to_atom)
 
+        # the data of each dataset depends on the material and the box
+        reload_datasets = bool(changed & {'materials', 'box'})
+        loaded_datasets = self._cuds_fingerprints.get('datasets', {})
         box = self._get_box(cuds)
-        particle_sum = 0
 
         for particle_container in cuds.iter(item_type=CUBA.PARTICLES):
-            particle_sum += len(particle_container)
-            self._assign_material_to_particles(particle_container, materials[0])
-            data = materials[0].data
-            data.update({CUBA.VECTOR: box.vector})
-            particle_container.data = data
+            if not reload_datasets and \
+                    loaded_datasets.get(particle_container.uid) == \
+                    fingerprints['datasets'][particle_container.uid]:
+                continue
+            if len(materials) == 1:
+                # the material is recorded once for the whole dataset
+                # copy as the data of the material must not be changed
+                data = DataContainer(materials[0].data)
+                data.update({CUBA.VECTOR: box.vector,
+                             CUBA.MATERIAL_TYPE: materials[0].uid})
+                particle_container.data = data
+                self._assign_material_to_particles(particle_container,
+                                                   materials[0])
+            else:
+                # each particle has to have one of the materials
+                data = DataContainer(particle_container.data)
+                data[CUBA.VECTOR] = box.vector
+                if CUBA.MATERIAL_TYPE in data:
+                    del data[CUBA.MATERIAL_TYPE]
+                particle_container.data = data
+                self._check_material_of_particles(particle_container,
+                                                  material_to_atom)
             # Add dataset when it is not already there. Rely on uid.
             if particle_container.uid not in self._dataset_uids:
                 self.add_dataset(particle_container)
                 self._dataset_uids.append(particle_container.uid)
+            # the data has been changed by loading the dataset
+            fingerprints['datasets'][particle_container.uid] = \
+                _get_dataset_fingerprint(particle_container)
+
+        if 'thermostat' in changed:
+            # TODO: add thermo check. else?
+            for thermo in cuds.iter(item_type=CUBA.THERMOSTAT):
+                if isinstance(thermo, api.TemperatureRescaling):
+                    self.computational_model[CUBA.THERMODYNAMIC_ENSEMBLE] = 'NVE'
+
+        if 'integration_time' in changed:
+            for integration_time in cuds.iter(item_type=CUBA.INTEGRATION_TIME):
+                self.computational_model[CUBA.TIME_STEP] = integration_time.step
+                self.computational_model[CUBA.NUMBER_OF_TIME_STEPS] =\
+                    int(integration_time.final / integration_time.step)
+
+        if 'condition' in changed:
+            for condition in cuds.iter(item_type=CUBA.CONDITION):
+                if isinstance(condition, api.Periodic):
+                    self.boundary_condition[CUBA.FACE] = [
+                        'periodic',
+                        'periodic',
+                        'periodic']
+                    continue
+                raise Exception('Sorry, I am confused!')
 
-        if particle_sum == 0:
-            raise Exception('simlammps needs some particles')
+        self._cuds_fingerprints = fingerprints
 
-        # TODO: add thermo check. else?
-        for thermo in cuds.iter(item_type=CUBA.THERMOSTAT):
-            if isinstance(thermo, api.TemperatureRescaling):
-                self.computational_model[CUBA.THERMODYNAMIC_ENSEMBLE] = 'NVE'
-
-        for integration_time in cuds.iter(item_type=CUBA.INTEGRATION_TIME):
-            self.computational_model[CUBA.TIME_STEP] = integration_time.step
-            self.computational_model[CUBA.NUMBER_OF_TIME_STEPS] =\
-                int(integration_time.final / integration_time.step)
-
-        for condition in cuds.iter(item_type=CUBA.CONDITION):
-            if isinstance(condition, api.Periodic):
-                self.boundary_condition[CUBA.FACE] = [
-                    'periodic',
-                    'periodic',
-                    'periodic']
-                continue
-            raise Exception('Sorry, I am confused!')
-
-        interatomic_potential = self._get_interatomic_potential(cuds)
-
-        self.solver_parameters[CUBA.PAIR_POTENTIAL] =\
-            'lj:\n  global_cutoff: {global_cutoff}\n'\
-            '  parameters:\n  - pair: [{mat1}, {mat2}]\n'\
-            '    epsilon: {energy_well_depth}\n'\
-            '    sigma: {vanderwaals_radious}\n'\
-            '    cutoff: {cutoff}\n'\
-            .format(global_cutoff=1.12246,
-                    mat1=material_to_atom[interatomic_potential.material[0].uid],
-                    mat2=material_to_atom[interatomic_potential.material[1].uid],
-                    energy_well_depth=interatomic_potential.energy_well_depth,
-                    vanderwaals_radious=interatomic_potential.van_der_waals_radius,
-                    cutoff=interatomic_potential.cutoff_distance)
+    def _get_pair_potential(self, cuds, material_to_atom):
+        """Get the pair style (see CUBA.PAIR_POTENTIAL) of the CUDS.
+
+        Each material needs a Lennard-Jones potential with itself.  The
+        coefficients of pairs of different materials without an explicit
+        potential are mixed by LAMMPS (see _LJ_MIXING_RULE), so only one
+        pair coefficient per material (and per explicit pair) is generated.
+        """
+        potentials = {}
+        for interatomic_potential in cuds.iter(
+                item_type=CUBA.INTERATOMIC_POTENTIAL):
+            if not isinstance(interatomic_potential, api.LennardJones_6_12):
+                raise Exception('Unsupported interatomic potential: %s' %
+                                type(interatomic_potential).__name__)
+            try:
+                pair = tuple(sorted(material_to_atom[material.uid]
+                                    for material
+                                    in interatomic_potential.material))
+            except KeyError:
+                raise Exception('Interatomic potential of an unknown material')
+            if pair in potentials:
+                raise Exception('Multiple interatomic potentials for the '
+                                'same pair of materials')
+            potentials[pair] = interatomic_potential
+
+        missing = [atom_type for atom_type in sorted(material_to_atom.values())
+                   if (atom_type, atom_type) not in potentials]
+        if missing:
+            raise Exception('Each material needs an interatomic potential '
+                            'with itself (%d materials are missing one)' %
+                            len(missing))
+
+        pair_params = {
+            pair: [interatomic_potential.energy_well_depth,
+                   interatomic_potential.van_der_waals_radius,
+                   interatomic_potential.cutoff_distance]
+            for pair, interatomic_potential in potentials.iteritems()}
+        return PairStyle(pair_infos=[
+            PairStyleInfo(pair_style='lj/cut',
+                          global_params=[_LJ_GLOBAL_CUTOFF],
+                          pair_params=pair_params,
+                          mix=_LJ_MIXING_RULE)])
+
+    def _check_material_of_particles(self, particle_container, material_to_atom):
+        """Check that every particle has one of the materials of the CUDS."""
+        material_types = _get_material_types(particle_container)
+        if material_types is None or \
+                not material_types.issubset(material_to_atom):
+            raise Exception('Each particle needs one of the materials '
+                            '(CUBA.MATERIAL_TYPE) of the CUDS')
 
     def _assign_material_to_particles(self, particle_container, material):
+        """Assign the material to the particles which do not have it.
+
+        If the dataset provides arrays (e.g. LammpsParticles), the particles
+        with a different material are found with one array query and
+        updated with one array call.
+        """
+        if hasattr(particle_container, 'set_attribute'):
+            try:
+                material_types = particle_container.get_attribute(
+                    CUBA.MATERIAL_TYPE)
+            except KeyError:
+                # not all particles have a material
+                pass
+            else:
+                uids = particle_container.get_uids()
+                different = numpy.flatnonzero(material_types != material.uid)
+                if len(different):
+                    particle_container.set_attribute(
+                        CUBA.MATERIAL_TYPE,
+                        [material.uid] * len(different),
+                        uids=[uids[i] for i in different])
+                return
+
         update_list = []
-        for particle in particle_container.iter():
-            particle.data[CUBA.MATERIAL_TYPE] = material.uid
-            update_list.append(particle)
-        particle_container.update(update_list)
+        for particle in particle_container.iter(item_type=CUBA.PARTICLE):
+            if particle.data.get(CUBA.MATERIAL_TYPE) != material.uid:
+                # the iterated particles can be read-only records
+                data = DataContainer(particle.data)
+                data[CUBA.MATERIAL_TYPE] = material.uid
+                update_list.append(scp.Particle(
+                    uid=particle.uid,
+                    coordinates=particle.coordinates,
+                    data=data))
+        if update_list:
+            particle_container.update(update_list)
 
 
     def _get_box(self, cuds):
@@ -209,16 +531,6 @@ class LammpsWrapper(ABCModelingEngine):
             raise Exception('Invalid number of boxes provided: %d' % len(boxes))
         return boxes[0]
 
-    def _get_interatomic_potential(self, cuds):
-        ips = []
-        for interatomic_potential in cuds.iter(item_type=CUBA.INTERATOMIC_POTENTIAL):
-            ips.append(interatomic_potential)
-
-        if len(ips) != 1:
-            raise Exception('Wrong number of interatomic potentials: %d' % len(ips))
-
-        return ips[0]
-
     def add_dataset(self, container):
         """Add a CUDS container.
 
@@ -291,6 +603,7 @@ class LammpsWrapper(ABCModelingEngine):
 
         """
         if name in self._data_manager:
+            self._datasets_in_cuds.discard(self._data_manager[name].uid)
             del self._data_manager[name]
         else:
             raise ValueError("Particles '{}\\' does not exist".format(name))
@@ -316,51 +629,620 @@ class LammpsWrapper(ABCModelingEngine):
                 raise ValueError("Particle container '{}\\` does not exist"
                                  .format(name))
 
+    def set_trajectory_sampling(self, every, attributes=None, filename=None):
+        """Sample the trajectory during the following runs.
+
+        The per-atom quantities are written by LAMMPS every 'every' steps
+        while running, so the trajectory of a run is captured with a single
+        LAMMPS run.  After each run, the samples can be accessed with
+        get_trajectory.
+
+        Parameters
+        ----------
+        every : int
+            number of steps between samples. If None, the trajectory
+            is no longer sampled.
+        attributes : sequence of str, optional
+            per-atom quantities to be sampled (as named by LAMMPS's
+            `dump custom`, e.g. "x", "vx", "fx").  If None, then
+            coordinates and velocities are sampled.
+        filename : str, optional
+            name of the (dump) file where the samples are written to. If
+            None, then a file in the temporary directory is used. The file
+            is overwritten by each run.
+
+        """
+        self._remove_trajectory_temp_file()
+        if every is None:
+            self._trajectory_sampling = None
+            return
+
+        if filename is None:
+            handle, filename = tempfile.mkstemp(suffix='.lammpstrj')
+            os.close(handle)
+            self._trajectory_temp_file = filename
+
+        self._trajectory_sampling = TrajectorySampling(
+            every=every,
+            filename=os.path.abspath(filename),
+            attributes=attributes)
+
+    def _remove_trajectory_temp_file(self):
+        """Remove the temporary file of the sampled trajectory (if any)."""
+        if self._trajectory_temp_file is not None:
+            if os.path.exists(self._trajectory_temp_file):
+                os.remove(self._trajectory_temp_file)
+            self._trajectory_temp_file = None
+
+    def get_trajectory(self):
+        """Get the trajectory sampled during the last run.
+
+        The frames of the returned reader are read from file one by one
+        and the atoms of each frame are ordered by their lammps id (see
+        get_trajectory_uids).
+
+        Returns
+        -------
+        trajectory : LammpsDumpFileReader
+            reader of the sampled frames
+
+        Raises
+        ------
+        RuntimeError:
+            If the trajectory was not sampled
+
+        """
+        self._data_manager.run_guard.wait()
+        if not self._trajectory_sampling or not self._trajectory_uids:
+            raise RuntimeError("No trajectory was sampled")
+        return LammpsDumpFileReader(self._trajectory_sampling.filename)
+
+    def get_trajectory_uids(self):
+        """Get the particle uids of the atoms in the sampled trajectory.
+
+        Returns
+        -------
+        dict
+            map from lammps atom id to particle uid
+
+        """
+        self._data_manager.run_guard.wait()
+        return dict(self._trajectory_uids)
+
+    def set_mpi_launcher(self, number_processes, launcher='mpirun',
+                         bind_to=None, hostfile=None, extra_arguments=None):
+        """Run LAMMPS in parallel (with MPI) in the following runs.
+
+        Only the file-io interface launches LAMMPS.  The default launcher
+        is configured by the environment (SIM_LAMMPS_MPI_NP,
+        SIM_LAMMPS_MPI_LAUNCHER, SIM_LAMMPS_MPI_BIND and
+        SIM_LAMMPS_MPI_HOSTFILE).
+
+        Parameters
+        ----------
+        number_processes : int
+            number of (MPI) processes. If None, LAMMPS is run serially.
+        launcher : str, optional
+            name of the MPI launcher executable
+        bind_to : str, optional
+            what the processes are bound to (e.g. "core"). If None, the
+            default binding of the launcher is used.
+        hostfile : str, optional
+            name of the hostfile
+        extra_arguments : sequence of str, optional
+            additional arguments passed to the launcher
+
+        """
+        if number_processes is None:
+            self._mpi_launcher = None
+            return
+
+        self._mpi_launcher = MpiLauncher(number_processes,
+                                         launcher=launcher,
+                                         bind_to=bind_to,
+                                         hostfile=hostfile,
+                                         extra_arguments=extra_arguments)
+
+    def set_neighbor_settings(self, neighbor_settings=None, **kwargs):
+        """Set the neighbor-list and atom-sorting settings.
+
+        Parameters
+        ----------
+        neighbor_settings : NeighborSettings, optional
+            settings. If None, then the settings are created from the
+            keyword arguments (see NeighborSettings), e.g.
+            set_neighbor_settings(skin=0.5, every=2, sort_every=500).
+
+        Raises
+        ------
+        ValueError
+            if a setting is not valid
+
+        """
+        if neighbor_settings is None:
+            neighbor_settings = NeighborSettings(**kwargs)
+        self._neighbor_settings = neighbor_settings
+        self._script_writer = ScriptWriter(AtomStyle.ATOMIC,
+                                           neighbor_settings,
+                                           self._decomposition_settings)
+        if self._use_internal_interface:
+            self._data_manager.set_neighbor_settings(neighbor_settings)
+
+    def set_decomposition_settings(self, decomposition_settings=None,
+                                   **kwargs):
+        """Set the domain decomposition and load balancing of parallel runs.
+
+        The settings apply to parallel runs of both interfaces (see
+        set_mpi_launcher and the 'comm' of the internal interface).  After
+        each run, the imbalance factor of the particles can be queried with
+        get_imbalance_factor.
+
+        Parameters
+        ----------
+        decomposition_settings : DecompositionSettings, optional
+            settings. If None, then the settings are created from the
+            keyword arguments (see DecompositionSettings), e.g.
+            set_decomposition_settings(comm_style='tiled',
+            fix_balance=Balance('rcb', every=1000)).
+
+        Raises
+        ------
+        ValueError
+            if a setting is not valid
+
+        """
+        if decomposition_settings is None:
+            decomposition_settings = DecompositionSettings(**kwargs)
+        self._decomposition_settings = decomposition_settings
+        self._script_writer = ScriptWriter(AtomStyle.ATOMIC,
+                                           self._neighbor_settings,
+                                           decomposition_settings)
+        if self._use_internal_interface:
+            self._data_manager.set_decomposition_settings(
+                decomposition_settings)
+
+    def get_imbalance_factor(self):
+        """Get the imbalance factor of the particles after the last run.
+
+        The imbalance factor is the maximum over the average number of
+        particles of a process, as reported by LAMMPS after the run.
+
+        Returns
+        -------
+        float
+            imbalance factor (1.0 if the load is perfectly balanced)
+
+        Raises
+        ------
+        RuntimeError:
+            If no decomposition settings are set (or no run has reported
+            the imbalance)
+
+        """
+        self._data_manager.run_guard.wait()
+        if not self._decomposition_settings or \
+                self._imbalance_factor is None:
+            raise RuntimeError("No imbalance factor was reported")
+        return self._imbalance_factor
+
+    def set_neighbor_tuning(self, number_steps, skins=None,
+                            modify_options=None):
+        """Tune the neighbor settings before the following runs.
+
+        Before a run, each candidate setting (each combination of a skin
+        and a set of `neigh_modify` options) is run for a few steps and
+        the fastest setting (see NeighborTuning) is used by the run.  The
+        chosen setting is reused by the later runs of the same system
+        (i.e. the same number of particles, box, pair potential, time step
+        and parallel setup), so these runs are not tuned again.
+
+        The probe runs do not change the state of the particles.
+
+        Parameters
+        ----------
+        number_steps : int
+            number of steps of each probe run. If None, the neighbor
+            settings are no longer tuned.
+        skins : sequence of float, optional
+            candidate skin distances
+        modify_options : sequence of dict, optional
+            candidate `neigh_modify` options,
+            e.g. [{'every': 1, 'delay': 0}, {'every': 2, 'delay': 0}]
+
+        Raises
+        ------
+        ValueError
+            if a candidate is not valid
+
+        """
+        if number_steps is None:
+            self._neighbor_tuning = None
+            return
+
+        self._neighbor_tuning = NeighborTuning(number_steps,
+                                               skins=skins,
+                                               modify_options=modify_options)
+
     def run(self):
         """Run lammps-engine based on configuration and data."""
-        if self._run_count > 0:
-            self._load_cuds()
+        self._finish_async_run()
+        self._prepare_run()
+        run_guard = self._data_manager.run_guard
+        run_guard.begin()
+        run_guard.attach()
+        try:
+            self._run()
+        finally:
+            run_guard.end()
+        self._update_cuds()
+
+    def run_async(self):
+        """Start a run of the lammps-engine and return without waiting.
+
+        The CUDS is loaded before returning and the run is then carried
+        out by a worker thread (which waits for the LAMMPS process of the
+        file-io interface or calls the LAMMPS library of the internal
+        interface), so other work can be done meanwhile.  Until the run
+        has finished, any access to the datasets (and results) of the
+        engine is blocked, so the datasets are always consistent.  The
+        configuration (e.g. CM, BC, SP and CUDS) must not be changed until
+        the run has finished.
+
+        The worker thread does not change the CUDS: its datasets are
+        replaced by the datasets of the engine when get is called (or
+        when the next run is started).
 
+        Returns
+        -------
+        AsyncRun
+            result of the run (see wait, ready and get). get re-raises
+            any exception of the run.
+
+        """
+        self._finish_async_run()
+        self._prepare_run()
+        self._data_manager.run_guard.begin()
+        self._async_run = AsyncRun(self._run_attached, self._update_cuds)
+        return self._async_run
+
+    def _run_attached(self):
+        """Carry out a run begun by run_async (in the worker thread)."""
+        run_guard = self._data_manager.run_guard
+        run_guard.attach()
+        try:
+            self._run()
+        finally:
+            run_guard.end()
+
+    def _finish_async_run(self):
+        """Wait for the last asynchronous run and finish it (if successful).
+
+        Errors of the run are only raised by its get.
+        """
+        async_run, self._async_run = self._async_run, None
+        if async_run is not None:
+            async_run.wait()
+            if async_run.successful():
+                async_run.get()
+
+    def _run(self):
+        """Carry out a (prepared) run of either interface.
+
+        The CUDS is neither read nor changed (see _prepare_run and
+        _update_cuds), so the run can be carried out by a worker thread.
+        """
         if self._use_internal_interface:
             self._data_manager.flush()
-            commands = ''
-            commands += ScriptWriter.get_pair_style(self.solver_parameters)
-            commands += ScriptWriter.get_fix(CM=self.computational_model)
-            commands += ScriptWriter.get_pair_coeff(self.solver_parameters)
-            commands += ScriptWriter.get_boundary(self.boundary_condition, change_existing_boundary=True)
-            commands += ScriptWriter.get_run(CM=self.computational_model)
-            for command in commands.splitlines():
-                self._lammps.command(command)
+            if self._neighbor_tuning:
+                self._tune_neighbor_settings(None)
+            commands = self._get_internal_setup_commands()
+            if self._trajectory_sampling:
+                commands += ScriptWriter.get_dump(self._trajectory_sampling)
+            self._run_internal_commands(commands)
+
+            # the dump and balancing are stopped even if the run fails, so
+            # that the next run can start them again
+            cleanup_commands = ''
+            if self._trajectory_sampling:
+                cleanup_commands += ScriptWriter.get_undump()
+            if self._decomposition_settings:
+                cleanup_commands += ScriptWriter.get_unbalance(
+                    self._decomposition_settings)
+            number_restarts = _get_number_restarts(self._lammps)
+            try:
+                commands = ScriptWriter.get_run(CM=self.computational_model)
+                if self._decomposition_settings:
+                    self._imbalance_factor = self._run_internal_logged(
+                        commands, _get_imbalance_factor)
+                else:
+                    self._run_internal_commands(commands)
+            finally:
+                # a restarted (isolated) LAMMPS has nothing to stop
+                if _get_number_restarts(self._lammps) == number_restarts:
+                    self._run_internal_commands(cleanup_commands)
             # after running, we read any changes from lammps
             self._data_manager.read()
         else:
             with _TEMP_DIRECTORY() as temp_dir:
-                input_data_filename = os.path.join(temp_dir, 'data_in.lammps')
-                output_data_filename = os.path.join(temp_dir,
-                                                    'data_out.lammps')
-                self._data_manager.flush(input_data_filename)
-
-                commands = self._script_writer.get_configuration(
-                    input_data_file=input_data_filename,
-                    output_data_file=output_data_filename,
-                    BC=self.boundary_condition,
-                    CM=self.computational_model,
-                    SP=self.solver_parameters,
-                    materials=[mat for mat in self.cuds_sd.iter(item_type=CUBA.MATERIAL)])
-
-                process = LammpsProcess(lammps_name=os.environ.get('SIM_LAMMPS_BIN', 'lammps'),
-                                        log_directory=temp_dir)
-
+                commands = self._prepare_file_io_run(temp_dir)
+                process = self._create_lammps_process(temp_dir)
                 process.run(commands)
-                self._data_manager.read(output_data_filename)
+                self._finish_file_io_run(
+                    temp_dir, log_filename=os.path.join(temp_dir,
+                                                        'log.lammps'))
+
+        self._finish_run()
+
+    def _prepare_run(self):
+        """Prepare a run (of either interface)."""
+        # the CUDS could have been changed since the last run
+        if self._run_count > 0:
+            self._load_cuds()
+
+    def _finish_run(self):
+        """Finish a run (of either interface)."""
+        if self._trajectory_sampling:
+            self._trajectory_uids = self._data_manager.get_uids_of_lammps_ids()
+
         # A naive flag for the next run.
         self._run_count += 1
 
+    def _update_cuds(self):
+        """Replace the datasets of the CUDS after a run."""
         if self.get_cuds():
-            # Replace datasets in CUDS with proxy ones.
-            for ds_name in self._data_manager:
-                proxy_dataset = self.get_dataset(ds_name)
-                cuds_dataset = self.get_cuds().get_by_name(ds_name)
-                # FIXME: don't touch internal state of proxy_dataset. Add a param.
-                proxy_dataset._uid = cuds_dataset.uid
-                self.get_cuds().update([self.get_dataset(ds_name)])
+            self._replace_cuds_datasets()
+
+    def _prepare_file_io_run(self, temp_dir, suffix=''):
+        """Prepare a run of the file-io interface.
+
+        The input data file is written to the temporary directory.
+
+        Parameters
+        ----------
+        temp_dir : str
+            name of the temporary directory of the run
+        suffix : str, optional
+            suffix of the names of the data files (to tell the files of
+            several engines apart)
+
+        Returns
+        -------
+        str
+            commands of the run
+
+        """
+        input_data_filename = os.path.join(
+            temp_dir, 'data_in{}.lammps'.format(suffix))
+        output_data_filename = os.path.join(
+            temp_dir, 'data_out{}.lammps'.format(suffix))
+        self._data_manager.flush(input_data_filename)
+
+        if self._neighbor_tuning:
+            self._tune_neighbor_settings(input_data_filename)
+
+        return self._script_writer.get_configuration(
+            input_data_file=input_data_filename,
+            output_data_file=output_data_filename,
+            BC=self.boundary_condition,
+            CM=self.computational_model,
+            SP=self.solver_parameters,
+            materials=list(self._get_cuds_index().get_items(CUBA.MATERIAL)),
+            trajectory_sampling=self._trajectory_sampling)
+
+    def _finish_file_io_run(self, temp_dir, log_filename, suffix=''):
+        """Read the results of a run of the file-io interface.
+
+        Parameters
+        ----------
+        temp_dir : str
+            name of the temporary directory of the run
+        log_filename : str
+            name of the log file of the run
+        suffix : str, optional
+            suffix of the names of the data files (see _prepare_file_io_run)
+
+        """
+        self._data_manager.read(os.path.join(
+            temp_dir, 'data_out{}.lammps'.format(suffix)))
+        if self._decomposition_settings:
+            self._imbalance_factor = _get_imbalance_factor(
+                read_run_timings(log_filename))
+
+    def _get_internal_setup_commands(self):
+        """Get the commands which configure a run of the internal interface."""
+        commands = ''
+        commands += ScriptWriter.get_pair_style(self.solver_parameters)
+        commands += ScriptWriter.get_fix(CM=self.computational_model)
+        commands += ScriptWriter.get_pair_coeff(self.solver_parameters)
+        commands += ScriptWriter.get_boundary(self.boundary_condition, change_existing_boundary=True)
+        if self._decomposition_settings:
+            commands += ScriptWriter.get_balance(self._decomposition_settings)
+        return commands
+
+    def _create_lammps_process(self, temp_dir):
+        """Create the LAMMPS process of the file-io interface."""
+        return LammpsProcess(lammps_name=_get_lammps_name(),
+                             log_directory=temp_dir,
+                             mpi_launcher=self._mpi_launcher,
+                             arguments=self._get_accelerator_arguments())
+
+    def _get_accelerator_arguments(self):
+        """Get the command-line arguments of the accelerator (file-io)."""
+        if self._accelerator is None:
+            return []
+        return get_accelerator_arguments(
+            self._accelerator,
+            get_lammps_styles(_get_lammps_name()),
+            pair_styles=[
+                pair_info.pair_style for pair_info
+                in get_pair_style(self.solver_parameters).pair_infos])
+
+    def _get_tuning_fingerprint(self, candidates):
+        """Get the fingerprint of the system whose neighbor settings are tuned.
+
+        Runs with the same fingerprint (and candidate settings) are expected
+        to perform alike, so the tuned neighbor settings are reused by them.
+        """
+        datasets = tuple(sorted(
+            (dataset.count_of(CUBA.PARTICLE),
+             tuple(tuple(vector)
+                   for vector in dataset.data.get(CUBA.VECTOR, ())))
+            for dataset in self.iter_datasets()))
+        if self._use_internal_interface:
+            parallel_setup = ('internal', self._comm_size)
+        else:
+            parallel_setup = ('file-io',
+                              self._mpi_launcher.number_processes
+                              if self._mpi_launcher else 1)
+        return (self._neighbor_tuning.number_steps,
+                tuple(candidates),
+                parallel_setup,
+                self._accelerator.get_command_line_arguments()
+                if self._accelerator else None,
+                self._decomposition_settings,
+                datasets,
+                self.solver_parameters.get(CUBA.PAIR_POTENTIAL),
+                self.computational_model.get(CUBA.TIME_STEP),
+                tuple(self.boundary_condition.get(CUBA.FACE, ())))
+
+    def _tune_neighbor_settings(self, input_data_filename):
+        """Tune the neighbor settings (unless known for this system).
+
+        Parameters
+        ----------
+        input_data_filename : str
+            name of the data file of the file-io interface (None if the
+            internal interface is used)
+
+        """
+        candidates = self._neighbor_tuning.get_candidates(
+            self._neighbor_settings)
+        fingerprint = self._get_tuning_fingerprint(candidates)
+        neighbor_settings = self._tuned_neighbor_settings.get(fingerprint)
+        if neighbor_settings is None:
+            if self._use_internal_interface:
+                neighbor_settings = self._run_internal_probes(candidates)
+            else:
+                neighbor_settings = self._run_file_io_probes(
+                    candidates, input_data_filename)
+            self._tuned_neighbor_settings[fingerprint] = neighbor_settings
+
+        if neighbor_settings != self._neighbor_settings:
+            self.set_neighbor_settings(neighbor_settings)
+
+    def _get_probe_computational_model(self):
+        """Get the computational model of the (zero step) set-up of the probes."""
+        CM = DataContainer(self.computational_model)
+        CM[CUBA.NUMBER_OF_TIME_STEPS] = 0
+        return CM
+
+    def _run_file_io_probes(self, candidates, input_data_filename):
+        """Run the probes of the neighbor settings with a separate process.
+
+        The state of the particles is read from the input data file and
+        no results are written, so the probes do not change the state.
+        """
+        with _TEMP_DIRECTORY() as temp_dir:
+            commands = self._script_writer.get_configuration(
+                input_data_file=input_data_filename,
+                output_data_file=None,
+                BC=self.boundary_condition,
+                CM=self._get_probe_computational_model(),
+                SP=self.solver_parameters,
+                materials=list(self._get_cuds_index().get_items(CUBA.MATERIAL)))
+            commands += self._neighbor_tuning.get_probe_commands(candidates)
+
+            process = self._create_lammps_process(temp_dir)
+            process.run(commands)
+            return self._neighbor_tuning.select(
+                candidates,
+                read_run_timings(os.path.join(temp_dir, 'log.lammps')))
+
+    def _run_internal_probes(self, candidates):
+        """Run the probes of the neighbor settings with the library.
+
+        Afterwards, the state of the particles and the step counter are
+        restored.
+        """
+        step = self._lammps.extract_global('ntimestep', 0)
+        commands = self._get_internal_setup_commands()
+        commands += ScriptWriter.get_run(
+            CM=self._get_probe_computational_model())
+        commands += self._neighbor_tuning.get_probe_commands(candidates)
+        neighbor_settings = self._run_internal_logged(
+            commands,
+            lambda timings: self._neighbor_tuning.select(candidates, timings))
+        self._lammps.command('reset_timestep {}'.format(step))
+
+        # the probes have moved the atoms
+        self._data_manager.flush()
+        return neighbor_settings
+
+    def _run_internal_commands(self, commands):
+        """Run commands (one per line) with the library."""
+        for command in commands.splitlines():
+            self._lammps.command(command)
+
+    def _run_internal_logged(self, commands, evaluate):
+        """Run commands with the library while logging to a temporary file.
+
+        The log is only written (and evaluated) by the root rank and the
+        result of the evaluation is shared by all ranks.
+
+        Parameters
+        ----------
+        commands : str
+            commands
+        evaluate : callable
+            called with the timings of the runs of the log (see
+            read_run_timings) and returns the result
+
+        """
+        is_root = self._comm is None or self._comm.Get_rank() == 0
+        log_filename = None
+        if is_root:
+            handle, log_filename = tempfile.mkstemp(suffix='.log')
+            os.close(handle)
+        if self._comm is not None:
+            log_filename = self._comm.bcast(log_filename, root=0)
+
+        result = None
+        try:
+            self._lammps.command('log {}'.format(log_filename))
+            try:
+                self._run_internal_commands(commands)
+            finally:
+                self._lammps.command('log none')
+            if is_root:
+                result = evaluate(read_run_timings(log_filename))
+        finally:
+            if is_root:
+                os.remove(log_filename)
+        if self._comm is not None:
+            result = self._comm.bcast(result, root=0)
+        return result
+
+    def _replace_cuds_datasets(self):
+        """Replace the datasets in CUDS with the proxy ones.
+
+        The proxy dataset has the uid of the dataset it was created from,
+        so each dataset of the CUDS is only replaced once (i.e. the CUDS
+        then holds the proxy).
+        """
+        cuds = self._get_cuds_index()
+        proxy_datasets = []
+        for proxy_dataset in self.iter_datasets():
+            if proxy_dataset.uid in self._datasets_in_cuds:
+                continue
+            try:
+                cuds.get(proxy_dataset.uid)
+            except KeyError:
+                # dataset was not added from the CUDS
+                continue
+            proxy_datasets.append(proxy_dataset)
+
+        if proxy_datasets:
+            self.get_cuds().update(proxy_datasets)
+            cuds.update(proxy_datasets)
+            self._datasets_in_cuds.update(
+                proxy_dataset.uid for proxy_dataset in proxy_datasets)
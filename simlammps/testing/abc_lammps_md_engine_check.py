@@ -1,4 +1,5 @@
 import abc
+import time
 from functools import partial
 
 from numpy.testing import assert_almost_equal
@@ -140,6 +141,27 @@ class ABCLammpsMDEngineCheck(object):
             p_w = foo_w.get(p.uid)
             assert_almost_equal(p_w.coordinates, p.coordinates)
 
+    def test_run_sample_trajectory(self):
+        self._md_configurator.configure_wrapper(self.wrapper)
+        self.wrapper.CM[CUBA.NUMBER_OF_TIME_STEPS] = 10
+        self.wrapper.set_trajectory_sampling(every=5)
+
+        self.wrapper.run()
+
+        uids = self.wrapper.get_trajectory_uids()
+        frames = [frame for frame in self.wrapper.get_trajectory()]
+        self.assertEqual([frame.timestep for frame in frames], [0, 5, 10])
+
+        # last sample matches the state after the run
+        last_frame = frames[-1]
+        coordinates = last_frame.get_coordinates()
+        for index, lammps_id in enumerate(last_frame["id"]):
+            uid = uids[lammps_id]
+            for particles in self.wrapper.iter_datasets():
+                if particles.has(uid):
+                    assert_almost_equal(particles.get(uid).coordinates,
+                                        coordinates[index])
+
     def test_run_incomplete_cm(self):
         self._md_configurator.configure_wrapper(self.wrapper)
 
@@ -148,3 +170,39 @@ class ABCLammpsMDEngineCheck(object):
 
         with self.assertRaises(RuntimeError):
             self.wrapper.run()
+
+    def test_run_async(self):
+        self._md_configurator.configure_wrapper(self.wrapper)
+        particles = next(self.wrapper.iter_datasets())
+        events = []
+        run = self.wrapper._run
+
+        def slow_run():
+            time.sleep(0.2)
+            run()
+            events.append("run ended")
+
+        self.wrapper._run = slow_run
+        result = self.wrapper.run_async()
+
+        # the access is blocked until the run has ended
+        particles.count_of(CUBA.PARTICLE)
+        events.append("accessed")
+        result.get()
+
+        self.assertEqual(events, ["run ended", "accessed"])
+        self.assertTrue(result.successful())
+
+    def test_run_async_error(self):
+        self._md_configurator.configure_wrapper(self.wrapper)
+
+        # remove CM configuration
+        self.wrapper.CM.clear()
+
+        result = self.wrapper.run_async()
+        with self.assertRaises(RuntimeError):
+            result.get()
+
+        # the datasets can be accessed after the failed run
+        for particles in self.wrapper.iter_datasets():
+            particles.count_of(CUBA.PARTICLE)
@@ -0,0 +1,137 @@
+import unittest
+import uuid
+
+import numpy
+from numpy.testing import assert_almost_equal
+
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.particles import Particle
+from simphony.testing.abc_check_particles import (
+    CheckAddingParticles, CheckManipulatingParticles)
+
+from simlammps.columnar_particles import ColumnarParticles
+from simlammps.common.utils import MaterialLookupTable
+
+
+def _create_empty_columnar_particles(name):
+    return ColumnarParticles(name=name, coordinates=numpy.zeros((0, 3)))
+
+
+class TestColumnarParticlesAddParticles(
+        CheckAddingParticles, unittest.TestCase):
+
+    def container_factory(self, name):
+        return _create_empty_columnar_particles(name)
+
+    def supported_cuba(self):
+        return set(CUBA)
+
+
+class TestColumnarParticlesManipulatingParticles(
+        CheckManipulatingParticles, unittest.TestCase):
+
+    def container_factory(self, name):
+        return _create_empty_columnar_particles(name)
+
+    def supported_cuba(self):
+        return set(CUBA)
+
+
+class TestColumnarParticles(unittest.TestCase):
+
+    def setUp(self):
+        self.coordinates = numpy.array([[0.0, 0.0, 0.0],
+                                        [1.0, 1.0, 1.0],
+                                        [2.0, 2.0, 2.0]])
+        self.velocities = numpy.array([[0.1, 0.0, 0.0],
+                                       [0.2, 0.0, 0.0],
+                                       [0.3, 0.0, 0.0]])
+        self.materials = {1: uuid.uuid4(), 2: uuid.uuid4()}
+        self.particles = ColumnarParticles(
+            name="foo",
+            coordinates=self.coordinates,
+            data_columns={CUBA.VELOCITY: self.velocities,
+                          CUBA.MATERIAL_TYPE: numpy.array([1, 2, 1])},
+            material_table=MaterialLookupTable(self.materials))
+
+    def test_count(self):
+        self.assertEqual(self.particles.count_of(CUBA.PARTICLE), 3)
+        self.assertEqual(self.particles.count_of(CUBA.BOND), 0)
+
+    def test_array_accessors(self):
+        assert_almost_equal(self.particles.get_coordinates(),
+                            self.coordinates)
+        assert_almost_equal(self.particles.get_velocities(), self.velocities)
+        self.assertEqual(list(self.particles.get_material_types()),
+                         [self.materials[1],
+                          self.materials[2],
+                          self.materials[1]])
+        self.assertEqual(list(self.particles.get_material_indices()),
+                         [0, 1, 0])
+        with self.assertRaises(KeyError):
+            self.particles.get_attribute(CUBA.RADIUS)
+
+    def test_supported_attributes(self):
+        self.assertItemsEqual(self.particles.get_supported_attributes(),
+                              [CUBA.VELOCITY, CUBA.MATERIAL_TYPE])
+
+        # particles without velocity
+        self.particles.add([Particle(
+            coordinates=(5.0, 5.0, 5.0),
+            data=DataContainer({CUBA.MATERIAL_TYPE: self.materials[1]}))])
+
+        self.assertEqual(self.particles.get_supported_attributes(),
+                         [CUBA.MATERIAL_TYPE])
+
+    def test_iter_and_get(self):
+        uids = self.particles.get_uids()
+
+        particles = list(self.particles.iter(item_type=CUBA.PARTICLE))
+
+        self.assertEqual([p.uid for p in particles], uids)
+        for index, p in enumerate(particles):
+            self.assertEqual(p.coordinates,
+                             tuple(self.coordinates[index]))
+            self.assertEqual(p.data[CUBA.VELOCITY],
+                             tuple(self.velocities[index]))
+            self.assertTrue(self.particles.has(p.uid))
+            self.assertEqual(self.particles.get(p.uid).coordinates,
+                             p.coordinates)
+        self.assertFalse(self.particles.has(uuid.uuid4()))
+        with self.assertRaises(KeyError):
+            self.particles.get(uuid.uuid4())
+
+    def test_given_uids(self):
+        uids = [uuid.uuid4() for _ in range(3)]
+        particles = ColumnarParticles(name="foo",
+                                      coordinates=self.coordinates,
+                                      uids=uids)
+        self.assertEqual(particles.get_uids(), uids)
+
+        with self.assertRaises(ValueError):
+            ColumnarParticles(name="foo",
+                              coordinates=self.coordinates,
+                              uids=uids[:2])
+
+    def test_changes_after_materialising(self):
+        removed_uid, uid, _ = self.particles.get_uids()
+        particle = self.particles.get(uid)
+        particle.coordinates = (4.0, 4.0, 4.0)
+
+        self.particles.update([particle])
+        new_uids = self.particles.add([Particle(coordinates=(5.0, 5.0, 5.0),
+                                                data=particle.data)])
+        self.particles.remove([removed_uid])
+
+        self.assertEqual(self.particles.count_of(CUBA.PARTICLE), 3)
+        self.assertEqual(self.particles.get(uid).coordinates,
+                         (4.0, 4.0, 4.0))
+        self.assertEqual(self.particles.get(new_uids[0]).data[CUBA.VELOCITY],
+                         particle.data[CUBA.VELOCITY])
+        self.assertEqual(sorted(self.particles.get_coordinates()[:, 0]),
+                         [2.0, 4.0, 5.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from simlammps.config.mpi import MpiLauncher
+from simlammps.ensemble import (run_ensemble, get_partition_commands,
+                                get_partition_errors, _get_ensemble_launcher)
+
+
+class _Engine(object):
+    """ Stand-in of an engine which must not be run """
+    def __init__(self, use_internal_interface):
+        self._use_internal_interface = use_internal_interface
+        self._mpi_launcher = None
+
+    def _prepare_run(self):
+        raise AssertionError("The engine should not be run")
+
+
+class TestEnsemble(unittest.TestCase):
+
+    def test_partition_commands(self):
+        self.assertEqual(
+            get_partition_commands(["in.0.lammps", "in.1.lammps"]),
+            "variable simphony_replica world in.0.lammps in.1.lammps\n"
+            "include ${simphony_replica}\n")
+
+    def test_ensemble_launcher(self):
+        launcher = _get_ensemble_launcher(None, 6)
+        self.assertEqual(launcher.get_command(["lammps"]),
+                         ["mpirun", "-np", "6", "lammps"])
+
+        launcher = _get_ensemble_launcher(
+            MpiLauncher(2, launcher="srun", bind_to="core",
+                        extra_arguments=["-v"]),
+            8)
+        self.assertEqual(launcher.get_command(["lammps"]),
+                         ["srun", "-np", "8", "--bind-to", "core", "-v",
+                          "lammps"])
+
+    def test_partition_errors(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        partition_log = os.path.join(temp_dir, "log.partition")
+        with open(partition_log + ".0", "w") as log_file:
+            log_file.write("LAMMPS (1 Feb 2014)\n"
+                           "Total wall time: 0:00:00\n")
+        with open(partition_log + ".1", "w") as log_file:
+            log_file.write("LAMMPS (1 Feb 2014)\n"
+                           "ERROR on proc 1: Lost atoms: original 10 "
+                           "current 9 (../thermo.cpp:389)\n"
+                           "ERROR: Unknown command: notacommand\n")
+        # the log of the last partition is missing
+
+        self.assertEqual(
+            get_partition_errors(partition_log, 3),
+            [(1, 1, "Lost atoms: original 10 current 9 "
+                    "(../thermo.cpp:389)"),
+             (1, None, "Unknown command: notacommand")])
+
+    def test_invalid_ensembles(self):
+        with self.assertRaises(ValueError):
+            run_ensemble([])
+        with self.assertRaises(ValueError):
+            run_ensemble([_Engine(False), _Engine(True)])
+        with self.assertRaises(ValueError):
+            run_ensemble([_Engine(False)], processes_per_replica=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import time
+import unittest
+import uuid
+
+import numpy
+from numpy.testing import assert_almost_equal, assert_array_equal
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.particles import Particle, Particles
+
+from simlammps.columnar_particles import ColumnarParticles
+from simlammps.common.atom_style import AtomStyle
+from simlammps.config.mpi import MpiLauncher
+from simlammps.farm import run_farm, _create_particles, _get_columns
+from simlammps.io.lammps_fileio_data_manager import LammpsFileIoDataManager
+
+
+def _failing_job():
+    raise ValueError("invalid configuration")
+
+
+def _slow_job():
+    time.sleep(30)
+
+
+def _crashing_job():
+    os._exit(3)
+
+
+class TestFarm(unittest.TestCase):
+
+    def test_columns(self):
+        materials = [uuid.uuid4(), uuid.uuid4()]
+        uids = [uuid.uuid4() for _ in range(3)]
+        # uid whose bytes end with zeros
+        uids[1] = uuid.UUID(bytes=b"\x01" * 8 + b"\x00" * 8)
+        dataset = ColumnarParticles(
+            "foo",
+            [(0.0, 1.0, 2.0), (1.0, 1.0, 2.0), (2.0, 1.0, 2.0)],
+            data_columns={
+                CUBA.VELOCITY: numpy.ones((3, 3)),
+                CUBA.MATERIAL_TYPE: numpy.array(
+                    [materials[1], materials[0], materials[1]],
+                    dtype=object)},
+            uids=uids)
+        dataset.data = {CUBA.MASS: 2.0}
+
+        columns = _get_columns(dataset)
+        for key in ("uids", "coordinates"):
+            self.assertTrue(isinstance(columns[key], numpy.ndarray))
+        for column in columns["attributes"].itervalues():
+            self.assertTrue(isinstance(column, numpy.ndarray))
+            self.assertNotEqual(column.dtype, object)
+
+        particles = _create_particles(columns)
+
+        self.assertEqual(particles.name, "foo")
+        self.assertEqual(particles.data[CUBA.MASS], 2.0)
+        self.assertEqual(particles.get_uids(), uids)
+        assert_almost_equal(particles.get_coordinates(),
+                            dataset.get_coordinates())
+        assert_almost_equal(particles.get_velocities(), numpy.ones((3, 3)))
+        assert_array_equal(particles.get_material_types(),
+                           [materials[1], materials[0], materials[1]])
+
+    def test_columns_of_engine_dataset(self):
+        # all attributes of the atom style are passed on (not only the
+        # velocities)
+        material = uuid.uuid4()
+        particles = Particles("foo")
+        for i in range(3):
+            particles.add([Particle(
+                coordinates=(float(i), 1.0, 2.0),
+                data=DataContainer({CUBA.VELOCITY: (0.1 * i, 0.0, 0.0),
+                                    CUBA.ANGULAR_VELOCITY: (0.0, 0.0, i),
+                                    CUBA.MASS: 1.0 + i,
+                                    CUBA.RADIUS: 0.5 * (i + 1),
+                                    CUBA.MATERIAL_TYPE: material}))])
+        manager = LammpsFileIoDataManager(None, AtomStyle.GRANULAR)
+        dataset = manager.new_particles(particles)
+
+        result = _create_particles(_get_columns(dataset))
+
+        self.assertEqual(result.get_uids(), dataset.get_uids())
+        for particle in particles.iter(item_type=CUBA.PARTICLE):
+            result_particle = result.get(particle.uid)
+            self.assertEqual(result_particle.coordinates,
+                             particle.coordinates)
+            self.assertItemsEqual(result_particle.data.keys(),
+                                  particle.data.keys())
+            for cuba_key, value in particle.data.iteritems():
+                self.assertEqual(result_particle.data[cuba_key], value)
+
+    def test_failing_jobs(self):
+        start = time.time()
+        results = run_farm([_failing_job, _slow_job, _crashing_job],
+                           timeout=2.0, max_cores=3)
+        self.assertLess(time.time() - start, 20.0)
+
+        self.assertEqual([result.index for result in results], [0, 1, 2])
+        for result in results:
+            self.assertFalse(result.succeeded)
+            self.assertEqual(result.datasets, [])
+        self.assertTrue("invalid configuration" in results[0].error)
+        self.assertFalse(results[0].timed_out)
+        self.assertTrue(results[1].timed_out)
+        self.assertTrue("code 3" in results[2].error)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            run_farm([], use_internal_interface=True,
+                     mpi_launcher=MpiLauncher(2))
+        with self.assertRaises(ValueError):
+            run_farm([], number_threads=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,10 @@
 import unittest
 
+from simphony.api import CUDS
+from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.meta import api
+from simphony.cuds.particles import Particle, Particles
 from simphony.testing.abc_check_engine import ParticlesEngineCheck
 from simphony.cuds.abc_particles import ABCParticles
 
@@ -17,6 +22,15 @@ class TestLammpsMDEngineINTERNAL(ABCLammpsMDEngineCheck, unittest.TestCase):
         return LammpsWrapper(use_internal_interface=True)
 
 
+class TestLammpsMDEngineISOLATED(ABCLammpsMDEngineCheck, unittest.TestCase):
+
+    def setUp(self):
+        ABCLammpsMDEngineCheck.setUp(self)
+
+    def engine_factory(self):
+        return LammpsWrapper(use_internal_interface=True, isolated=True)
+
+
 class TestLammpsMDEngineFILEIO(ABCLammpsMDEngineCheck, unittest.TestCase):
 
     def setUp(self):
@@ -121,5 +135,51 @@ class TestFILEIOEngineCheck(FixedParticlesEngineCheck, unittest.TestCase):
         return LammpsWrapper(use_internal_interface=False)
 
 
+class TestLoadCuds(unittest.TestCase):
+
+    def setUp(self):
+        self.materials = [api.Material(), api.Material()]
+        for material in self.materials:
+            material.data[CUBA.MASS] = 1.0
+        particles = Particles("particles")
+        particles.add([
+            Particle(coordinates=(i, 1.0, 1.0),
+                     data=DataContainer(
+                         {CUBA.MATERIAL_TYPE: self.materials[i % 2].uid}))
+            for i in range(4)])
+        potentials = [
+            api.LennardJones_6_12(material=[material, material],
+                                  energy_well_depth=1.0,
+                                  van_der_waals_radius=1.0,
+                                  cutoff_distance=2.5)
+            for material in self.materials]
+
+        self.cuds = CUDS()
+        self.cuds.add(self.materials + potentials + [
+            particles,
+            api.Box(vector=[(10.0, 0.0, 0.0),
+                            (0.0, 10.0, 0.0),
+                            (0.0, 0.0, 10.0)]),
+            api.MolecularDynamics(),
+            api.Periodic(),
+            api.TemperatureRescaling(),
+            api.IntegrationTime(step=0.1, final=1.0)])
+        self.wrapper = LammpsWrapper(use_internal_interface=False,
+                                     cuds=self.cuds)
+        self.wrapper._replace_cuds_datasets()
+        self.dataset = self.cuds.get(particles.uid)
+
+    def test_unknown_material_of_loaded_dataset(self):
+        # an unchanged CUDS is loaded again without complaint
+        self.wrapper._load_cuds()
+
+        particle = self.dataset.get(self.dataset.get_uids()[0])
+        particle.data[CUBA.MATERIAL_TYPE] = api.Material().uid
+        self.dataset.update([particle])
+
+        with self.assertRaisesRegexp(Exception, "materials"):
+            self.wrapper._load_cuds()
+
+
 if __name__ == '__main__':
     unittest.main()
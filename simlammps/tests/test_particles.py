@@ -2,7 +2,12 @@ import unittest
 from functools import partial
 import uuid
 
+import numpy
+from numpy.testing import assert_almost_equal
+
 from simphony.core.cuba import CUBA
+from simphony.core.data_container import DataContainer
+from simphony.cuds.meta.api import Material
 from simphony.cuds.particles import Particle
 from simphony.testing.abc_check_particles import (
     CheckAddingParticles, CheckManipulatingParticles)
@@ -223,5 +228,270 @@ class TestInternalParticlesManipulatingParticles(
         return self.wrapper.get_dataset(name)
 
 
+class CheckParticlesArrays(object):
+    """ Checks the array methods of LammpsParticles
+
+    """
+    def setUp(self):
+        self.configurator = MDExampleConfigurator()
+        self.wrapper = self.wrapper_factory()
+        self.configurator.configure_wrapper(self.wrapper)
+        self.wrapper.add_dataset(self.configurator.get_empty_particles("foo"))
+        self.container = self.wrapper.get_dataset("foo")
+
+        self.materials = [m.uid for m in self.configurator.materials]
+        self.coordinates = numpy.array([[1.0, 2.0, 3.0],
+                                        [4.0, 5.0, 6.0],
+                                        [7.0, 8.0, 9.0]])
+        self.velocities = numpy.array([[0.1, 0.0, 0.0],
+                                       [0.0, 0.2, 0.0],
+                                       [0.0, 0.0, 0.3]])
+        self.material_types = [self.materials[1],
+                               self.materials[0],
+                               self.materials[1]]
+        self.uids = self.container.add_from_arrays(
+            self.coordinates,
+            {CUBA.VELOCITY: self.velocities,
+             CUBA.MATERIAL_TYPE: self.material_types})
+
+    def test_add_from_arrays(self):
+        self.assertEqual(self.container.count_of(CUBA.PARTICLE), 3)
+        for index, uid in enumerate(self.uids):
+            particle = self.container.get(uid)
+            assert_almost_equal(particle.coordinates,
+                                self.coordinates[index])
+            assert_almost_equal(particle.data[CUBA.VELOCITY],
+                                self.velocities[index])
+            self.assertEqual(particle.data[CUBA.MATERIAL_TYPE],
+                             self.material_types[index])
+
+    def test_add_from_arrays_with_uids(self):
+        uids = [uuid.uuid4(), uuid.uuid4()]
+
+        added_uids = self.container.add_from_arrays(
+            self.coordinates[:2],
+            {CUBA.VELOCITY: self.velocities[:2],
+             CUBA.MATERIAL_TYPE: self.material_types[:2]},
+            uids=uids)
+
+        self.assertEqual(added_uids, uids)
+        self.assertEqual(self.container.count_of(CUBA.PARTICLE), 5)
+
+        with self.assertRaises(ValueError):
+            self.container.add_from_arrays(
+                self.coordinates[:1],
+                {CUBA.VELOCITY: self.velocities[:1],
+                 CUBA.MATERIAL_TYPE: self.material_types[:1]},
+                uids=uids[:1])
+
+    def test_add_from_arrays_with_mismatched_arrays(self):
+        with self.assertRaises(ValueError):
+            self.container.add_from_arrays(
+                self.coordinates,
+                {CUBA.VELOCITY: self.velocities[:2],
+                 CUBA.MATERIAL_TYPE: self.material_types})
+        with self.assertRaises(ValueError):
+            self.container.add_from_arrays(self.coordinates[:, :2])
+
+    def test_add_from_arrays_without_velocities(self):
+        uids = self.container.add_from_arrays(
+            self.coordinates, {CUBA.MATERIAL_TYPE: self.material_types})
+
+        assert_almost_equal(self.container.get_velocities(uids),
+                            numpy.zeros((3, 3)))
+        assert_almost_equal(self.container.get_coordinates(uids),
+                            self.coordinates)
+
+    def test_add_with_material_of_container(self):
+        data = DataContainer(self.container.data)
+        data[CUBA.MATERIAL_TYPE] = self.materials[2]
+        self.container.data = data
+
+        uids = self.container.add_from_arrays(
+            self.coordinates[:1], {CUBA.VELOCITY: self.velocities[:1]})
+        particle = Particle(coordinates=(1.0, 1.0, 1.0),
+                            data={CUBA.VELOCITY: (0.0, 0.0, 0.0)})
+        uids += self.container.add([particle])
+
+        for uid in uids:
+            self.assertEqual(
+                self.container.get(uid).data[CUBA.MATERIAL_TYPE],
+                self.materials[2])
+
+    def test_get_arrays(self):
+        uids = self.container.get_uids()
+
+        self.assertEqual(set(uids), set(self.uids))
+        coordinates = self.container.get_coordinates()
+        velocities = self.container.get_velocities()
+        material_types = self.container.get_attribute(CUBA.MATERIAL_TYPE)
+        self.assertEqual(coordinates.shape, (3, 3))
+        self.assertEqual(velocities.shape, (3, 3))
+        self.assertEqual(material_types.shape, (3,))
+        for index, uid in enumerate(uids):
+            particle = self.container.get(uid)
+            assert_almost_equal(coordinates[index], particle.coordinates)
+            assert_almost_equal(velocities[index],
+                                particle.data[CUBA.VELOCITY])
+            self.assertEqual(material_types[index],
+                             particle.data[CUBA.MATERIAL_TYPE])
+
+        # order is stable
+        self.assertEqual(self.container.get_uids(), uids)
+
+    def test_get_arrays_of_uids(self):
+        uids = [self.uids[2], self.uids[0]]
+
+        assert_almost_equal(self.container.get_coordinates(uids),
+                            self.coordinates[[2, 0]])
+        self.assertEqual(
+            list(self.container.get_attribute(CUBA.MATERIAL_TYPE, uids)),
+            [self.material_types[2], self.material_types[0]])
+
+        with self.assertRaises(KeyError):
+            self.container.get_coordinates([uuid.uuid4()])
+        with self.assertRaises(KeyError):
+            self.container.get_attribute(CUBA.MATERIAL_TYPE, [uuid.uuid4()])
+
+    def test_get_unsupported_attribute(self):
+        with self.assertRaises(KeyError):
+            self.container.get_attribute(CUBA.ANGULAR_VELOCITY)
+
+    def test_set_arrays(self):
+        uids = self.container.get_uids()
+        coordinates = self.container.get_coordinates() + 1.0
+        velocities = self.container.get_velocities() * 2.0
+        material_types = [self.materials[2]] * 3
+
+        self.container.set_coordinates(coordinates)
+        self.container.set_velocities(velocities)
+        self.container.set_attribute(CUBA.MATERIAL_TYPE, material_types)
+
+        for index, uid in enumerate(uids):
+            particle = self.container.get(uid)
+            assert_almost_equal(particle.coordinates, coordinates[index])
+            assert_almost_equal(particle.data[CUBA.VELOCITY],
+                                velocities[index])
+            self.assertEqual(particle.data[CUBA.MATERIAL_TYPE],
+                             self.materials[2])
+
+    def test_set_arrays_of_uids(self):
+        uids = [self.uids[1]]
+
+        self.container.set_coordinates([[0.5, 0.5, 0.5]], uids)
+
+        assert_almost_equal(self.container.get(self.uids[1]).coordinates,
+                            (0.5, 0.5, 0.5))
+        assert_almost_equal(self.container.get(self.uids[0]).coordinates,
+                            self.coordinates[0])
+
+        with self.assertRaises(ValueError):
+            self.container.set_coordinates([[0.5, 0.5, 0.5]],
+                                           [uuid.uuid4()])
+        with self.assertRaises(ValueError):
+            self.container.set_coordinates(self.coordinates, uids)
+        with self.assertRaises(ValueError):
+            self.container.set_velocities(self.velocities[:2])
+
+
+class TestFileIoParticlesArrays(CheckParticlesArrays, unittest.TestCase):
+
+    def wrapper_factory(self):
+        return LammpsWrapper(use_internal_interface=False)
+
+
+class TestInternalParticlesArrays(CheckParticlesArrays, unittest.TestCase):
+
+    def wrapper_factory(self):
+        return LammpsWrapper(use_internal_interface=True)
+
+    def test_add_with_new_material(self):
+        material = Material()
+        material.data[CUBA.MASS] = 1.0
+        self.wrapper.SD.add([material])
+
+        uids = self.container.add_from_arrays(
+            [[1.5, 2.5, 3.5]],
+            {CUBA.VELOCITY: [[0.0, 0.0, 0.0]],
+             CUBA.MATERIAL_TYPE: [material.uid]})
+
+        # the existing particles are kept when the atom types grow
+        self.assertEqual(self.container.count_of(CUBA.PARTICLE), 4)
+        assert_almost_equal(self.container.get_coordinates(self.uids),
+                            self.coordinates)
+        self.assertEqual(
+            self.container.get(uids[0]).data[CUBA.MATERIAL_TYPE],
+            material.uid)
+
+
+class CheckParticlesData(object):
+    """ Checks the (cached) data of LammpsParticles
+
+    """
+    def setUp(self):
+        self.configurator = MDExampleConfigurator()
+        self.wrapper = self.wrapper_factory()
+        self.configurator.configure_wrapper(self.wrapper)
+        self.wrapper.add_dataset(self.configurator.get_empty_particles("foo"))
+        self.container = self.wrapper.get_dataset("foo")
+
+    def test_uid_of_added_dataset(self):
+        particles = self.configurator.get_empty_particles("bar")
+
+        self.wrapper.add_dataset(particles)
+
+        self.assertEqual(self.wrapper.get_dataset("bar").uid, particles.uid)
+
+    def test_data_is_cached(self):
+        manager = self.wrapper._data_manager
+        retrieved = []
+        get_data = manager.get_data
+        manager.get_data = lambda uname: retrieved.append(uname) or \
+            get_data(uname)
+        self.addCleanup(delattr, manager, "get_data")
+
+        data = self.container.data
+
+        # all accesses share the cached data
+        self.assertIs(self.container.data, data)
+        self.assertEqual(len(retrieved), 1)
+
+    def test_data_is_read_only(self):
+        data = self.container.data
+        origin = data.get(CUBA.ORIGIN)
+
+        with self.assertRaises(TypeError):
+            data[CUBA.ORIGIN] = (1.0, 1.0, 1.0)
+        with self.assertRaises(TypeError):
+            data.update({CUBA.ORIGIN: (1.0, 1.0, 1.0)})
+
+        self.assertEqual(self.container.data.get(CUBA.ORIGIN), origin)
+
+    def test_set_data(self):
+        old_data = self.container.data
+        data = DataContainer(old_data)
+        data[CUBA.ORIGIN] = (1.0, 1.0, 1.0)
+
+        self.container.data = data
+
+        # the cached data has been replaced
+        self.assertIsNot(self.container.data, old_data)
+
+        self.assertEqual(self.container.data[CUBA.ORIGIN], (1.0, 1.0, 1.0))
+        self.assertEqual(self.container.data[CUBA.VECTOR], data[CUBA.VECTOR])
+
+
+class TestFileIoParticlesData(CheckParticlesData, unittest.TestCase):
+
+    def wrapper_factory(self):
+        return LammpsWrapper(use_internal_interface=False)
+
+
+class TestInternalParticlesData(CheckParticlesData, unittest.TestCase):
+
+    def wrapper_factory(self):
+        return LammpsWrapper(use_internal_interface=True)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,6 +9,7 @@ from simlammps.lammps_wrapper import LammpsWrapper
 
 # TODO: Use an enum instead, defined in a proper place
 _LAMMPS = 'LAMMPS'
+_LAMMPS_ISOLATED = 'LAMMPS_ISOLATED'
 
 
 class TestPluginIntegration(unittest.TestCase):
@@ -20,6 +21,8 @@ class TestPluginIntegration(unittest.TestCase):
 
     def test_engine_registration(self):
         self.assertIn(_LAMMPS, engine_api.get_supported_engine_names())
+        self.assertIn(_LAMMPS_ISOLATED,
+                      engine_api.get_supported_engine_names())
 
     def test_lammps_internal_creation(self):
         cuds = CUDS()
@@ -35,6 +38,13 @@ class TestPluginIntegration(unittest.TestCase):
 
         self.assertIsInstance(lammps, LammpsWrapper)
 
+    def test_lammps_isolated_creation(self):
+        cuds = CUDS()
+        lammps = create_wrapper(cuds, _LAMMPS_ISOLATED,
+                                EngineInterface.Internal)
+
+        self.assertIsInstance(lammps, LammpsWrapper)
+
 
 if __name__ == '__main__':
     unittest.main()